@@ -0,0 +1,95 @@
+"""Fixtures for the pyoui benchmarks.
+
+Run with ``pytest benchmarks``; ``--oui-records`` selects the size(s) of the
+generated registry, e.g. ``--oui-records 30000,100000``.
+"""
+
+import random
+import tracemalloc
+
+import pytest
+from generate import generate
+
+from pyoui import OuiEntries
+
+
+def pytest_addoption(parser):
+    """Add the --oui-records option."""
+    parser.addoption(
+        "--oui-records",
+        default="35000",
+        help="comma separated number(s) of records of the generated registry (default: 35000)",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Run every benchmark for each requested registry size."""
+    if "records" in metafunc.fixturenames:
+        sizes = [int(n) for n in metafunc.config.getoption("--oui-records").split(",")]
+        metafunc.parametrize("records", sizes, scope="session")
+
+
+@pytest.fixture(scope="session")
+def oui_file(tmp_path_factory, records):
+    """Generate a registry file with ``records`` assignments."""
+    path = tmp_path_factory.mktemp(f"oui{records}") / "oui.txt"
+    generate(str(path), records=records)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def entries(oui_file):
+    """Provide the parsed registry."""
+    return OuiEntries(oui_file)
+
+
+@pytest.fixture(scope="session")
+def macs(entries):
+    """Provide 10000 MAC addresses, three quarters of them inside assigned prefixes."""
+    rng = random.Random(1)
+    prefixes = [e.prefix for e in entries.entries]
+    result = []
+    for k in range(10000):
+        if k % 4:
+            tail = rng.getrandbits(24).to_bytes(3, "big")
+            result.append(rng.choice(prefixes) + "".join(f":{b:02X}" for b in tail))
+        else:
+            mac = rng.getrandbits(48).to_bytes(6, "big")
+            result.append(":".join(f"{b:02X}" for b in mac))
+    # the benchmarks must time the hit path, not the rejection of invalid input
+    sample = [m for k, m in enumerate(result[:100]) if k % 4]
+    assert all(entries.is_valid_mac(m) for m in result[:100])
+    assert all(entries.lookup_many(sample))
+    return result
+
+
+@pytest.fixture
+def measure(benchmark):
+    """Benchmark a function and record its throughput and peak memory.
+
+    Returns a function ``run(fn, *args, items=1, setup=None, rounds=None)`` that
+    runs ``fn`` once under tracemalloc, then benchmarks it, stores
+    ``peak_memory_kib`` and ``items_per_second`` in the benchmark's extra info and
+    returns the peak memory in bytes.
+    """
+
+    def run(fn, *args, items=1, setup=None, rounds=None):
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            fn(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_memory_kib"] = peak // 1024
+
+        if setup is not None or rounds is not None:
+            benchmark.pedantic(fn, args=args, setup=setup, rounds=rounds or 10, warmup_rounds=1)
+        else:
+            benchmark(fn, *args)
+        if benchmark.stats is not None:
+            benchmark.extra_info["items_per_second"] = round(items / benchmark.stats.stats.mean)
+        return peak
+
+    return run
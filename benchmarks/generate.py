@@ -0,0 +1,94 @@
+"""Deterministic generator of synthetic IEEE registry files for the benchmarks.
+
+The output follows the layout of the published ``oui.txt`` (header, ``(hex)`` and
+``(base 16)`` lines, tab-indented address, CRLF line endings, ``Private``
+assignments without an address) and a realistic vendor distribution: a few
+vendors own hundreds of prefixes while most own one or two.
+
+Usage::
+
+    python benchmarks/generate.py oui.txt --records 100000
+"""
+
+import random
+from argparse import ArgumentParser
+
+_HEADER = [
+    "OUI/MA-L                                                    Organization",
+    "company_id                                                  Organization",
+    "                                                            Address",
+    "",
+]
+_WORDS = [
+    "Advanced", "Micro", "Networks", "Systems", "Technology", "Electronics", "Digital",
+    "Global", "Shenzhen", "Precision", "Wireless", "Communication", "Devices", "Smart",
+    "Semiconductor", "Industrial", "Data", "Security", "Optical", "Cloud", "Power",
+    "Instruments", "Solutions", "Audio", "Vision", "Mobile", "Automotive", "Medical",
+]  # fmt: skip
+_SUFFIXES = ["Inc.", "Corp.", "Co., Ltd.", "GmbH", "Ltd", "LLC", "AG", "S.A.", "Oy", "K.K."]
+# country code and its weight, roughly following the real registry
+_COUNTRIES = [
+    ("CN", 30), ("US", 25), ("TW", 8), ("KR", 6), ("JP", 6), ("DE", 5), ("GB", 3),
+    ("FR", 2), ("IN", 2), ("CA", 2), ("IT", 1), ("SE", 1), ("IL", 1), ("NL", 1), ("CH", 1),
+]  # fmt: skip
+
+
+def _vendors(rng: random.Random, count: int):
+    """Create ``count`` vendors as ``(name, street, district, country)``."""
+    codes = [c for c, _ in _COUNTRIES]
+    weights = [w for _, w in _COUNTRIES]
+    vendors = []
+    for i in range(count):
+        name = " ".join(rng.sample(_WORDS, rng.randint(1, 3)))
+        vendors.append(
+            (
+                f"{name} {rng.choice(_SUFFIXES)}" + (f" {i}" if i % 4 == 0 else ""),
+                f"{rng.randint(1, 9999)} {rng.choice(_WORDS)} Road",
+                f"City {rng.randint(1, 2000)}  ST  {rng.randint(10000, 99999)}",
+                rng.choices(codes, weights)[0],
+            )
+        )
+    return vendors
+
+
+def generate(path: str, records: int = 35000, seed: int = 0, private: float = 0.01):
+    """Write a synthetic MA-L registry file.
+
+    Args:
+        path (str): The file to write.
+        records (int): The number of assignments.
+        seed (int): Seed of the random generator; equal seeds give equal files.
+        private (float): Share of ``Private`` assignments without an address.
+
+    """
+    rng = random.Random(seed)
+    vendors = _vendors(rng, max(1, records // 3))
+    # Zipf-like: vendor k is picked with weight 1 / (k + 1)
+    weights = [1 / (k + 1) for k in range(len(vendors))]
+    owners = rng.choices(vendors, weights, k=records)
+    lines = list(_HEADER)
+    for key, vendor in zip(sorted(rng.sample(range(1 << 24), records)), owners):
+        hexa = f"{key >> 16:02X}-{(key >> 8) & 0xFF:02X}-{key & 0xFF:02X}"
+        if rng.random() < private:
+            lines += [f"{hexa}   (hex)\t\tPrivate", f"{key:06X}     (base 16)\t\tPrivate", ""]
+            continue
+        name, street, district, country = vendor
+        lines += [
+            f"{hexa}   (hex)\t\t{name}",
+            f"{key:06X}     (base 16)\t\t{name}",
+            f"\t\t\t\t{street}",
+            f"\t\t\t\t{district}",
+            f"\t\t\t\t{country}",
+            "",
+        ]
+    with open(path, "w", encoding="utf-8", newline="\r\n") as o:
+        o.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    ap = ArgumentParser(description=__doc__.split("\n", 1)[0])
+    ap.add_argument("path", help="the file to write")
+    ap.add_argument("-n", "--records", type=int, default=35000, help="number of assignments")
+    ap.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    a = ap.parse_args()
+    generate(a.path, a.records, a.seed)
@@ -0,0 +1,93 @@
+"""Benchmarks of parsing, index building and every lookup path."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from pyoui import OuiEntries
+
+# Upper bounds of the traced peak memory per registry record, in bytes. They leave
+# room for noise but fail on e.g. a second copy of the columns.
+PARSE_PEAK_PER_RECORD = 2048
+BUILD_PEAK_PER_RECORD = 1536
+
+
+def test_parse_records(measure, oui_file, records):
+    """Benchmark extracting the records of a registry file."""
+    peak = measure(lambda: list(OuiEntries._records(oui_file)), items=records, rounds=5)
+    assert peak < PARSE_PEAK_PER_RECORD * records
+
+
+def test_build(measure, oui_file, records):
+    """Benchmark parsing a registry file into columns and building the prefix index."""
+    peak = measure(OuiEntries, oui_file, items=records, rounds=5)
+    assert peak < BUILD_PEAK_PER_RECORD * records
+
+
+def test_load_cache(measure, oui_file, records, tmp_path):
+    """Benchmark loading the compiled cache and building the prefix index."""
+    cache_file = str(tmp_path / "oui.idx")
+    OuiEntries(oui_file, cache_file=cache_file)
+    measure(OuiEntries, oui_file, False, cache_file, items=records, rounds=10)
+
+
+def test_by_mac(measure, entries, macs):
+    """Benchmark resolving MAC addresses one at a time."""
+    measure(lambda: [next(entries.by_mac(m), None) for m in macs], items=len(macs))
+
+
+def test_lookup_many(measure, entries, macs):
+    """Benchmark resolving a batch of MAC address strings."""
+    measure(entries.lookup_many, macs, items=len(macs))
+
+
+def test_lookup_indices_numpy(measure, entries, macs):
+    """Benchmark the vectorized lookup of a NumPy array of MAC integers."""
+    np = pytest.importorskip("numpy")
+    values = np.array([int(m.replace(":", ""), 16) for m in macs], dtype=np.uint64)
+    measure(entries.lookup_indices, values, items=len(macs))
+
+
+def test_by_prefix(measure, entries, macs):
+    """Benchmark looking up prefixes."""
+    prefixes = [m[:8] for m in macs]
+    measure(lambda: [list(entries.by_prefix(p)) for p in prefixes], items=len(prefixes))
+
+
+def test_by_organization_cold(measure, entries):
+    """Benchmark the first organization query, which builds the trigram index."""
+
+    def reset():
+        entries._org_index = None
+
+    measure(lambda: list(entries.by_organization("precision")), setup=reset, rounds=5)
+
+
+@pytest.mark.parametrize("query", ["networks", "co., ltd", "ab"])
+def test_by_organization(measure, entries, query):
+    """Benchmark organization queries against the built index."""
+    list(entries.by_organization(query))
+    measure(lambda: list(entries.by_organization(query)))
+
+
+def test_by_country_code(measure, entries):
+    """Benchmark country code queries."""
+    codes = ["US", "CN", "DE", "TW", "XX"]
+    measure(lambda: [list(entries.by_country_code(c)) for c in codes], items=len(codes))
+
+
+def test_by_country_name(measure, entries):
+    """Benchmark country name queries: exact, partial, misspelled and unknown."""
+    names = ["Germany", "united states", "korea", "Untied Kingdom", "Atlantis"]
+    measure(lambda: [list(entries.by_country_name(n)) for n in names], items=len(names))
+
+
+def test_cli_lookup(measure, oui_file, macs):
+    """Benchmark the end-to-end latency of a CLI lookup with a warm cache."""
+    cmd = [sys.executable, "-m", "pyoui", "-o", oui_file, "-m", macs[1], "-f", "json"]
+    # main() does not set the exit status, so check that the address was found
+    warmup = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    assert json.loads(warmup.stdout)
+    measure(lambda: subprocess.run(cmd, check=True, capture_output=True), rounds=5)
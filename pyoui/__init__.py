@@ -1,8 +1,22 @@
 """The pyoui package.
 
-Provides OUI lookup functionality.
+Provides OUI lookup functionality. :class:`AsyncOUI`, :class:`Refresher` and
+:class:`RefreshStats` are imported on first access, so that plain lookups do not
+load asyncio and the refresh machinery.
 """
 
-from .oui import OUI, OuiEntries, OuiEntry
+from importlib import import_module
 
-__all__ = ["OUI", "OuiEntry", "OuiEntries"]
+from .oui import OUI, OuiDiff, OuiEntries, OuiEntry
+
+_LAZY_ATTRIBUTES = {"AsyncOUI": "aio", "Refresher": "refresh", "RefreshStats": "refresh"}
+
+__all__ = ["AsyncOUI", "OUI", "OuiDiff", "OuiEntry", "OuiEntries", "Refresher", "RefreshStats"]
+
+
+def __getattr__(name):
+    """Import the modules of the optional classes on first access (PEP 562)."""
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
@@ -3,14 +3,113 @@
 import csv
 import sys
 from argparse import ArgumentParser
+from contextlib import nullcontext
+from itertools import islice
 from pathlib import Path
 from tempfile import gettempdir
+from typing import Optional, TextIO
 
-from loguru import logger as log
-from rich.console import Console
-from rich.table import Table
+from pyoui import OUI, OuiDiff, OuiEntries
+from pyoui.export import FORMATS, export, format_of
+from pyoui.oui import log
+from pyoui.parallel import enrich_lines, format_records
 
-from pyoui import OUI
+#: Number of MAC addresses resolved per batch in --mac-file mode.
+CHUNK_SIZE = 10000
+
+#: CSV header of the --mac-file output.
+MAC_FILE_HEADER = ["MAC", "Prefix", "Name", "Street", "District", "Country"]
+
+
+def enrich_stream(
+    entries: OuiEntries, infile: TextIO, fmt: str, out: Optional[TextIO] = None
+) -> int:
+    """Resolve a stream of MAC addresses chunk by chunk and write a record per line.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        infile (TextIO): Input with one MAC address per line; blank lines are skipped.
+        fmt (str): Output format, one of ``log``, ``json`` (NDJSON) or ``csv``.
+        out (Optional[TextIO]): Where ``json`` and ``csv`` records are written.
+            Defaults to stdout.
+
+    Returns:
+        int: The number of MAC addresses that were resolved to an entry.
+
+    """
+    out = out or sys.stdout
+    if fmt == "csv":
+        csv.writer(out).writerow(MAC_FILE_HEADER)
+
+    found = 0
+    macs = (line.strip() for line in infile)
+    while True:
+        lines = list(islice(macs, CHUNK_SIZE))
+        if not lines:
+            break
+        chunk = [m for m in lines if m]
+        if not chunk:
+            continue
+        results = entries.lookup_many(chunk)
+        found += sum(e is not None for e in results)
+        if fmt == "log":
+            for mac, e in zip(chunk, results):
+                org = e.organization if e else None
+                log.info(f"{mac} -> {e.prefix if e else None} {org.__dict__ if org else {}}")
+        else:
+            out.write(format_records(chunk, results, fmt))
+        out.flush()
+    return found
+
+
+def print_diff(diff: OuiDiff, fmt: str):
+    """Print a diff between two database versions.
+
+    Args:
+        diff (OuiDiff): The diff to print.
+        fmt (str): Output format, one of ``log``, ``json``, ``csv`` or ``table``.
+
+    """
+    rows = [("added", e) for e in diff.added]
+    rows += [("removed", e) for e in diff.removed]
+    rows += [("changed", new) for _, new in diff.changed]
+    rows.sort(key=lambda r: r[1].prefix)
+
+    if fmt == "log":
+        old_names = {new.prefix: old.organization.name for old, new in diff.changed}
+        for change, e in rows:
+            name = e.organization.name if e.organization else None
+            if change == "changed":
+                log.info(f"~ {e.prefix} {old_names[e.prefix]} -> {name}")
+            else:
+                log.info(f"{'+' if change == 'added' else '-'} {e.prefix} {name}")
+        log.info(
+            f"{len(diff.added)} added, {len(diff.removed)} removed, {len(diff.changed)} changed"
+        )
+    elif fmt == "json":
+        from rich.console import Console
+
+        Console().print_json(data=diff.as_dict())
+    elif fmt == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["Change", "Prefix", "Name", "Street", "District", "Country"])
+        for change, e in rows:
+            org = e.organization
+            org_fields = [org.name, org.street, org.district, org.country] if org else []
+            writer.writerow([change, e.prefix, *org_fields])
+    elif fmt == "table":
+        from rich.console import Console
+        from rich.table import Table
+
+        table = Table(title="OUI Changes")
+        table.add_column("Change", style="yellow")
+        table.add_column("Prefix", style="cyan", no_wrap=True)
+        table.add_column("Organization", style="magenta")
+        table.add_column("Country", style="green")
+        for change, e in rows:
+            org = e.organization
+            table.add_row(change, e.prefix, org.name or "", org.country or "")
+        Console().print(table)
 
 
 def main():
@@ -28,8 +127,40 @@ def main():
     ap.add_argument("-org", "--organization", help="search by organization name")
     ap.add_argument("-cc", "--country-code", help="search by country code")
     ap.add_argument("-cn", "--country-name", help="search by country name")
+    ap.add_argument(
+        "--mac-file",
+        metavar="FILE",
+        help="resolve every MAC address in FILE, one per line ('-' for stdin)",
+    )
+    ap.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="resolve --mac-file in N worker processes (0: one per CPU)",
+    )
+    ap.add_argument(
+        "--unordered",
+        action="store_true",
+        help="with --jobs, write the records of each chunk as soon as it is resolved",
+    )
     ap.add_argument("-u", "--update", action="store_true", help="force update of the OUI database")
     ap.add_argument("--url", help="custom OUI source URL")
+    ap.add_argument(
+        "-r",
+        "--registry",
+        action="append",
+        choices=["all", *OUI.REGISTRIES],
+        help="additional IEEE registry to load (mam, oui36, iab or all); may be repeated",
+    )
+    ap.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="use the bundled registry snapshot instead of downloading while it is fresh",
+    )
+    ap.add_argument(
+        "--no-cache", action="store_true", help="do not use or write the compiled binary cache"
+    )
     ap.add_argument(
         "-f",
         "--format",
@@ -37,23 +168,135 @@ def main():
         default="log",
         help="output format (default: log)",
     )
+    sub = ap.add_subparsers(dest="command", metavar="COMMAND")
+    sp = sub.add_parser("serve", help="answer lookups over a Unix socket or HTTP")
+    sp.add_argument("-s", "--socket", help="serve newline-delimited JSON on this Unix socket")
+    sp.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: 127.0.0.1)")
+    sp.add_argument("--port", type=int, help="serve HTTP POST /lookup on this port")
+    sp.add_argument(
+        "--refresh",
+        type=float,
+        metavar="SECONDS",
+        help="check for a newer database every SECONDS and reload it without downtime",
+    )
+    dp = sub.add_parser("diff", help="list added, removed and changed prefixes of two OUI files")
+    dp.add_argument("old", help="the older OUI file")
+    dp.add_argument("new", help="the newer OUI file")
+    ep = sub.add_parser("export", help="write the whole database as NDJSON, CSV, SQLite or Parquet")
+    ep.add_argument("output", help="file to write ('-' for NDJSON or CSV on stdout)")
+    ep.add_argument(
+        "-t",
+        "--type",
+        choices=list(FORMATS),
+        help="export format (default: from the file extension)",
+    )
+    ep.add_argument("--table", default="oui", help="SQLite table name (default: oui)")
     a = ap.parse_args()
+    if a.command == "serve" and a.socket is None and a.port is None:
+        sp.error("one of --socket or --port is required")
+    if a.command == "export" and a.type is None and a.output != "-" and not format_of(a.output):
+        ep.error("cannot infer the format from the file extension, use --type")
+    if a.mac_file is not None and a.format == "table":
+        ap.error("--mac-file supports the log, json and csv formats")
+    if a.jobs is not None and (a.mac_file is None or a.format not in ("json", "csv")):
+        ap.error("--jobs requires --mac-file and the json or csv format")
+    if a.jobs is not None and a.jobs < 0:
+        ap.error("--jobs must not be negative")
 
-    log.remove()
-    log.add(
-        sys.stderr,
-        level="DEBUG" if a.debug else "INFO",
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-        "<level>{level: <8}</level> | <level>{message}</level>",
-    )
+    def setup_logging(logger):
+        logger.remove()
+        logger.add(
+            sys.stderr,
+            level="DEBUG" if a.debug else "INFO",
+            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+            "<level>{level: <8}</level> | <level>{message}</level>",
+        )
+
+    # loguru is only imported when something is logged, unless the output itself is
+    # logged or the server (whose modules log directly) is started.
+    if a.format == "log" or a.command == "serve":
+        setup_logging(log)
+    else:
+        log.on_load(setup_logging)
+
+    if a.command == "diff":
+        try:
+            diff = OuiEntries(a.old, debug=a.debug).diff(a.new)
+        except OSError as ex:
+            log.error(f"Failed to read OUI file: {ex}")
+            return 1
+        print_diff(diff, a.format)
+        return 0
+
+    registries = a.registry or []
+    if "all" in registries:
+        registries = list(OUI.REGISTRIES)
 
     try:
-        oui = OUI(outfile=a.outfile, debug=a.debug, force_update=a.update, url=a.url)
+        oui = OUI(
+            outfile=a.outfile,
+            debug=a.debug,
+            force_update=a.update,
+            url=a.url,
+            cache=not a.no_cache,
+            registries=registries,
+            snapshot=True if a.snapshot else None,
+        )
         oui_entries = oui.parse()
     except Exception as ex:
         log.error(f"Failed to load OUI database: {ex}")
         return 1
 
+    if a.command == "export":
+        try:
+            n = export(oui_entries, a.output, a.type, table=a.table)
+        except Exception as ex:
+            log.error(f"Failed to export the OUI database: {ex}")
+            return 1
+        log.info(f"Exported {n} entries to {a.output}")
+        return 0
+
+    if a.command == "serve":
+        from pyoui.refresh import Refresher
+        from pyoui.server import serve
+
+        refresher = None
+        if a.refresh is not None:
+            refresher = Refresher(oui, interval=a.refresh, entries=oui_entries)
+        try:
+            serve(oui_entries, socket_path=a.socket, host=a.host, port=a.port, refresher=refresher)
+        except OSError as ex:
+            log.error(f"Failed to start the server: {ex}")
+            return 1
+        return 0
+
+    if a.mac_file is not None:
+        if a.mac_file == "-":
+            opened = nullcontext(sys.stdin)
+        else:
+            try:
+                opened = open(a.mac_file, encoding="utf-8", errors="replace")
+            except OSError as ex:
+                log.error(f"Failed to read MAC file: {ex}")
+                return 1
+        with opened as infile:
+            if a.jobs is None:
+                enrich_stream(oui_entries, infile, a.format)
+            else:
+                if a.format == "csv":
+                    csv.writer(sys.stdout).writerow(MAC_FILE_HEADER)
+                records = enrich_lines(
+                    oui_entries,
+                    infile,
+                    a.format,
+                    processes=a.jobs or None,
+                    chunk_size=CHUNK_SIZE,
+                    ordered=not a.unordered,
+                )
+                for text in records:
+                    sys.stdout.write(text)
+        return 0
+
     r = None
     if a.prefix is not None:
         r = oui_entries.by_prefix(a.prefix)
@@ -75,8 +318,6 @@ def main():
         log.error("Could not find any matching entry!")
         return 1
 
-    console = Console()
-
     if a.format == "log":
         for e in results:
             org_info = e.organization.__dict__ if e.organization else {}
@@ -88,7 +329,9 @@ def main():
             if e.organization:
                 item["organization"] = e.organization.__dict__
             output.append(item)
-        console.print_json(data=output)
+        from rich.console import Console
+
+        Console().print_json(data=output)
     elif a.format == "csv":
         writer = csv.writer(sys.stdout)
         writer.writerow(["Prefix", "Name", "Street", "District", "Country"])
@@ -106,6 +349,9 @@ def main():
             else:
                 writer.writerow([e.prefix, "", "", "", ""])
     elif a.format == "table":
+        from rich.console import Console
+        from rich.table import Table
+
         table = Table(title="OUI Search Results")
         table.add_column("Prefix", style="cyan", no_wrap=True)
         table.add_column("Organization", style="magenta")
@@ -116,7 +362,7 @@ def main():
             country = (e.organization.country or "") if e.organization else ""
             table.add_row(e.prefix, name, country)
 
-        console.print(table)
+        Console().print(table)
 
     return 0
 
@@ -0,0 +1,169 @@
+"""Asyncio front-end for loading and querying the OUI database."""
+
+import asyncio
+from pathlib import Path
+from tempfile import gettempdir
+from typing import Iterable, List, Optional, Sequence, Union
+
+from .oui import OUI, OuiEntries, OuiEntry
+
+#: Batches of at least this many MAC addresses are resolved in the executor.
+EXECUTOR_BATCH_SIZE = 10000
+
+
+class AsyncOUI:
+    """Loads the OUI database without blocking the event loop.
+
+    Downloading (with the conditional and resumable transfers of :meth:`OUI.load`)
+    and parsing run in the loop's default executor. Lookups keep using the current
+    database while a refresh is in flight; the new database replaces it in one
+    assignment once it is completely built.
+    """
+
+    def __init__(
+        self,
+        outfile: str = str(Path(gettempdir()) / "oui.txt"),
+        debug: bool = False,
+        max_age: int = 2592000,
+        url: Optional[str] = None,
+        cache: bool = True,
+        registries: Optional[Sequence[str]] = None,
+        snapshot: Optional[bool] = None,
+    ):
+        """Initialize the handler without loading anything yet.
+
+        Args:
+            outfile (str): Path where the OUI file will be saved.
+            debug (bool): Enable debug logging.
+            max_age (int): Maximum age of the local file in seconds (default 30 days).
+            url (Optional[str]): Custom OUI source URL. Defaults to IEEE's OUI URL.
+            cache (bool): Keep a compiled binary cache next to ``outfile``.
+            registries (Optional[Sequence[str]]): Names of additional registries to
+                load, see :attr:`OUI.REGISTRIES`.
+            snapshot (Optional[bool]): Use of the bundled registry snapshot, see
+                :class:`OUI`.
+
+        """
+        self.outfile = outfile
+        self.debug = debug
+        self.max_age = max_age
+        self.url = url
+        self.cache = cache
+        self.registries = registries
+        self.snapshot = snapshot
+        self._entries: Optional[OuiEntries] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def __aenter__(self) -> "AsyncOUI":
+        """Load the database when entering the context."""
+        await self.load()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Nothing to release."""
+
+    @property
+    def entries(self) -> Optional[OuiEntries]:
+        """Return the current database.
+
+        Returns:
+            Optional[OuiEntries]: The database, or None if it was not loaded yet.
+
+        """
+        return self._entries
+
+    def _load_blocking(self, force: bool) -> OuiEntries:
+        """Download if needed and parse; runs in the executor."""
+        oui = OUI(
+            outfile=self.outfile,
+            debug=self.debug,
+            max_age=self.max_age,
+            force_update=force,
+            url=self.url,
+            cache=self.cache,
+            registries=self.registries,
+            snapshot=self.snapshot,
+        )
+        return oui.parse()
+
+    async def load(self, force: bool = False) -> OuiEntries:
+        """Download (if needed) and parse the database, then swap it in.
+
+        Concurrent calls are serialized, so only one refresh runs at a time.
+
+        Args:
+            force (bool): If True, always download the files.
+
+        Returns:
+            OuiEntries: The newly loaded database.
+
+        Raises:
+            RequestException: If a download fails.
+            IOError: If saving a file fails.
+
+        """
+        return await self._load(force)
+
+    async def _load(self, force: bool, missing_only: bool = False) -> OuiEntries:
+        """Load the database under the lock, see :meth:`load`.
+
+        With ``missing_only``, a database loaded while waiting for the lock is used
+        instead of loading it again.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._entries is None or not missing_only:
+                loop = asyncio.get_running_loop()
+                self._entries = await loop.run_in_executor(None, self._load_blocking, force)
+            return self._entries
+
+    async def refresh(self) -> OuiEntries:
+        """Reload the database, downloading it again if it is older than ``max_age``.
+
+        Returns:
+            OuiEntries: The newly loaded database.
+
+        """
+        return await self.load()
+
+    async def _current(self) -> OuiEntries:
+        """Return the current database, loading it on first use."""
+        entries = self._entries
+        if entries is None:
+            # concurrent first lookups share one load
+            entries = await self._load(False, missing_only=True)
+        return entries
+
+    async def lookup(self, mac: str) -> Optional[OuiEntry]:
+        """Resolve a single MAC address.
+
+        Args:
+            mac (str): The MAC address.
+
+        Returns:
+            Optional[OuiEntry]: The matching entry, or None.
+
+        """
+        return next((await self._current()).by_mac(mac), None)
+
+    async def lookup_many(self, macs: Iterable[Union[str, int]]) -> List[Optional[OuiEntry]]:
+        """Resolve many MAC addresses at once.
+
+        Large batches are resolved in the executor so the loop stays responsive.
+
+        Args:
+            macs (Iterable[Union[str, int]]): MAC addresses as strings or 48-bit
+                integers, or a NumPy array of integers.
+
+        Returns:
+            List[Optional[OuiEntry]]: The matching entry for every address, or None.
+
+        """
+        entries = await self._current()
+        if not hasattr(macs, "__len__"):
+            macs = list(macs)
+        if len(macs) < EXECUTOR_BATCH_SIZE:
+            return entries.lookup_many(macs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, entries.lookup_many, macs)
@@ -0,0 +1,304 @@
+"""Compiled binary cache of a parsed OUI database.
+
+The cache mirrors the column layout of :class:`~pyoui.oui.OuiEntries` and is
+written next to the source file. Loading memory-maps it and uses the columns in
+place, so subsequent starts skip the text parser entirely and processes opening
+the same cache share its pages. The same format is used to publish a database
+into shared memory. Layout (sections padded to 8 bytes, arrays in native byte
+order)::
+
+    header      magic, version, entry count, string count, blob size,
+                source count, country count, country alias count
+    sources     size, mtime_ns and sha256 of every text file it was built from
+    keys        uint64[n]   prefix integer << 8 | prefix length in bits
+    orgs        uint64[n]   organization id, see :meth:`~pyoui.oui.OuiEntries.organization_ids`
+    columns     uint32[n]   name / street / district string ids
+    countries   uint16[n]   index into the country table
+    country     uint32[c]   string id of every country code
+    aliases     uint32[2a]  string ids of every country name alias and its code
+    offsets     uint32[m+1] start of every string in the blob
+    blob        utf-8 string table
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+MAGIC = b"PYOUI\x00"
+VERSION = 5
+
+#: String id used for missing (``None``) values.
+NO_STRING = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<6sHIIIIII")
+_SOURCE = struct.Struct("<QQ32s")
+
+
+class Columns(NamedTuple):
+    """The columns of an OUI database.
+
+    Attributes:
+        keys (Sequence[int]): Prefix integer shifted left by 8 bits and combined with
+            the prefix length in bits, per entry.
+        orgs (Sequence[int]): Organization id per entry.
+        names (Sequence[int]): Organization name string id per entry.
+        streets (Sequence[int]): Street string id per entry.
+        districts (Sequence[int]): District string id per entry.
+        countries (Sequence[int]): Index into ``country_codes`` per entry.
+        country_codes (List[str]): The distinct country codes.
+        strings (Sequence[str]): The string table.
+        country_names (Dict[str, str]): Normalized country names and aliases mapped
+            to their country code, see :mod:`pyoui.countrynames`.
+
+    """
+
+    keys: Sequence[int]
+    orgs: Sequence[int]
+    names: Sequence[int]
+    streets: Sequence[int]
+    districts: Sequence[int]
+    countries: Sequence[int]
+    country_codes: List[str]
+    strings: Sequence[str]
+    country_names: Dict[str, str]
+
+
+class StringTable(Sequence):
+    """A string table decoding its strings from a buffer on access."""
+
+    def __init__(self, blob: memoryview, offsets: Sequence[int]):
+        """Create a table over the utf-8 ``blob`` with ``len(offsets) - 1`` strings."""
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        """Return the number of strings."""
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the blob and the offsets in bytes."""
+        return len(self._blob) + memoryview(self._offsets).nbytes
+
+    def __getitem__(self, i):
+        """Decode the string with id ``i``."""
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        return str(self._blob[self._offsets[i] : self._offsets[i + 1]], "utf-8")
+
+
+def cache_path(source: str) -> str:
+    """Return the cache file path belonging to a source file.
+
+    Args:
+        source (str): Path to the OUI text file.
+
+    Returns:
+        str: The path of the compiled cache.
+
+    """
+    return f"{source}.idx"
+
+
+def file_digest(filename: str) -> bytes:
+    """Compute the sha256 digest of a file.
+
+    Args:
+        filename (str): The file to hash.
+
+    Returns:
+        bytes: The raw 32 byte digest.
+
+    """
+    h = hashlib.sha256()
+    with open(filename, "rb") as i:
+        for chunk in iter(lambda: i.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def _pad(n: int) -> int:
+    """Round ``n`` up to a multiple of 8."""
+    return (n + 7) & ~7
+
+
+def dumps(columns: Columns, sources: Sequence[str] = ()) -> bytes:
+    """Serialize columns into the cache format.
+
+    Args:
+        columns (Columns): The columns to serialize.
+        sources (Sequence[str]): The text files the columns were parsed from.
+
+    Returns:
+        bytes: The serialized database.
+
+    """
+    strings = list(columns.strings)
+    country_ids = array("I", range(len(strings), len(strings) + len(columns.country_codes)))
+    strings += columns.country_codes
+    extra: Dict[str, int] = {}
+    alias_ids = array("I")
+    for value in (v for pair in columns.country_names.items() for v in pair):
+        sid = extra.setdefault(value, len(strings) + len(extra))
+        alias_ids.append(sid)
+    strings += extra
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("I", [0])
+    for e in encoded:
+        offsets.append(offsets[-1] + len(e))
+
+    out = bytearray(
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(columns.keys),
+            len(strings),
+            offsets[-1],
+            len(sources),
+            len(country_ids),
+            len(columns.country_names),
+        )
+    )
+    for source in sources:
+        st = os.stat(source)
+        out += _SOURCE.pack(st.st_size, st.st_mtime_ns, file_digest(source))
+    sections = [
+        array("Q", columns.keys),
+        array("Q", columns.orgs),
+        array("I", columns.names),
+        array("I", columns.streets),
+        array("I", columns.districts),
+        array("H", columns.countries),
+        country_ids,
+        alias_ids,
+        offsets,
+    ]
+    for a in sections:
+        out += b"\0" * (_pad(len(out)) - len(out))
+        out += a.tobytes()
+    out += b"".join(encoded)
+    return bytes(out)
+
+
+def loads(buf: memoryview) -> Optional[Columns]:
+    """Use the columns of a serialized database in place.
+
+    The returned columns are views into ``buf``, which must stay alive and
+    unchanged as long as they are used.
+
+    Args:
+        buf (memoryview): The serialized database.
+
+    Returns:
+        Optional[Columns]: The columns, or None if ``buf`` is not a database in a
+            compatible format.
+
+    """
+    if len(buf) < _HEADER.size:
+        return None
+    magic, version, n, m, blob_len, n_sources, n_countries, n_aliases = _HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION:
+        return None
+
+    pos = _HEADER.size + n_sources * _SOURCE.size
+    views = []
+    counts = (n, n, n, n, n, n, n_countries, 2 * n_aliases, m + 1)
+    for fmt, count in zip("QQIIIHIII", counts):
+        pos = _pad(pos)
+        size = struct.calcsize(fmt) * count
+        if pos + size > len(buf):
+            return None
+        views.append(buf[pos : pos + size].cast(fmt))
+        pos += size
+    if pos + blob_len > len(buf):
+        return None
+
+    keys, orgs, names, streets, districts, countries, country_ids, alias_ids, offsets = views
+    blob = buf[pos : pos + blob_len]
+    table = StringTable(blob, offsets)
+    codes = [table[sid] for sid in country_ids]
+    pairs = iter(table[sid] for sid in alias_ids)
+    country_names = dict(zip(pairs, pairs))
+    # the entry strings are followed by the country codes and aliases
+    strings = StringTable(blob, offsets[: (country_ids[0] if n_countries else m) + 1])
+    return Columns(keys, orgs, names, streets, districts, countries, codes, strings, country_names)
+
+
+def write(filename: str, sources: Sequence[str], columns: Columns) -> None:
+    """Write a compiled cache of the given columns.
+
+    The file is written to a temporary name first and then renamed, so
+    readers never observe a partially written cache.
+
+    Args:
+        filename (str): Destination path of the cache.
+        sources (Sequence[str]): The text files the columns were parsed from.
+        columns (Columns): The columns to write.
+
+    Raises:
+        OSError: If the cache could not be written.
+
+    """
+    data = dumps(columns, sources)
+    tmp = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as o:
+        o.write(data)
+    os.replace(tmp, filename)
+
+
+def _sources(buf: memoryview) -> List[Tuple[int, int, bytes]]:
+    """Return the ``(size, mtime_ns, digest)`` of the sources recorded in ``buf``."""
+    n_sources = _HEADER.unpack_from(buf)[5]
+    return [_SOURCE.unpack_from(buf, _HEADER.size + k * _SOURCE.size) for k in range(n_sources)]
+
+
+def _is_fresh(buf: memoryview, filename: str, sources: Sequence[str]) -> bool:
+    """Check whether the cache header still matches the source files."""
+    recorded = _sources(buf)
+    if len(recorded) != len(sources):
+        return False
+    for k, (source, (size, mtime_ns, digest)) in enumerate(zip(sources, recorded)):
+        st = os.stat(source)
+        if st.st_size == size and st.st_mtime_ns == mtime_ns:
+            continue
+        if st.st_size != size or file_digest(source) != digest:
+            return False
+        # Same content with a new mtime (e.g. a refreshed download): record it so
+        # the next start can skip hashing again.
+        try:
+            with open(filename, "r+b") as o:
+                o.seek(_HEADER.size + k * _SOURCE.size)
+                o.write(_SOURCE.pack(st.st_size, st.st_mtime_ns, digest))
+        except OSError:
+            pass
+    return True
+
+
+def read(filename: str, sources: Sequence[str]) -> Optional[Columns]:
+    """Memory-map a compiled cache if it is valid for the given source files.
+
+    Args:
+        filename (str): Path of the cache.
+        sources (Sequence[str]): The text files the cache must have been built from.
+
+    Returns:
+        Optional[Columns]: Columns viewing the mapped file, or None if the cache is
+            missing, stale or was written by an incompatible version.
+
+    """
+    if not Path(filename).is_file():
+        return None
+    with open(filename, "rb") as i:
+        try:
+            mm = mmap.mmap(i.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+    buf = memoryview(mm)
+    columns = loads(buf)
+    if columns is None or not _is_fresh(buf, filename, sources):
+        return None
+    return columns
@@ -0,0 +1,92 @@
+"""Resolution of country names to the country codes of a registry.
+
+The names and aliases of the countries that occur in a registry are collected
+once with pycountry when the registry is parsed and stored with the compiled
+cache; queries are then matched against that small index only.
+"""
+
+import re
+import unicodedata
+from difflib import get_close_matches
+from typing import Dict, Iterable, Optional
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+#: Minimum similarity of a misspelled query to a country name.
+FUZZY_CUTOFF = 0.8
+
+
+def normalize(name: str) -> str:
+    """Normalize a country name for matching.
+
+    Accents are removed, case is folded and any run of other characters than
+    letters and digits becomes a single space, so ``Côte d'Ivoire`` becomes
+    ``cote d ivoire``.
+
+    Args:
+        name (str): The country name.
+
+    Returns:
+        str: The normalized name.
+
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def aliases(codes: Iterable[str]) -> Dict[str, str]:
+    """Collect the normalized names and aliases of the given countries.
+
+    Args:
+        codes (Iterable[str]): Two-letter country codes.
+
+    Returns:
+        Dict[str, str]: Normalized name, official name, common name and alpha-2 /
+            alpha-3 code of every known country, mapped to its upper case code.
+
+    """
+    from pycountry import countries
+
+    index: Dict[str, str] = {}
+    for code in codes:
+        if len(code) != 2:
+            continue
+        cc = code.upper()
+        index.setdefault(normalize(cc), cc)
+        info = countries.get(alpha_2=cc)
+        if info is None:
+            continue
+        for attr in ("name", "official_name", "common_name", "alpha_3"):
+            value = getattr(info, attr, None)
+            if value:
+                index.setdefault(normalize(value), cc)
+    return index
+
+
+def match(index: Dict[str, str], name: str) -> Optional[str]:
+    """Resolve a country name against an alias index.
+
+    An exact (normalized) match wins; otherwise the shortest alias containing the
+    query is used, e.g. ``korea`` finds ``south korea``; otherwise the closest
+    alias with a similarity of at least :data:`FUZZY_CUTOFF`.
+
+    Args:
+        index (Dict[str, str]): The index from :func:`aliases`.
+        name (str): The country name to resolve.
+
+    Returns:
+        Optional[str]: The two-letter country code, or None if nothing matches.
+
+    """
+    query = normalize(name)
+    if not query:
+        return None
+    code = index.get(query)
+    if code is not None:
+        return code
+    containing = [alias for alias in index if query in alias]
+    if containing:
+        return index[min(containing, key=lambda alias: (len(alias), alias))]
+    close = get_close_matches(query, list(index), n=1, cutoff=FUZZY_CUTOFF)
+    return index[close[0]] if close else None
@@ -0,0 +1,190 @@
+"""Vectorized enrichment of DataFrame columns of MAC addresses.
+
+Columns are parsed to 48-bit integers with NumPy, matched against the sorted
+prefix tables with :meth:`~pyoui.oui.OuiEntries.lookup_indices` and the result
+columns are gathered from the database columns, so the work per row happens in
+NumPy; Python only runs once per chunk and per distinct matching entry.
+
+Requires NumPy; pandas, Polars and PyArrow are only needed for their own column
+types.
+"""
+
+from typing import Any, Dict, Sequence, Tuple
+
+from .oui import OuiEntries
+
+#: Rows parsed at once; bounds the memory of the intermediate character arrays.
+CHUNK_SIZE = 1 << 20
+
+#: Columns :func:`enrich_column` returns by default.
+COLUMNS = ("prefix", "name", "country")
+
+# Characters of a MAC address string that are considered; longer strings are invalid.
+_MAX_LENGTH = 17
+
+
+def _layout(positions: Tuple[int, ...]) -> Any:
+    """Return a row mask of the given separator positions."""
+    import numpy as np
+
+    mask = np.zeros(_MAX_LENGTH + 1, dtype=bool)
+    mask[list(positions)] = True
+    return mask
+
+
+def _hex_table() -> Any:
+    """Map character codes to nibble values, 16 for separators, 255 for anything else."""
+    import numpy as np
+
+    table = np.full(256, 255, dtype=np.uint8)
+    for i, c in enumerate("0123456789abcdef"):
+        table[ord(c)] = table[ord(c.upper())] = i
+    for c in ":-.\0":
+        table[ord(c)] = 16
+    return table
+
+
+def parse_macs(values: Any) -> Tuple[Any, Any]:
+    """Parse MAC address strings to 48-bit integers, vectorized.
+
+    Strings are accepted in the layouts of the scalar parser: 12 hex digits,
+    ``AA:BB:CC:DD:EE:FF``, ``AA-BB-CC-DD-EE-FF`` or ``aabb.ccdd.eeff``.
+
+    Args:
+        values (Any): A NumPy array (or anything ``numpy.asarray`` accepts) of
+            strings, bytes or integers. Missing values are allowed.
+
+    Returns:
+        Tuple[Any, Any]: The ``uint64`` MAC integers and a boolean array marking the
+            valid ones; invalid entries are 0.
+
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        valid = (values >= 0) & (values < 1 << 48)
+        return np.where(valid, values, 0).astype(np.uint64), valid
+    if values.dtype.kind == "f":
+        valid = np.isfinite(values) & (values >= 0) & (values < 1 << 48)
+        valid &= np.floor(np.where(valid, values, 0)) == np.where(valid, values, 0)
+        return np.where(valid, values, 0).astype(np.uint64), valid
+
+    table = _hex_table()
+    pair_seps, group_seps = _layout((2, 5, 8, 11, 14)), _layout((4, 9))
+    macs = np.zeros(len(values), dtype=np.uint64)
+    valid = np.zeros(len(values), dtype=bool)
+    width = _MAX_LENGTH + 1
+    for start in range(0, len(values), CHUNK_SIZE):
+        chunk = values[start : start + CHUNK_SIZE]
+        if chunk.dtype.kind == "S":
+            codes = chunk.astype(f"S{width}").view(np.uint8)
+        else:
+            # also turns None / NaN of object columns into invalid strings
+            codes = np.minimum(chunk.astype(f"U{width}").view(np.uint32), 255).astype(np.uint8)
+        codes = codes.reshape(len(chunk), width)
+        nibbles = table[codes]
+        digits = nibbles < 16
+        ok = (nibbles != 255).all(axis=1) & (digits.sum(axis=1) == 12) & (codes[:, -1] == 0)
+        # every separator must sit in a separator position of one layout, and only
+        # the padding after the string may be NUL
+        chars = codes != 0
+        ok &= (chars[:, :-1] | ~chars[:, 1:]).all(axis=1)
+        seps = ~digits & chars
+        pairs = (seps == pair_seps).all(axis=1) & (codes[:, 2] != ord("."))
+        pairs &= (codes[:, 2:15:3] == codes[:, 2:3]).all(axis=1)
+        groups = (seps == group_seps).all(axis=1)
+        groups &= (codes[:, 4] == ord(".")) & (codes[:, 9] == ord("."))
+        ok &= ~seps.any(axis=1) | pairs | groups
+        # the 12 digits of every valid row, packed into the low 6 bytes of a big
+        # endian 64-bit integer
+        hexdigits = nibbles[ok][digits[ok]].reshape(-1, 12)
+        packed = np.zeros((len(hexdigits), 8), dtype=np.uint8)
+        packed[:, 2:] = hexdigits[:, 0::2] << 4 | hexdigits[:, 1::2]
+        macs[start : start + len(chunk)][ok] = packed.view(">u8").reshape(-1)
+        valid[start : start + len(chunk)] = ok
+    return macs, valid
+
+
+def _to_numpy(column: Any) -> Any:
+    """Return the values of a column as a NumPy array."""
+    import numpy as np
+
+    if type(column).__module__.startswith("pandas") and column.dtype.kind in "iu":
+        # nullable integer columns would become object arrays of ints and NA
+        return column.to_numpy(dtype="float64", na_value=np.nan)
+    return np.asarray(column)
+
+
+def _gather(entries: OuiEntries, rows: Any, name: str) -> Any:
+    """Return column ``name`` of the entries at ``rows`` as an object array.
+
+    Only the distinct entries are decoded; rows of NOT_FOUND become None.
+    """
+    import numpy as np
+
+    result = np.full(len(rows), None, dtype=object)
+    found = rows >= 0
+    if name == "prefix":
+        unique, inverse = np.unique(rows[found], return_inverse=True)
+        values = [entries._prefix(r) for r in unique.tolist()]
+    else:
+        if name == "country":
+            ids = np.frombuffer(entries._countries, dtype=np.uint16)[rows[found]]
+            table = entries._country_codes
+        else:
+            ids = np.frombuffer(getattr(entries, f"_{name}s"), dtype=np.uint32)[rows[found]]
+            table = entries._strings
+        unique, inverse = np.unique(ids, return_inverse=True)
+        # ids past the end of the table mark missing values
+        values = [table[i] if i < len(table) else None for i in unique.tolist()]
+    decoded = np.empty(len(values), dtype=object)
+    decoded[:] = values
+    result[found] = decoded[inverse.reshape(-1)]
+    return result
+
+
+def enrich_column(entries: OuiEntries, column: Any, columns: Sequence[str] = COLUMNS) -> Any:
+    """Look up a column of MAC addresses without a Python loop per row.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        column (Any): A pandas Series, Polars Series, PyArrow Array / ChunkedArray,
+            NumPy array or sequence of MAC address strings or 48-bit integers.
+        columns (Sequence[str]): The result columns, any of ``prefix``, ``name``,
+            ``street``, ``district`` and ``country``.
+
+    Returns:
+        Any: A table with the requested columns, aligned with ``column`` and missing
+            values where an address is invalid or not assigned: a pandas DataFrame
+            (with the index of the Series), a Polars DataFrame or a PyArrow Table for
+            columns of these libraries, a dict of NumPy object arrays with None
+            otherwise.
+
+    Raises:
+        ValueError: If an unknown result column is requested.
+
+    """
+    unknown = set(columns) - {"prefix", "name", "street", "district", "country"}
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+    macs, valid = parse_macs(_to_numpy(column))
+    rows = entries.lookup_indices(macs)
+    rows[~valid] = entries.NOT_FOUND
+    data: Dict[str, Any] = {name: _gather(entries, rows, name) for name in columns}
+
+    library = type(column).__module__.split(".")[0]
+    if library == "pandas":
+        import pandas as pd
+
+        return pd.DataFrame(data, index=column.index)
+    if library == "polars":
+        import polars as pl
+
+        return pl.DataFrame([pl.Series(k, v, dtype=pl.String) for k, v in data.items()])
+    if library == "pyarrow":
+        import pyarrow as pa
+
+        return pa.table({k: pa.array(v, type=pa.string()) for k, v in data.items()})
+    return data
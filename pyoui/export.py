@@ -0,0 +1,163 @@
+"""Export of the complete database to formats other systems can bulk-load.
+
+Every format is written in a single pass over the columns of an
+:class:`~pyoui.oui.OuiEntries`, in batches, so the memory used does not grow
+with the size of the database. All formats share the columns of :data:`FIELDS`;
+``prefix_int`` and ``prefix_bits`` are the prefix as integer (the top
+``prefix_bits`` bits of a MAC address) and its length, so a MAC address ``mac``
+matches a row if ``mac >> (48 - prefix_bits) == prefix_int``.
+"""
+
+import csv
+import json
+import sys
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional, TextIO, Tuple
+
+from .oui import OuiEntries
+
+#: Column names of every exported row.
+FIELDS = ("prefix", "prefix_int", "prefix_bits", "name", "street", "district", "country")
+
+#: Supported formats and the file extensions they are inferred from.
+FORMATS = {
+    "ndjson": (".ndjson", ".jsonl", ".json"),
+    "csv": (".csv",),
+    "sqlite": (".db", ".sqlite", ".sqlite3"),
+    "parquet": (".parquet",),
+}
+
+#: Rows written per batch (SQLite transaction chunk, Parquet row group).
+BATCH_SIZE = 10000
+
+Row = Tuple[str, int, int, Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+def format_of(path: str) -> Optional[str]:
+    """Infer the export format from a file name.
+
+    Args:
+        path (str): The output file.
+
+    Returns:
+        Optional[str]: The format, or None if the extension is not known.
+
+    """
+    suffix = Path(path).suffix.lower()
+    return next((fmt for fmt, suffixes in FORMATS.items() if suffix in suffixes), None)
+
+
+def rows(entries: OuiEntries) -> Iterator[Row]:
+    """Yield every entry as a flat row of :data:`FIELDS`.
+
+    Args:
+        entries (OuiEntries): The database.
+
+    Yields:
+        Iterator[Row]: One row per entry, in database order.
+
+    """
+    keys = entries._keys
+    for i in range(entries.size()):
+        k = keys[i]
+        yield (entries._prefix(i), k >> 8, k & 0xFF, *entries._fields(i))
+
+
+def _write_text(entries: OuiEntries, out: TextIO, fmt: str) -> int:
+    """Write NDJSON or CSV records to a text stream."""
+    n = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(FIELDS)
+        for row in rows(entries):
+            writer.writerow(row)
+            n += 1
+    else:
+        for row in rows(entries):
+            out.write(json.dumps(dict(zip(FIELDS, row))) + "\n")
+            n += 1
+    return n
+
+
+def _write_sqlite(entries: OuiEntries, path: str, table: str) -> int:
+    """Write a SQLite table indexed on the prefix integer."""
+    import sqlite3
+
+    n = 0
+    with sqlite3.connect(path) as db:
+        db.execute(f'DROP TABLE IF EXISTS "{table}"')
+        db.execute(
+            f'CREATE TABLE "{table}" (prefix TEXT NOT NULL, prefix_int INTEGER NOT NULL, '
+            "prefix_bits INTEGER NOT NULL, name TEXT, street TEXT, district TEXT, country TEXT)"
+        )
+        insert = f'INSERT INTO "{table}" VALUES (?, ?, ?, ?, ?, ?, ?)'
+        it = rows(entries)
+        for batch in iter(lambda: list(islice(it, BATCH_SIZE)), []):
+            db.executemany(insert, batch)
+            n += len(batch)
+        # built after the inserts, which is faster than maintaining it while loading
+        db.execute(f'CREATE INDEX "{table}_prefix_int" ON "{table}" (prefix_int, prefix_bits)')
+    db.close()
+    return n
+
+
+def _write_parquet(entries: OuiEntries, path: str) -> int:
+    """Write a Parquet file with one row group per batch."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("prefix", pa.string()),
+            ("prefix_int", pa.uint64()),
+            ("prefix_bits", pa.uint8()),
+            ("name", pa.string()),
+            ("street", pa.string()),
+            ("district", pa.string()),
+            ("country", pa.string()),
+        ]
+    )
+    n = 0
+    it = rows(entries)
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in iter(lambda: list(islice(it, BATCH_SIZE)), []):
+            columns = [pa.array(column, type=f.type) for column, f in zip(zip(*batch), schema)]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            n += len(batch)
+    return n
+
+
+def export(entries: OuiEntries, path: str, fmt: Optional[str] = None, table: str = "oui") -> int:
+    """Write the complete database to a file.
+
+    Args:
+        entries (OuiEntries): The database.
+        path (str): The output file; ``-`` writes NDJSON or CSV to stdout. An existing
+            file is replaced (for SQLite, only the table).
+        fmt (Optional[str]): One of :data:`FORMATS`. Inferred from the extension of
+            ``path`` if omitted, NDJSON for stdout.
+        table (str): Name of the SQLite table.
+
+    Returns:
+        int: The number of exported entries.
+
+    Raises:
+        ValueError: If the format is unknown or cannot be inferred, or if a binary
+            format is written to stdout.
+        ImportError: If Parquet is requested and PyArrow is not installed.
+
+    """
+    fmt = fmt or ("ndjson" if path == "-" else format_of(path))
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format for {path}: {fmt}")
+    if path == "-":
+        if fmt not in ("ndjson", "csv"):
+            raise ValueError(f"{fmt} cannot be written to stdout")
+        return _write_text(entries, sys.stdout, fmt)
+    if fmt == "sqlite":
+        return _write_sqlite(entries, path, table)
+    if fmt == "parquet":
+        return _write_parquet(entries, path)
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        return _write_text(entries, out, fmt)
@@ -0,0 +1,348 @@
+"""Optional metrics of downloads, parsing, index builds and lookups.
+
+Nothing is recorded until a sink is installed with :func:`set_sink`; until then
+lookups run uninstrumented and the other call sites only check a module global.
+A sink receives counters, histogram observations and gauges by name, see
+:data:`METRICS`::
+
+    from pyoui import metrics
+
+    metrics.set_sink(metrics.PrometheusSink())
+    # or metrics.OpenTelemetrySink(), metrics.CallbackSink(print), metrics.MemorySink()
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Labels = Dict[str, str]
+
+#: Every metric: name -> (kind, description). Durations are in seconds.
+METRICS: Dict[str, Tuple[str, str]] = {
+    "pyoui_downloads_total": ("counter", "Registry downloads by status (ok, not_modified, error)"),
+    "pyoui_download_bytes_total": ("counter", "Bytes written by registry downloads"),
+    "pyoui_download_seconds": ("histogram", "Duration of registry downloads"),
+    "pyoui_parse_seconds": ("histogram", "Duration of parsing registry text files"),
+    "pyoui_parse_records_total": ("counter", "Records parsed from registry text files"),
+    "pyoui_cache_load_seconds": ("histogram", "Duration of loading the compiled cache"),
+    "pyoui_index_build_seconds": ("histogram", "Duration of building the prefix index"),
+    "pyoui_entries": ("gauge", "Entries of the most recently built database"),
+    "pyoui_memory_bytes": ("gauge", "Approximate size of the most recently built database"),
+    "pyoui_lookup_seconds": ("histogram", "Duration of lookups by method"),
+    "pyoui_lookup_items_total": ("counter", "Looked up addresses or queries by method"),
+    "pyoui_lookup_cache_hits_total": ("counter", "MAC lookups answered from the LRU cache"),
+    "pyoui_lookup_cache_misses_total": ("counter", "MAC lookups not in the LRU cache"),
+}
+
+
+class Sink:
+    """Receiver of metrics; the base class ignores everything."""
+
+    def count(self, name: str, value: float, labels: Labels):
+        """Increase a counter.
+
+        Args:
+            name (str): The metric name.
+            value (float): The increment.
+            labels (Labels): The label values.
+
+        """
+
+    def observe(self, name: str, value: float, labels: Labels):
+        """Record a histogram observation.
+
+        Args:
+            name (str): The metric name.
+            value (float): The observed value.
+            labels (Labels): The label values.
+
+        """
+
+    def gauge(self, name: str, value: float, labels: Labels):
+        """Set a gauge.
+
+        Args:
+            name (str): The metric name.
+            value (float): The new value.
+            labels (Labels): The label values.
+
+        """
+
+
+class CallbackSink(Sink):
+    """Passes every metric to a function ``callback(kind, name, value, labels)``."""
+
+    def __init__(self, callback: Callable[[str, str, float, Labels], Any]):
+        """Create the sink.
+
+        Args:
+            callback (Callable[[str, str, float, Labels], Any]): Called with the kind
+                (``counter``, ``histogram`` or ``gauge``), name, value and labels.
+
+        """
+        self.callback = callback
+
+    def count(self, name: str, value: float, labels: Labels):
+        """Pass a counter increment to the callback."""
+        self.callback("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, labels: Labels):
+        """Pass a histogram observation to the callback."""
+        self.callback("histogram", name, value, labels)
+
+    def gauge(self, name: str, value: float, labels: Labels):
+        """Pass a gauge value to the callback."""
+        self.callback("gauge", name, value, labels)
+
+
+class MemorySink(Sink):
+    """Aggregates the metrics in memory, e.g. for tests or periodic logging.
+
+    Attributes:
+        counters (Dict[Tuple, float]): Sum per ``(name, *sorted label items)``.
+        histograms (Dict[Tuple, Tuple[int, float, float]]): Count, sum and maximum
+            of the observations per ``(name, *sorted label items)``.
+        gauges (Dict[Tuple, float]): Last value per ``(name, *sorted label items)``.
+
+    """
+
+    def __init__(self):
+        """Create an empty sink."""
+        self.counters: Dict[Tuple, float] = {}
+        self.histograms: Dict[Tuple, Tuple[int, float, float]] = {}
+        self.gauges: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, value: float, labels: Labels):
+        """Add to a counter."""
+        key = (name, *sorted(labels.items()))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Labels):
+        """Add an observation to a histogram summary."""
+        key = (name, *sorted(labels.items()))
+        with self._lock:
+            n, total, peak = self.histograms.get(key, (0, 0.0, value))
+            self.histograms[key] = (n + 1, total + value, max(peak, value))
+
+    def gauge(self, name: str, value: float, labels: Labels):
+        """Set a gauge."""
+        self.gauges[(name, *sorted(labels.items()))] = value
+
+
+class PrometheusSink(Sink):
+    """Exports the metrics with ``prometheus_client``."""
+
+    def __init__(self, registry: Any = None, buckets: Optional[Tuple[float, ...]] = None):
+        """Create the sink; the metrics are registered on first use.
+
+        Args:
+            registry (Any): The ``CollectorRegistry``. Defaults to the global one.
+            buckets (Optional[Tuple[float, ...]]): Histogram buckets in seconds.
+                Defaults to ``prometheus_client``'s defaults.
+
+        """
+        import prometheus_client
+
+        self._client = prometheus_client
+        self._registry = registry if registry is not None else prometheus_client.REGISTRY
+        self._buckets = buckets
+        self._metrics: Dict[str, Any] = {}
+
+    def _metric(self, kind: str, name: str, labels: Labels) -> Any:
+        """Return the labeled child of metric ``name``, registering it if needed."""
+        metric = self._metrics.get(name)
+        if metric is None:
+            description = METRICS.get(name, (kind, name))[1]
+            kwargs: Dict[str, Any] = {"labelnames": sorted(labels), "registry": self._registry}
+            if kind == "histogram" and self._buckets is not None:
+                kwargs["buckets"] = self._buckets
+            cls = {"counter": "Counter", "histogram": "Histogram", "gauge": "Gauge"}[kind]
+            metric = self._metrics[name] = getattr(self._client, cls)(name, description, **kwargs)
+        return metric.labels(**labels) if labels else metric
+
+    def count(self, name: str, value: float, labels: Labels):
+        """Increase a Prometheus counter."""
+        self._metric("counter", name, labels).inc(value)
+
+    def observe(self, name: str, value: float, labels: Labels):
+        """Observe a value of a Prometheus histogram."""
+        self._metric("histogram", name, labels).observe(value)
+
+    def gauge(self, name: str, value: float, labels: Labels):
+        """Set a Prometheus gauge."""
+        self._metric("gauge", name, labels).set(value)
+
+
+class OpenTelemetrySink(Sink):
+    """Records the metrics with an OpenTelemetry meter."""
+
+    def __init__(self, meter: Any = None):
+        """Create the sink; the instruments are created on first use.
+
+        Args:
+            meter (Any): The ``Meter``. Defaults to the meter ``pyoui`` of the global
+                meter provider.
+
+        """
+        if meter is None:
+            from opentelemetry import metrics as otel_metrics
+
+            meter = otel_metrics.get_meter("pyoui")
+        self._meter = meter
+        self._instruments: Dict[str, Any] = {}
+
+    def _instrument(self, kind: str, name: str) -> Any:
+        """Return the instrument of metric ``name``, creating it if needed."""
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            description = METRICS.get(name, (kind, name))[1]
+            unit = "s" if name.endswith("_seconds") else ("By" if "bytes" in name else "1")
+            create = {
+                "counter": self._meter.create_counter,
+                "histogram": self._meter.create_histogram,
+                "gauge": self._meter.create_gauge,
+            }[kind]
+            instrument = self._instruments[name] = create(name, unit=unit, description=description)
+        return instrument
+
+    def count(self, name: str, value: float, labels: Labels):
+        """Add to an OpenTelemetry counter."""
+        self._instrument("counter", name).add(value, labels)
+
+    def observe(self, name: str, value: float, labels: Labels):
+        """Record a value of an OpenTelemetry histogram."""
+        self._instrument("histogram", name).record(value, labels)
+
+    def gauge(self, name: str, value: float, labels: Labels):
+        """Set an OpenTelemetry gauge."""
+        self._instrument("gauge", name).set(value, labels)
+
+
+_sink: Optional[Sink] = None
+
+# (class, attribute, plain method, instrumented method) of every :func:`timed` method
+_timed: List[Tuple[type, str, Callable, Callable]] = []
+
+# cache hits and misses of the lookup running in each thread, see count_cache
+_cache_counts = threading.local()
+
+
+def count_cache(hit: bool):
+    """Count a lookup cache hit or miss of the lookup running in the current thread.
+
+    Counted per thread, so lookups running concurrently, e.g. in the threaded
+    servers, only record their own hits and misses.
+
+    Args:
+        hit (bool): True for a hit, False for a miss.
+
+    """
+    counts = _cache_counts
+    if hit:
+        counts.hits = getattr(counts, "hits", 0) + 1
+    else:
+        counts.misses = getattr(counts, "misses", 0) + 1
+
+
+def set_sink(sink: Optional[Sink]):
+    """Install the sink that receives all metrics.
+
+    The lookup methods are only replaced with their instrumented versions while a
+    sink is installed, so bound methods taken before should be taken again.
+
+    Args:
+        sink (Optional[Sink]): The sink, or None to stop recording.
+
+    """
+    global _sink
+    _sink = sink
+    for owner, name, method, wrapper in _timed:
+        setattr(owner, name, method if sink is None else wrapper)
+
+
+def get_sink() -> Optional[Sink]:
+    """Return the installed sink.
+
+    Returns:
+        Optional[Sink]: The sink, or None if metrics are disabled.
+
+    """
+    return _sink
+
+
+def count(name: str, value: float = 1, **labels: str):
+    """Increase a counter of the installed sink, if any."""
+    if _sink is not None:
+        _sink.count(name, value, labels)
+
+
+def observe(name: str, value: float, **labels: str):
+    """Record a histogram observation with the installed sink, if any."""
+    if _sink is not None:
+        _sink.observe(name, value, labels)
+
+
+def gauge(name: str, value: float, **labels: str):
+    """Set a gauge of the installed sink, if any."""
+    if _sink is not None:
+        _sink.gauge(name, value, labels)
+
+
+def _instrument(method: Callable) -> Callable:
+    """Return ``method`` recording its latency, items and cache hits to the sink."""
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, query, *args, **kwargs):
+        sink = _sink
+        if sink is None:
+            return method(self, query, *args, **kwargs)
+        labels = {"method": name}
+        counts = _cache_counts
+        outer = getattr(counts, "hits", 0), getattr(counts, "misses", 0)
+        counts.hits = counts.misses = 0
+        start = time.perf_counter()
+        result = method(self, query, *args, **kwargs)
+        if hasattr(result, "__next__"):
+            result = iter(list(result))
+        sink.observe("pyoui_lookup_seconds", time.perf_counter() - start, labels)
+        items = len(result) if name in ("lookup_many", "lookup_indices") else 1
+        sink.count("pyoui_lookup_items_total", items, labels)
+        hits, misses = counts.hits, counts.misses
+        counts.hits, counts.misses = outer
+        if hits:
+            sink.count("pyoui_lookup_cache_hits_total", hits, {})
+        if misses:
+            sink.count("pyoui_lookup_cache_misses_total", misses, {})
+        return result
+
+    return wrapper
+
+
+class timed:  # noqa: N801 - used as a decorator
+    """Record the latency and cache hits of a lookup method of ``OuiEntries``.
+
+    The class keeps the plain method until a sink is installed, so lookups cost
+    nothing extra while metrics are disabled. With a sink, the results of lookups
+    returning iterators are collected before the duration is taken, so the iterator
+    returned is already exhausted internally; lookups taking a batch also count
+    its items.
+    """
+
+    def __init__(self, method: Callable):
+        """Wrap a lookup method.
+
+        Args:
+            method (Callable): The lookup method.
+
+        """
+        self.method = method
+
+    def __set_name__(self, owner: type, name: str):
+        """Register the method and put the plain or instrumented one on the class."""
+        wrapper = _instrument(self.method)
+        _timed.append((owner, name, self.method, wrapper))
+        setattr(owner, name, self.method if _sink is None else wrapper)
@@ -1,22 +1,321 @@
 """Core OUI lookup logic."""
 
+import hashlib
+import json
+import os
 import re
+import sys
+import threading
 import time
-from dataclasses import dataclass
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from importlib import import_module
+from itertools import islice
 from pathlib import Path
 from tempfile import gettempdir
-from typing import Dict, Iterator, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from . import cache, countrynames, metrics
+from .cache import cache_path
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+    from .snapshot import SnapshotInfo
+
+# Only needed to download registries; imported on first use by the module __getattr__
+# so that looking up a cached database does not pay for them.
+_LAZY_IMPORTS = {"get": "requests", "RequestException": "requests", "tqdm": "tqdm"}
+
+# Separators of MAC addresses and prefixes, e.g. AA:BB:CC:DD:EE:FF, AA-BB-CC-DD-EE-FF
+# and Cisco's aabb.ccdd.eeff, which may also be omitted (AABBCCDDEEFF).
+_MAC_SEPARATORS = str.maketrans("", "", ":-.")
+# The separators between the pairs of AA:BB:CC:DD:EE:FF and AA-BB-CC-DD-EE-FF.
+_SEPARATOR_RUNS = frozenset((":::::", "-----"))
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+# A registry record: the "(hex)" line with prefix and organization, the "(base 16)"
+# (or a blank) line and, unless it is missing, the street / district / country
+# address. Address lines never contain "(hex)", so a record without an address does
+# not swallow the next one. Carriage returns of CRLF files are stripped afterwards.
+_ADDRESS_LINE = r"(?![^\n]*\(hex\))([^\n]*)"
+_RECORD_PATTERN = re.compile(
+    r"^([^\n(]*)\(hex\)([^\n]*)\n([^\n]*)"
+    rf"(?:\n{_ADDRESS_LINE}\n{_ADDRESS_LINE}\n{_ADDRESS_LINE})?",
+    re.M,
+)
+
+
+class _Logger:
+    """Stand-in for the loguru logger that imports loguru on first use."""
+
+    def __init__(self):
+        """Create the stand-in without importing loguru."""
+        self._setup: Optional[Callable[[Any], None]] = None
+
+    def on_load(self, setup: Callable[[Any], None]):
+        """Configure the logger once it is first used.
+
+        Args:
+            setup (Callable[[Any], None]): Called with the loguru logger before the
+                first message is logged through this stand-in.
+
+        """
+        self._setup = setup
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward to the loguru logger, importing and configuring it if needed."""
+        from loguru import logger
+
+        if self._setup is not None:
+            setup, self._setup = self._setup, None
+            setup(logger)
+        return getattr(logger, name)
+
+
+log = _Logger()
+
+
+def __getattr__(name: str) -> Any:
+    """Import a download dependency on first access (PEP 562).
+
+    Args:
+        name (str): The attribute name, e.g. ``get``.
+
+    Returns:
+        Any: The imported object; it is cached in the module namespace.
+
+    Raises:
+        AttributeError: If ``name`` is not a lazily imported attribute.
+
+    """
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(import_module(module), name)
+    return value
+
+
+def _lazy(name: str) -> Any:
+    """Return a lazily imported attribute, honouring a patched module attribute.
+
+    Args:
+        name (str): The attribute name.
+
+    Returns:
+        Any: The attribute.
+
+    """
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def _record_download(start: float, status: str, received: int = 0):
+    """Record the metrics of a finished download.
+
+    Args:
+        start (float): ``time.perf_counter()`` when the download started.
+        status (str): ``ok``, ``not_modified`` or ``error``.
+        received (int): Number of bytes written.
+
+    """
+    metrics.count("pyoui_downloads_total", status=status)
+    metrics.observe("pyoui_download_seconds", time.perf_counter() - start)
+    if received:
+        metrics.count("pyoui_download_bytes_total", received)
+
+
+def _mac_to_int(mac: Union[str, bytes, int]) -> Optional[int]:
+    """Convert a MAC address to its 48-bit integer value.
+
+    This is the single parser of MAC addresses: strings are accepted as 12 hex
+    digits, as six pairs separated by ``:`` or ``-`` (``AA:BB:CC:DD:EE:FF``) or as
+    three groups of four separated by ``.`` (``aabb.ccdd.eeff``).
+
+    Args:
+        mac (Union[str, bytes, int]): The MAC address as string, as ASCII bytes or
+            the 6 raw bytes of the address, or as integer.
+
+    Returns:
+        Optional[int]: The integer value, or None if the MAC address is invalid.
+
+    """
+    if isinstance(mac, bool):
+        return None
+    if isinstance(mac, int):
+        return mac if 0 <= mac < 1 << 48 else None
+    if isinstance(mac, (bytes, bytearray)):
+        if len(mac) == 6:
+            return int.from_bytes(mac, "big")
+        mac = mac.decode("latin-1")
+    elif not isinstance(mac, str):
+        return None
+    # separators must fill every separator position of a layout with one character;
+    # separators anywhere else are left in the digits and rejected by fromhex()
+    n = len(mac)
+    if n == 17:
+        if mac[2::3] not in _SEPARATOR_RUNS:
+            return None
+        digits = mac.replace(mac[2], "")
+    elif n == 14:
+        if mac[4::5] != "..":
+            return None
+        digits = mac.replace(".", "")
+    elif n == 12:
+        digits = mac
+    else:
+        return None
+    try:
+        # unlike int(), fromhex() rejects signs, "0x", underscores and non-ASCII digits
+        raw = bytes.fromhex(digits)
+    except ValueError:
+        return None
+    # fromhex() skips whitespace between the digit pairs
+    return int.from_bytes(raw, "big") if len(raw) == 6 else None
+
+
+def _format_prefix(value: int, bits: int) -> str:
+    """Format a prefix integer of the given length.
+
+    MA-L prefixes are formatted as ``AA:BB:CC``, longer MA-M / MA-S prefixes as the
+    first address of the block with a length suffix, e.g. ``70:B3:D5:F2:F0:00/36``.
+
+    Args:
+        value (int): The prefix integer (the top ``bits`` bits of the MAC address).
+        bits (int): The prefix length in bits.
+
+    Returns:
+        str: The formatted prefix.
+
+    """
+    if bits == 24:
+        return f"{value >> 16:02X}:{(value >> 8) & 0xFF:02X}:{value & 0xFF:02X}"
+    base = (value << (48 - bits)).to_bytes(6, "big")
+    return ":".join(f"{b:02X}" for b in base) + f"/{bits}"
+
+
+def _split_prefix(prefix: Union[str, bytes]) -> Optional[Tuple[int, int]]:
+    """Split a prefix string into its integer value and length in bits.
+
+    Separators are handled like in :func:`_mac_to_int`.
+
+    Args:
+        prefix (Union[str, bytes]): A prefix as produced by :func:`_format_prefix`,
+            with any or no separators, or a bare 6, 7 or 9 digit hex prefix; as string,
+            ASCII bytes or the 3 raw bytes of an MA-L prefix.
+
+    Returns:
+        Optional[Tuple[int, int]]: ``(value, bits)``, or None if the prefix is invalid.
+
+    """
+    if isinstance(prefix, (bytes, bytearray)):
+        if len(prefix) == 3:
+            return int.from_bytes(prefix, "big"), 24
+        prefix = prefix.decode("latin-1")
+    elif not isinstance(prefix, str):
+        return None
+    text, _, suffix = prefix.partition("/")
+    digits = text.translate(_MAC_SEPARATORS)
+    if not _HEX_DIGITS.issuperset(digits):
+        return None
+    try:
+        if not suffix:
+            if len(digits) not in (6, 7, 9):
+                return None
+            return int(digits, 16), 4 * len(digits)
+        bits = int(suffix)
+        if len(digits) != 12 or bits not in (24, 28, 36):
+            return None
+        return int(digits, 16) >> (48 - bits), bits
+    except ValueError:
+        return None
+
+
+def _canonical(text: Optional[str]) -> str:
+    """Normalize an organization field for grouping: case, punctuation and spacing.
+
+    Args:
+        text (Optional[str]): The field, e.g. ``Apple, Inc.``.
+
+    Returns:
+        str: The normalized field, e.g. ``apple inc``; empty for None.
+
+    """
+    if not text:
+        return ""
+    return " ".join(text.replace(",", " ").replace(".", " ").split()).casefold()
+
+
+def _org_id(
+    name: Optional[str], street: Optional[str], district: Optional[str], country: Optional[str]
+) -> int:
+    """Derive the id of an organization from its fields.
+
+    The id is a 63-bit hash of the fields after :func:`_canonical`, so entries
+    that only differ in case, punctuation or spacing share it, and it does not
+    depend on the other entries of the database.
+
+    Args:
+        name (Optional[str]): The organization name.
+        street (Optional[str]): The street address.
+        district (Optional[str]): The district, e.g. city and postal code.
+        country (Optional[str]): The country code.
+
+    Returns:
+        int: The org id.
+
+    """
+    key = "\0".join((_canonical(name), _canonical(street), _canonical(district)))
+    digest = hashlib.blake2b(f"{key}\0{(country or '').upper()}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "big") >> 1
 
-from loguru import logger as log
-from pycountry import countries
-from requests import RequestException, get
-from tqdm import tqdm
+
+def _block_prefix(prefix: str, block: str) -> str:
+    """Derive the prefix of an MA-M / MA-S / IAB assignment from its block range.
+
+    Args:
+        prefix (str): The normalized ``(hex)`` prefix, e.g. ``70:B3:D5``.
+        block (str): The ``(base 16)`` range, e.g. ``F2F000-F2FFFF``.
+
+    Returns:
+        str: The formatted prefix of the block, or ``prefix`` if ``block`` is not a range.
+
+    """
+    first, sep, last = block.partition("-")
+    if not sep:
+        return prefix
+    try:
+        start, end = int(first, 16), int(last, 16)
+        base = int(prefix.replace(":", "")[:6], 16) << 24 | start
+    except ValueError:
+        return prefix
+    bits = 49 - (end - start + 1).bit_length()
+    if bits not in (28, 36):
+        return prefix
+    return _format_prefix(base >> (48 - bits), bits)
 
 
 @dataclass
 class Organization:
     """Represents an organization associated with an OUI.
 
+    The entries returned by :meth:`OuiEntries.parse` with the same organization
+    fields share one instance.
+
     Attributes:
         name (str): The name of the organization.
         street (Optional[str]): Street address of the organization.
@@ -49,167 +348,888 @@ class OuiEntry:
         if self.prefix:
             self.prefix = self.prefix.replace("-", ":").upper()
 
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the entry as a JSON serializable dict.
+
+        Returns:
+            Dict[str, Any]: The prefix and the organization fields, if any.
+
+        """
+        org = self.organization
+        return {"prefix": self.prefix, "organization": org.__dict__.copy() if org else None}
+
+
+@dataclass
+class OuiDiff:
+    """The differences between two versions of the OUI database.
+
+    Entries are compared per prefix. Where exactly one entry of a prefix was
+    replaced by another, the pair is listed in ``changed``; other differences of a
+    prefix are listed in ``removed`` and ``added``.
+
+    Attributes:
+        added (List[OuiEntry]): Entries only present in the new version.
+        removed (List[OuiEntry]): Entries only present in the old version.
+        changed (List[Tuple[OuiEntry, OuiEntry]]): ``(old, new)`` entry pairs of
+            prefixes whose organization changed.
+
+    """
+
+    added: List[OuiEntry] = field(default_factory=list)
+    removed: List[OuiEntry] = field(default_factory=list)
+    changed: List[Tuple[OuiEntry, OuiEntry]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Return whether there are any differences."""
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def prefixes(self) -> List[str]:
+        """Return every prefix affected by the diff.
+
+        Returns:
+            List[str]: The affected prefixes, sorted and without duplicates.
+
+        """
+        entries = [*self.added, *self.removed, *(new for _, new in self.changed)]
+        return sorted({e.prefix for e in entries})
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the diff as a JSON serializable dict.
+
+        Returns:
+            Dict[str, Any]: The ``added``, ``removed`` and ``changed`` entries.
+
+        """
+        return {
+            "added": [e.as_dict() for e in self.added],
+            "removed": [e.as_dict() for e in self.removed],
+            "changed": [{"old": o.as_dict(), "new": n.as_dict()} for o, n in self.changed],
+        }
+
+
+#: Column value used for missing (``None``) strings.
+_NO_STRING = cache.NO_STRING
+#: Column value used for entries without a country.
+_NO_COUNTRY = 0xFFFF
+
+#: A parsed registry record: ``(prefix, name, street, district, country)``.
+Record = Tuple[str, Optional[str], Optional[str], Optional[str], Optional[str]]
+#: The organization fields of an entry: ``(name, street, district, country)``.
+Fields = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+#: A resolved MAC prefix: the index of the first matching entry (or ``NOT_FOUND``)
+#: and the formatted prefix and organization fields of every matching entry.
+Resolved = Tuple[int, Tuple[Tuple[str, Fields], ...]]
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the MAC lookup cache of an :class:`OuiEntries`.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to search the prefix index.
+        evictions (int): Least recently used results dropped to respect ``maxsize``.
+        maxsize (int): The maximum number of cached prefixes.
+        currsize (int): The number of cached prefixes.
+
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+def _entry_fields(entry: OuiEntry) -> Fields:
+    """Return the organization fields of an entry."""
+    org = entry.organization
+    if org is None:
+        return None, None, None, None
+    return org.name, org.street, org.district, org.country
+
+
+class _EntryList(Sequence):
+    """Read-only list of entries that creates :class:`OuiEntry` objects on access."""
+
+    def __init__(self, owner: "OuiEntries"):
+        """Create a view of the entries of ``owner``."""
+        self._owner = owner
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return self._owner.size()
+
+    def __getitem__(self, i):
+        """Return the entry (or list of entries for a slice) at ``i``."""
+        if isinstance(i, slice):
+            return [self._owner._entry(k) for k in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("entry index out of range")
+        return self._owner._entry(i)
+
+    def __eq__(self, other) -> bool:
+        """Compare element-wise with another sequence."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+class _OrganizationIndex:
+    """Trigram index over the lowercased organization names of a name column."""
+
+    def __init__(self, names: Sequence[int], strings: Sequence[str]):
+        """Build the index.
+
+        Args:
+            names (Sequence[int]): The organization name string id of every entry.
+            strings (Sequence[str]): The string table.
+
+        """
+        rows: Dict[str, List[int]] = {}
+        for i, sid in enumerate(names):
+            if sid != _NO_STRING and strings[sid]:
+                rows.setdefault(strings[sid].lower(), []).append(i)
+        self.names: List[str] = list(rows)
+        self.rows: List[List[int]] = list(rows.values())
+
+        # trigram -> ids of the names containing it, in ascending order
+        self.postings: Dict[str, array] = {}
+        for nid, n in enumerate(self.names):
+            for gram in {n[k : k + 3] for k in range(len(n) - 2)}:
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array("I")
+                posting.append(nid)
+
+    def search(self, name: str) -> List[int]:
+        """Return the entry indices whose organization name contains ``name``.
+
+        Args:
+            name (str): The organization name (partial match, case-insensitive).
+
+        Returns:
+            List[int]: Matching entry indices in ascending order.
+
+        """
+        low = name.lower()
+        if len(low) < 3:
+            candidates: Iterable[int] = range(len(self.names))
+        else:
+            # Every match contains all trigrams of the query, so only the names in
+            # the rarest posting list need to be checked.
+            postings = [self.postings.get(low[k : k + 3]) for k in range(len(low) - 2)]
+            if not all(postings):
+                return []
+            candidates = min(postings, key=len)
+
+        names = self.names
+        return sorted(i for nid in candidates if low in names[nid] for i in self.rows[nid])
+
 
 class OuiEntries:
-    """A collection of OUI entries parsed from a file."""
+    """A collection of OUI entries parsed from one or more registry files.
+
+    MAC addresses are resolved with a longest-prefix match over the 24, 28 and
+    36-bit prefixes of the MA-L, MA-M, MA-S and IAB registries that were loaded.
 
-    def __init__(self, infile: str, debug: bool = False):
-        """Initialize the collection by parsing the input file.
+    Entries are stored column-wise: an integer prefix key per entry, string ids into
+    a deduplicated string table for the organization fields and a 16-bit index into
+    a table of country codes. :class:`OuiEntry` objects are only created when they
+    are returned.
+    """
+
+    #: Index returned by :meth:`lookup_indices` for MAC addresses without a match.
+    NOT_FOUND: int = -1
+
+    #: Default number of MAC prefixes whose lookup results are cached.
+    LOOKUP_CACHE_SIZE: int = 4096
+
+    def __init__(
+        self,
+        infile: Union[str, Sequence[str]],
+        debug: bool = False,
+        cache_file: Optional[str] = None,
+        lookup_cache_size: int = LOOKUP_CACHE_SIZE,
+    ):
+        """Initialize the collection by parsing the input file(s).
 
         Args:
-            infile (str): Path to the OUI text file.
+            infile (Union[str, Sequence[str]]): Path to the OUI text file, or a list of
+                registry files (``oui.txt``, ``mam.txt``, ``oui36.txt``, ``iab.txt``)
+                which are merged in the given order.
             debug (bool): Enable debug logging. Defaults to False.
+            cache_file (Optional[str]): Path of a compiled binary cache. When given, the
+                cache is used instead of parsing ``infile`` as long as it matches the
+                file(s), and is (re)built otherwise. Defaults to None (no cache).
+            lookup_cache_size (int): Number of MAC prefixes whose :meth:`by_mac` and
+                :meth:`lookup_many` results are kept in an LRU cache; 0 disables it.
+                Can be changed later through the ``lookup_cache_size`` attribute.
+
+        """
+        self._reset()
+        self.lookup_cache_size = lookup_cache_size
+        files = [infile] if isinstance(infile, str) else list(infile)
+        self._load(files, cache_file, debug)
+        self._build_index()
+
+    @classmethod
+    def from_buffer(cls, buf: memoryview) -> "OuiEntries":
+        """Create a collection using the columns of a serialized database in place.
+
+        Args:
+            buf (memoryview): A database in the compiled cache format, which must stay
+                alive and unchanged as long as the collection is used.
+
+        Returns:
+            OuiEntries: The collection.
+
+        Raises:
+            ValueError: If ``buf`` does not hold a compatible database.
+
+        """
+        columns = cache.loads(buf)
+        if columns is None:
+            raise ValueError("Buffer does not contain a compatible OUI database")
+        self = cls.__new__(cls)
+        self._reset()
+        self._adopt(columns)
+        self._build_index()
+        return self
+
+    def publish(self, name: Optional[str] = None) -> "SharedMemory":
+        """Publish the database into a shared memory block.
+
+        Other processes can then :meth:`attach` to it by name and use the same copy
+        of the data. The caller owns the block and should ``close()`` and
+        ``unlink()`` it once no process needs it anymore.
+
+        Args:
+            name (Optional[str]): Name of the block. Defaults to a random name.
+
+        Returns:
+            SharedMemory: The block; its ``name`` is what :meth:`attach` expects.
+
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        data = cache.dumps(self._columns())
+        shm = SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[: len(data)] = data
+        return shm
+
+    @classmethod
+    def attach(cls, name: str) -> "OuiEntries":
+        """Attach read-only to a database published with :meth:`publish`.
+
+        The columns are used in place (zero-copy); only the prefix index is built
+        per process.
+
+        Args:
+            name (str): Name of the shared memory block.
+
+        Returns:
+            OuiEntries: The collection.
+
+        Raises:
+            FileNotFoundError: If there is no block with that name.
+            ValueError: If the block does not hold a compatible database.
+
+        """
+        from multiprocessing import resource_tracker
+        from multiprocessing.shared_memory import SharedMemory
+
+        try:
+            shm = SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 registers every attached block with the resource tracker,
+            # which would unlink it when this process exits.
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                shm = SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        self = cls.from_buffer(shm.buf)
+        self._shm = shm
+        return self
+
+    def _reset(self):
+        """Initialize empty columns."""
+        # prefix integer << 8 | prefix length in bits, per entry
+        self._keys: Sequence[int] = array("Q")
+        # deduplicated string table and per-entry string ids into it
+        self._strings: Sequence[str] = []
+        self._names: Sequence[int] = array("I")
+        self._streets: Sequence[int] = array("I")
+        self._districts: Sequence[int] = array("I")
+        # org id per entry, see _org_id
+        self._orgs: Sequence[int] = array("Q")
+        # table of country codes and per-entry 16-bit index into it
+        self._country_codes: List[str] = []
+        self._countries: Sequence[int] = array("H")
+        # normalized country name / alias -> country code, see countrynames
+        self._country_names: Dict[str, str] = {}
+        # shared memory block the columns live in, if attached
+        self._shm: Optional["SharedMemory"] = None
+        self.lookup_cache_size = self.LOOKUP_CACHE_SIZE
+
+    def _build_index(self):
+        """Build the lookup indexes over the columns."""
+        start = time.perf_counter()
+        self._country_rows: Optional[Dict[str, List[int]]] = None
+        # organization name string id -> entry indices, see _organization_rows
+        self._org_rows: Optional[Dict[int, List[int]]] = None
+        # org id -> entry indices, see _org_table
+        self._org_groups: Optional[Dict[int, List[int]]] = None
+
+        # Integer prefix index: prefix length -> prefix integer -> index of the first
+        # entry registered for it. Lookups probe the lengths longest first. Further
+        # entries with the same prefix are listed in _duplicates by the first one.
+        self._key_maps: Dict[int, Dict[int, int]] = {}
+        self._duplicates: Dict[int, List[int]] = {}
+        for i, k in enumerate(self._keys):
+            first = self._key_maps.setdefault(k & 0xFF, {}).setdefault(k >> 8, i)
+            if first != i:
+                self._duplicates.setdefault(first, []).append(i)
+        self._lengths = sorted(self._key_maps, reverse=True)
+        self._tables: Optional[List[Tuple[int, array, array]]] = None
+        self._org_index: Optional[_OrganizationIndex] = None
+
+        # LRU cache of resolved MAC prefixes, see _resolve
+        self._cache_lock = threading.Lock()
+        self._lookup_cache: "OrderedDict[int, Resolved]" = OrderedDict()
+        self._cache_hits = self._cache_misses = self._cache_evictions = 0
+        self._find_split_blocks()
+        if metrics.get_sink() is not None:
+            metrics.observe("pyoui_index_build_seconds", time.perf_counter() - start)
+            metrics.gauge("pyoui_entries", self.size())
+            metrics.gauge("pyoui_memory_bytes", self.memory_usage())
+
+    def _find_split_blocks(self):
+        """Collect the 24-bit prefixes that contain longer MA-M / MA-S prefixes."""
+        self._split_blocks: Set[int] = {
+            value >> (bits - 24)
+            for bits, key_map in self._key_maps.items()
+            if bits > 24
+            for value in key_map
+        }
+
+    @property
+    def entries(self) -> Sequence[OuiEntry]:
+        """Return all entries.
+
+        Returns:
+            Sequence[OuiEntry]: A read-only sequence creating the entries on access.
+
+        """
+        return _EntryList(self)
+
+    def _fields(self, i: int) -> Fields:
+        """Return the organization fields of the entry stored at index ``i``."""
+        s = self._strings
+        n, st, d, c = self._names[i], self._streets[i], self._districts[i], self._countries[i]
+        return (
+            None if n == _NO_STRING else s[n],
+            None if st == _NO_STRING else s[st],
+            None if d == _NO_STRING else s[d],
+            None if c == _NO_COUNTRY else self._country_codes[c],
+        )
+
+    def _prefix(self, i: int) -> str:
+        """Return the formatted prefix of the entry stored at index ``i``."""
+        k = self._keys[i]
+        return _format_prefix(k >> 8, k & 0xFF)
+
+    def _entry(self, i: int) -> OuiEntry:
+        """Create the entry stored at index ``i``."""
+        return OuiEntry(prefix=self._prefix(i), organization=Organization(*self._fields(i)))
+
+    def _rows(self, row: int) -> List[int]:
+        """Return the index of every entry sharing the prefix of entry ``row``."""
+        return [row, *self._duplicates.get(row, ())]
+
+    def _link(self, i: int):
+        """Add entry ``i`` to the prefix index."""
+        k = self._keys[i]
+        first = self._key_maps.setdefault(k & 0xFF, {}).setdefault(k >> 8, i)
+        if first != i:
+            self._duplicates.setdefault(first, []).append(i)
+
+    def _unlink(self, i: int):
+        """Remove entry ``i`` from the prefix index."""
+        k = self._keys[i]
+        bits, value = k & 0xFF, k >> 8
+        key_map = self._key_maps[bits]
+        rows = self._rows(key_map[value])
+        self._duplicates.pop(rows[0], None)
+        rows.remove(i)
+        if rows:
+            key_map[value] = rows[0]
+            if len(rows) > 1:
+                self._duplicates[rows[0]] = rows[1:]
+        else:
+            del key_map[value]
+            if not key_map:
+                del self._key_maps[bits]
+
+    def _load(self, files: List[str], cache_file: Optional[str], debug: bool):
+        """Load the columns from the compiled cache if possible, otherwise parse them.
+
+        Args:
+            files (List[str]): Paths to the OUI text files.
+            cache_file (Optional[str]): Path of the compiled cache, if any.
+            debug (bool): Enable debug logging.
 
         """
-        self.entries: List[OuiEntry] = self.parse(infile, debug=debug)
-        self._country_cache: Dict[str, str] = {}
-        self._prefix_map: Dict[str, List[OuiEntry]] = {}
-        self._country_map: Dict[str, List[OuiEntry]] = {}
+        start = time.perf_counter()
+        if cache_file is not None:
+            data = cache.read(cache_file, files)
+            if data is not None:
+                if debug:
+                    log.debug(f"Loaded {len(data.keys)} entries from cache {cache_file}")
+                self._adopt(data)
+                metrics.observe("pyoui_cache_load_seconds", time.perf_counter() - start)
+                return
+
+        start = time.perf_counter()
+        self._extend(r for f in files for r in self._records(f, debug=debug))
+        self._index_country_names()
+        metrics.observe("pyoui_parse_seconds", time.perf_counter() - start)
+        metrics.count("pyoui_parse_records_total", self.size())
+        if cache_file is not None:
+            self._save(files, cache_file, debug)
+
+    def _save(self, files: List[str], cache_file: str, debug: bool):
+        """Write the compiled cache, logging a warning if that fails.
 
-        for e in self.entries:
-            # Populate prefix map
-            if e.prefix not in self._prefix_map:
-                self._prefix_map[e.prefix] = []
-            self._prefix_map[e.prefix].append(e)
+        Args:
+            files (List[str]): Paths to the OUI text files the columns represent.
+            cache_file (str): Path of the compiled cache.
+            debug (bool): Enable debug logging.
 
-            # Populate country map
-            if e.organization and e.organization.country:
-                cc = e.organization.country.upper()
-                if cc not in self._country_map:
-                    self._country_map[cc] = []
-                self._country_map[cc].append(e)
+        """
+        try:
+            cache.write(cache_file, files, self._columns())
+            if debug:
+                log.debug(f"Wrote cache {cache_file}")
+        except (OSError, ValueError) as ex:
+            log.warning(f"Failed to write OUI cache {cache_file}: {ex}")
+
+    def _extend(self, records: Iterable[Record]):
+        """Append parsed records to the columns, interning their strings.
+
+        Args:
+            records (Iterable[Record]): The records to append.
+
+        """
+        # None maps to _NO_STRING, so every new string gets id len(string_ids) - 1
+        string_ids: Dict[Optional[str], int] = {None: _NO_STRING}
+        string_ids.update((v, k) for k, v in enumerate(self._strings))
+        intern = string_ids.setdefault
+        country_ids: Dict[Optional[str], int] = {None: _NO_COUNTRY}
+        country_ids.update((v, k) for k, v in enumerate(self._country_codes))
+        n_countries = len(country_ids)
+
+        # the fields of most entries repeat, so each distinct one is hashed once
+        org_ids: Dict[Tuple[int, int, int, int], int] = {}
+
+        keys, names, streets, districts = self._keys, self._names, self._streets, self._districts
+        for prefix, name, street, district, country in records:
+            key = _split_prefix(prefix)
+            if key is None:
+                log.debug(f"Skipping entry with invalid prefix: {prefix}")
+                continue
+            ids = (
+                intern(name, len(string_ids) - 1),
+                intern(street, len(string_ids) - 1),
+                intern(district, len(string_ids) - 1),
+                country_ids.setdefault(country, len(country_ids) - 1),
+            )
+            org = org_ids.get(ids)
+            if org is None:
+                org = org_ids[ids] = _org_id(name, street, district, country)
+            keys.append(key[0] << 8 | key[1])
+            self._orgs.append(org)
+            names.append(ids[0])
+            streets.append(ids[1])
+            districts.append(ids[2])
+            self._countries.append(ids[3])
+
+        self._strings.extend(islice(string_ids, len(self._strings) + 1, None))
+        self._country_codes.extend(islice(country_ids, n_countries, None))
+
+    def _index_country_names(self):
+        """Add the names of country codes that are not in the country name index yet."""
+        known = set(self._country_names.values())
+        new = [c for c in self._country_codes if c and c.upper() not in known]
+        if new:
+            self._country_names.update(countrynames.aliases(new))
+
+    def _columns(self) -> cache.Columns:
+        """Return the columns of the database."""
+        return cache.Columns(
+            self._keys,
+            self._orgs,
+            self._names,
+            self._streets,
+            self._districts,
+            self._countries,
+            self._country_codes,
+            self._strings,
+            self._country_names,
+        )
+
+    def _adopt(self, columns: cache.Columns):
+        """Use the given columns, e.g. views into a compiled cache, as they are."""
+        self._keys = columns.keys
+        self._orgs = columns.orgs
+        self._names = columns.names
+        self._streets = columns.streets
+        self._districts = columns.districts
+        self._countries = columns.countries
+        self._country_codes = list(columns.country_codes)
+        self._strings = columns.strings
+        self._country_names = dict(columns.country_names)
+
+    def _make_mutable(self):
+        """Copy columns that are views into a cache or shared memory into arrays."""
+        for attr, typecode in (
+            ("_keys", "Q"),
+            ("_orgs", "Q"),
+            ("_names", "I"),
+            ("_streets", "I"),
+            ("_districts", "I"),
+            ("_countries", "H"),
+        ):
+            column = getattr(self, attr)
+            if not isinstance(column, array):
+                copy = array(typecode)
+                copy.frombytes(column.cast("B"))
+                setattr(self, attr, copy)
+        if not isinstance(self._strings, list):
+            self._strings = list(self._strings)
+
+    def _remove_row(self, i: int):
+        """Remove entry ``i``, moving the last entry into its place."""
+        columns = (
+            self._keys,
+            self._orgs,
+            self._names,
+            self._streets,
+            self._districts,
+            self._countries,
+        )
+        self._unlink(i)
+        last = len(self._keys) - 1
+        if i != last:
+            self._unlink(last)
+            for column in columns:
+                column[i] = column[last]
+            self._link(i)
+        for column in columns:
+            column.pop()
 
     @staticmethod
-    def parse(filename: str, debug: bool = False) -> List[OuiEntry]:
-        """Parse the OUI file.
+    def _records(filename: str, debug: bool = False) -> Iterator[Record]:
+        """Parse the records of an OUI file.
 
         Args:
             filename (str): The file to parse.
             debug (bool): Enable debug logging.
 
-        Returns:
-            List[OuiEntry]: A list of parsed OUI entries.
+        Yields:
+            Iterator[Record]: ``(prefix, name, street, district, country)`` per entry.
 
         """
         if debug:
             log.debug(f"Parsing entries from {filename}")
-        lst: List[OuiEntry] = []
-        with open(filename, encoding="utf-8") as i:
-            current_entry: Optional[OuiEntry] = None
-            current_org: Optional[Organization] = None
-            # line_counter tracks lines after the (hex) line
-            # -1: searching for (hex)
-            # 0: just found (hex), next is blank
-            # 1: next is street
-            # 2: next is district
-            # 3: next is country
-            line_counter = -1
-
-            for _ in i:
-                line = _.rstrip("\n")
-                if "(hex)" in line:
-                    # Save previous if it exists (though the state machine should handle it)
-                    # prefix is always first 8 chars; organization follows '(hex)'
-                    prefix = line[0:8].strip()
-                    org_name = line.split("(hex)", 1)[1].strip()
-                    current_org = Organization(name=org_name)
-                    current_entry = OuiEntry(prefix=prefix, organization=current_org)
-                    line_counter = 0
-                    continue
-
-                if line_counter == 0:  # Blank line after (hex)
-                    line_counter = 1
-                elif line_counter == 1:  # Street
-                    if current_org:
-                        current_org.street = line.strip()
-                    line_counter = 2
-                elif line_counter == 2:  # District
-                    if current_org:
-                        current_org.district = line.strip()
-                    line_counter = 3
-                elif line_counter == 3:  # Country
-                    if current_org:
-                        current_org.country = line.strip()
-                    if current_entry:
-                        lst.append(current_entry)
-                    line_counter = -1
-
-        return lst
+        text = Path(filename).read_bytes().decode("utf-8")
+        for prefix, name, second, street, district, country in _RECORD_PATTERN.findall(text):
+            prefix = prefix.strip().replace("-", ":").upper()
+            if len(prefix) != 8:  # not AA:BB:CC
+                key = _split_prefix(prefix)
+                if key is not None and key[1] != 24:
+                    prefix = _format_prefix(*key)
+            if "(base 16)" in second:
+                prefix = _block_prefix(prefix, second.split("(base 16)", 1)[0].strip())
+            street, district, country = street.strip(), district.strip(), country.strip()
+            if street or district or country:
+                yield prefix, name.strip(), street, district, country
+            else:  # e.g. "Private" assignments, which are published without an address
+                yield prefix, name.strip(), None, None, None
+
+    @classmethod
+    def parse(cls, filename: str, debug: bool = False) -> List[OuiEntry]:
+        """Parse the OUI file.
+
+        Args:
+            filename (str): The file to parse.
+            debug (bool): Enable debug logging.
+
+        Returns:
+            List[OuiEntry]: A list of parsed OUI entries; entries with the same
+                organization fields share one :class:`Organization`.
+
+        """
+        organizations: Dict[Fields, Organization] = {}
+        entries = []
+        for prefix, *fields in cls._records(filename, debug=debug):
+            key = tuple(fields)
+            org = organizations.get(key)
+            if org is None:
+                org = organizations[key] = Organization(*key)
+            entries.append(OuiEntry(prefix=prefix, organization=org))
+        return entries
 
     @staticmethod
-    def is_valid_mac(mac: str) -> bool:
+    def is_valid_mac(mac: Union[str, bytes, int]) -> bool:
         """Check if a MAC address is valid.
 
         Args:
-            mac (str): The MAC address to check.
+            mac (Union[str, bytes, int]): The MAC address to check, e.g.
+                ``AA:BB:CC:DD:EE:FF``, ``AA-BB-CC-DD-EE-FF``, ``aabb.ccdd.eeff`` or
+                ``AABBCCDDEEFF``.
 
         Returns:
             bool: True if valid, False otherwise.
 
         """
-        if not mac:
-            return False
-        # Supports formats like AA:BB:CC:DD:EE:FF, AA-BB-CC-DD-EE-FF, AABBCCDDEEFF
-        # and also shorter forms if they are meant to be prefixes.
-        # But here we specifically check for a full MAC.
-        pattern = re.compile(r"^([0-9A-Fa-f]{2}[:-]?){5}([0-9A-Fa-f]{2})$")
-        return bool(pattern.match(mac))
+        return _mac_to_int(mac) is not None
 
     @staticmethod
-    def is_valid_prefix(prefix: str) -> bool:
+    def is_valid_prefix(prefix: Union[str, bytes]) -> bool:
         """Check if a MAC prefix is valid.
 
         Args:
-            prefix (str): The MAC prefix to check.
+            prefix (Union[str, bytes]): The MAC prefix to check, e.g. ``AA:BB:CC``,
+                ``AABBCC`` or ``AA:BB:CC:D0:00:00/28``.
 
         Returns:
             bool: True if valid, False otherwise.
 
         """
-        if not prefix:
-            return False
-        # Supports formats like AA:BB:CC, AA-BB-CC, AABBCC
-        pattern = re.compile(r"^([0-9A-Fa-f]{2}[:-]?){2}([0-9A-Fa-f]{2})$")
-        return bool(pattern.match(prefix))
+        return _split_prefix(prefix) is not None
 
-    def by_mac(self, mac: str) -> Iterator[OuiEntry]:
+    @metrics.timed
+    def by_mac(self, mac: Union[str, bytes, int]) -> Iterator[OuiEntry]:
         """Search for entries by MAC address.
 
         Args:
-            mac (str): The MAC address to search for.
+            mac (Union[str, bytes, int]): The MAC address to search for, in any
+                notation :meth:`is_valid_mac` accepts, as bytes or as 48-bit integer.
 
         Yields:
             Iterator[OuiEntry]: Matching OUI entries.
 
         """
-        if not self.is_valid_mac(mac):
+        value = _mac_to_int(mac)
+        if value is None:
             if mac:
                 log.warning(f"Invalid MAC address: {mac}")
             return
-        n_mac = mac.replace("-", ":").upper()
-        # For OUI (MA-L), the prefix is the first 8 characters (XX:XX:XX)
-        prefix = n_mac[:8]
-        if prefix in self._prefix_map:
-            yield from self._prefix_map[prefix]
+        for prefix, fields in self._resolve(value)[1]:
+            yield OuiEntry(prefix, Organization(*fields))
+
+    def _resolve(self, value: Optional[int]) -> Resolved:
+        """Return the longest-prefix match of a MAC integer, using the LRU cache.
+
+        Results are cached per 24-bit prefix, or per 36-bit prefix inside 24-bit
+        prefixes that are split into MA-M / MA-S blocks.
+
+        Args:
+            value (Optional[int]): The 48-bit MAC address integer.
+
+        Returns:
+            Resolved: The first matching entry index and the matching entries' data.
+
+        """
+        if value is None:
+            return self.NOT_FOUND, ()
+        size = self.lookup_cache_size
+        if size <= 0:
+            return self._resolve_uncached(value)
+        key = value >> 24
+        if key in self._split_blocks:
+            key = ~(value >> 12)  # negative, so it never equals a 24-bit key
+        cache = self._lookup_cache
+        with self._cache_lock:
+            resolved = cache.get(key)
+            if resolved is not None:
+                cache.move_to_end(key)
+                self._cache_hits += 1
+        if resolved is not None:
+            if metrics.get_sink() is not None:
+                metrics.count_cache(True)
+            return resolved
+
+        resolved = self._resolve_uncached(value)
+        with self._cache_lock:
+            self._cache_misses += 1
+            cache[key] = resolved
+            while len(cache) > size:
+                cache.popitem(last=False)
+                self._cache_evictions += 1
+        if metrics.get_sink() is not None:
+            metrics.count_cache(False)
+        return resolved
+
+    def _resolve_uncached(self, value: int) -> Resolved:
+        """Return the longest-prefix match of a MAC integer."""
+        row = self._match(value)
+        rows = self._rows(row) if row != self.NOT_FOUND else ()
+        return row, tuple((self._prefix(r), self._fields(r)) for r in rows)
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics of the MAC lookup cache.
+
+        Returns:
+            CacheInfo: Hits, misses, evictions and sizes of the cache.
+
+        """
+        with self._cache_lock:
+            return CacheInfo(
+                self._cache_hits,
+                self._cache_misses,
+                self._cache_evictions,
+                self.lookup_cache_size,
+                len(self._lookup_cache),
+            )
+
+    def cache_clear(self):
+        """Empty the MAC lookup cache and reset its statistics."""
+        with self._cache_lock:
+            self._lookup_cache.clear()
+            self._cache_hits = self._cache_misses = self._cache_evictions = 0
+
+    def _match(self, value: Optional[int]) -> int:
+        """Return the entry index of the longest prefix matching a MAC integer.
+
+        Args:
+            value (Optional[int]): The 48-bit MAC address integer.
 
-    def by_prefix(self, prefix: str) -> Iterator[OuiEntry]:
+        Returns:
+            int: The index into ``entries``, or :attr:`NOT_FOUND`.
+
+        """
+        if value is None:
+            return self.NOT_FOUND
+        for bits in self._lengths:
+            row = self._key_maps[bits].get(value >> (48 - bits))
+            if row is not None:
+                return row
+        return self.NOT_FOUND
+
+    def _sorted_tables(self) -> List[Tuple[int, array, array]]:
+        """Return ``(bits, sorted keys, rows)`` per prefix length, longest first."""
+        if self._tables is None:
+            tables = []
+            for bits in self._lengths:
+                key_map = self._key_maps[bits]
+                keys = array("Q", sorted(key_map))
+                tables.append((bits, keys, array("i", [key_map[k] for k in keys])))
+            self._tables = tables
+        return self._tables
+
+    @metrics.timed
+    def lookup_indices(self, macs: Iterable[Union[str, bytes, int]]) -> Any:
+        """Resolve many MAC addresses to entry indices at once.
+
+        NumPy arrays of integer MAC addresses are resolved with one vectorized
+        ``searchsorted`` per prefix length over the sorted prefix tables; any other
+        iterable of MAC strings or integers is resolved with a dict probe per
+        prefix length and address.
+
+        Args:
+            macs (Iterable[Union[str, bytes, int]]): MAC addresses as strings, bytes or
+                48-bit integers, or a NumPy array of integers.
+
+        Returns:
+            Any: Indices into ``entries`` aligned with ``macs``, :attr:`NOT_FOUND` for
+                unknown or invalid addresses. A NumPy ``int64`` array if ``macs`` is a
+                NumPy array, a list otherwise.
+
+        """
+        return self._lookup_indices(macs)
+
+    def _lookup_indices(self, macs: Iterable[Union[str, bytes, int]]) -> Any:
+        """Resolve MAC addresses to entry indices, see :meth:`lookup_indices`.
+
+        Not instrumented, so lookups built on it are recorded once under their own name.
+        """
+        if hasattr(macs, "dtype") and macs.dtype.kind in "iu":
+            import numpy as np
+
+            values = np.asarray(macs).astype(np.uint64)
+            result = np.full(values.shape, self.NOT_FOUND, dtype=np.int64)
+            for bits, keys, rows in self._sorted_tables():
+                np_keys = np.frombuffer(keys, dtype=np.uint64)
+                prefixes = values >> np.uint64(48 - bits)
+                pos = np.minimum(np.searchsorted(np_keys, prefixes), len(np_keys) - 1)
+                hit = (np_keys[pos] == prefixes) & (result == self.NOT_FOUND)
+                result[hit] = np.frombuffer(rows, dtype=np.int32)[pos[hit]]
+            return result
+
+        return [self._match(_mac_to_int(mac)) for mac in macs]
+
+    @metrics.timed
+    def lookup_many(self, macs: Iterable[Union[str, bytes, int]]) -> List[Optional[OuiEntry]]:
+        """Resolve many MAC addresses at once.
+
+        Args:
+            macs (Iterable[Union[str, bytes, int]]): MAC addresses as strings, bytes or
+                48-bit integers, or a NumPy array of integers.
+
+        Returns:
+            List[Optional[OuiEntry]]: The matching entry for every address, in input
+                order, or None if there is no match.
+
+        """
+        if hasattr(macs, "dtype"):
+            entry = self._entry
+            return [entry(i) if i >= 0 else None for i in self._lookup_indices(macs)]
+
+        results: List[Optional[OuiEntry]] = []
+        for mac in macs:
+            resolved = self._resolve(_mac_to_int(mac))[1]
+            if resolved:
+                prefix, fields = resolved[0]
+                results.append(OuiEntry(prefix, Organization(*fields)))
+            else:
+                results.append(None)
+        return results
+
+    @metrics.timed
+    def by_prefix(self, prefix: Union[str, bytes]) -> Iterator[OuiEntry]:
         """Search for entries by MAC prefix.
 
         Args:
-            prefix (str): The MAC prefix to search for.
+            prefix (Union[str, bytes]): The MAC prefix to search for, e.g. ``AA:BB:CC``
+                or, for MA-M and MA-S assignments, ``70:B3:D5:F2:F0:00/36``; see
+                :meth:`is_valid_prefix`.
 
         Yields:
             Iterator[OuiEntry]: Matching OUI entries.
 
         """
-        if not self.is_valid_prefix(prefix):
+        key = _split_prefix(prefix)
+        if key is None:
             if prefix:
                 log.warning(f"Invalid MAC prefix: {prefix}")
             return
-        n_prefix = prefix.replace("-", ":").upper()
-        if n_prefix in self._prefix_map:
-            yield from self._prefix_map[n_prefix]
+        value, bits = key
+        row = self._key_maps.get(bits, {}).get(value)
+        if row is not None:
+            yield from map(self._entry, self._rows(row))
 
+    @metrics.timed
     def by_organization(self, name: str) -> Iterator[OuiEntry]:
         """Search for entries by organization name.
 
@@ -222,14 +1242,17 @@ class OuiEntries:
         """
         if not name:
             return
-        low = name.lower()
-        for e in self.entries:
-            if e.organization and e.organization.name and low in e.organization.name.lower():
-                yield e
+        if self._org_index is None:
+            self._org_index = _OrganizationIndex(self._names, self._strings)
+        yield from map(self._entry, self._org_index.search(name))
 
+    @metrics.timed
     def by_country_name(self, name: str) -> Iterator[OuiEntry]:
         """Search for entries by country name.
 
+        The name is matched against the names and aliases of the countries in the
+        database, tolerating case, accents, partial names and small misspellings.
+
         Args:
             name (str): The country name.
 
@@ -239,18 +1262,10 @@ class OuiEntries:
         """
         if not name:
             return iter(())
+        cc = countrynames.match(self._country_names, name)
+        return map(self._entry, self._country_code_rows(cc)) if cc else iter(())
 
-        if name in self._country_cache:
-            return self.by_country_code(self._country_cache[name])
-
-        try:
-            cc = countries.search_fuzzy(name)[0].alpha_2
-            self._country_cache[name] = cc
-            return self.by_country_code(cc)
-        except LookupError:
-            # empty iterator for unknown country names
-            return iter(())
-
+    @metrics.timed
     def by_country_code(self, cc: str) -> Iterator[OuiEntry]:
         """Search for entries by two-letter country code.
 
@@ -261,11 +1276,373 @@ class OuiEntries:
             Iterator[OuiEntry]: Matching OUI entries.
 
         """
+        yield from map(self._entry, self._country_code_rows(cc))
+
+    def _country_code_rows(self, cc: str) -> List[int]:
+        """Return the entry indices of a two-letter country code, empty if it is invalid."""
         if not cc or len(cc) != 2:
-            return
-        ncc = cc.upper()
-        if ncc in self._country_map:
-            yield from self._country_map[ncc]
+            return []
+        return self._country_index().get(cc.upper(), [])
+
+    def _country_index(self) -> Dict[str, List[int]]:
+        """Return the entry indices of every upper-case country code, built on first use."""
+        if self._country_rows is None:
+            codes = [c.upper() for c in self._country_codes]
+            rows: Dict[str, List[int]] = {}
+            for i, c in enumerate(self._countries):
+                if c != _NO_COUNTRY and codes[c]:
+                    rows.setdefault(codes[c], []).append(i)
+            self._country_rows = rows
+        return self._country_rows
+
+    def _organization_rows(self) -> Dict[int, List[int]]:
+        """Return the entry indices of every organization name id, built on first use."""
+        if self._org_rows is None:
+            rows: Dict[int, List[int]] = {}
+            for i, sid in enumerate(self._names):
+                if sid != _NO_STRING:
+                    rows.setdefault(sid, []).append(i)
+            self._org_rows = rows
+        return self._org_rows
+
+    def _name_counts(self, counts: Dict[int, int]) -> "Counter[str]":
+        """Turn counts per name string id into counts per (non-empty) name."""
+        strings = self._strings
+        # strings are interned, so every name has exactly one id
+        return Counter({strings[sid]: n for sid, n in counts.items() if strings[sid]})
+
+    def _organization_counts(self, country: Optional[str]) -> Dict[int, int]:
+        """Count the prefixes per name string id, optionally of one country only."""
+        if country is None:
+            return {sid: len(rows) for sid, rows in self._organization_rows().items()}
+        names = self._names
+        counts = Counter(names[i] for i in self._country_index().get(country.upper(), ()))
+        counts.pop(_NO_STRING, None)
+        return counts
+
+    def organization_counts(self, country: Optional[str] = None) -> "Counter[str]":
+        """Count the prefixes assigned to every organization.
+
+        Args:
+            country (Optional[str]): Only count the prefixes of this two-letter
+                country code.
+
+        Returns:
+            Counter[str]: The number of prefixes by organization name.
+
+        """
+        return self._name_counts(self._organization_counts(country))
+
+    def top_organizations(
+        self, n: int = 10, country: Optional[str] = None
+    ) -> List[Tuple[str, int]]:
+        """Return the organizations with the most assigned prefixes.
+
+        Only the names of the returned organizations are decoded.
+
+        Args:
+            n (int): The number of organizations.
+            country (Optional[str]): Only count the prefixes of this two-letter
+                country code.
+
+        Returns:
+            List[Tuple[str, int]]: Organization names and prefix counts, most first.
+
+        """
+        strings = self._strings
+        counts = self._organization_counts(country)
+        ranked = sorted(counts, key=counts.__getitem__, reverse=True)
+        top = ((strings[sid], counts[sid]) for sid in ranked)
+        return list(islice(((name, k) for name, k in top if name), n))
+
+    def country_counts(self, organizations: bool = False) -> "Counter[str]":
+        """Count the prefixes, or the distinct organizations, of every country.
+
+        Args:
+            organizations (bool): Count distinct organization names instead of
+                prefixes.
+
+        Returns:
+            Counter[str]: The counts by upper-case two-letter country code.
+
+        """
+        index = self._country_index()
+        if not organizations:
+            return Counter({cc: len(rows) for cc, rows in index.items()})
+        names, strings = self._names, self._strings
+        return Counter(
+            {
+                cc: len({strings[sid] for sid in {names[i] for i in rows} if sid != _NO_STRING})
+                for cc, rows in index.items()
+            }
+        )
+
+    def vendor_histogram(self, macs: Iterable[Union[str, bytes, int]]) -> "Counter[Optional[str]]":
+        """Count a batch of MAC addresses by the organization they are assigned to.
+
+        The addresses are resolved with :meth:`lookup_indices` and counted per entry
+        before the names are looked up, so no :class:`OuiEntry` is created.
+
+        Args:
+            macs (Iterable[Union[str, bytes, int]]): MAC addresses as accepted by
+                :meth:`lookup_indices`, e.g. a NumPy array of integers.
+
+        Returns:
+            Counter[Optional[str]]: The number of addresses by organization name; None
+                counts the invalid and unassigned addresses.
+
+        """
+        rows = self.lookup_indices(macs)
+        if hasattr(rows, "dtype"):
+            import numpy as np
+
+            unique, n = np.unique(rows, return_counts=True)
+            counts: Dict[int, int] = dict(zip(unique.tolist(), n.tolist()))
+        else:
+            counts = Counter(rows)
+        names, strings = self._names, self._strings
+        histogram: "Counter[Optional[str]]" = Counter()
+        for row, n in counts.items():
+            sid = names[row] if row != self.NOT_FOUND else _NO_STRING
+            histogram[strings[sid] if sid != _NO_STRING else None] += n
+        return histogram
+
+    def _org_table(self) -> Dict[int, List[int]]:
+        """Return the entry indices of every org id, in the order of their first entry.
+
+        Built on first use.
+        """
+        if self._org_groups is None:
+            groups: Dict[int, List[int]] = {}
+            for i, org in enumerate(self._orgs):
+                groups.setdefault(org, []).append(i)
+            self._org_groups = groups
+        return self._org_groups
+
+    def _org_rows_of(self, org_id: int) -> List[int]:
+        """Return the entry indices of an org id, raising KeyError if it is unknown."""
+        return self._org_table()[org_id]
+
+    def organization_ids(self, name: Optional[str] = None) -> List[int]:
+        """Return the ids of the distinct organizations, optionally filtered by name.
+
+        An organization groups the entries whose name and address only differ in
+        case, punctuation or spacing. Its id is derived from these fields, so it
+        stays the same across registry updates, cache reloads and processes.
+
+        Args:
+            name (Optional[str]): Only return organizations whose name contains this
+                (case-insensitive), like :meth:`by_organization`.
+
+        Returns:
+            List[int]: The org ids, in the order of their first entry.
+
+        """
+        groups = self._org_table()
+        if name is None:
+            return list(groups)
+        if not name:
+            return []
+        if self._org_index is None:
+            self._org_index = _OrganizationIndex(self._names, self._strings)
+        found = {self._orgs[i] for i in self._org_index.search(name)}
+        return sorted(found, key=lambda org: groups[org][0])
+
+    def organization_id(self, mac: Union[str, bytes, int]) -> Optional[int]:
+        """Return the id of the organization a MAC address is assigned to.
+
+        Args:
+            mac (Union[str, bytes, int]): The MAC address, see :meth:`by_mac`.
+
+        Returns:
+            Optional[int]: The org id of the longest matching prefix, or None.
+
+        """
+        row = self._match(_mac_to_int(mac))
+        return self._orgs[row] if row != self.NOT_FOUND else None
+
+    def organization(self, org_id: int) -> Organization:
+        """Return an organization by id.
+
+        Args:
+            org_id (int): The org id, see :meth:`organization_ids`.
+
+        Returns:
+            Organization: The fields of its first entry.
+
+        Raises:
+            KeyError: If there is no organization with this id.
+
+        """
+        return Organization(*self._fields(self._org_rows_of(org_id)[0]))
+
+    def prefixes_of(self, org_id: int) -> List[str]:
+        """Return the prefixes assigned to an organization.
+
+        Args:
+            org_id (int): The org id, see :meth:`organization_ids`.
+
+        Returns:
+            List[str]: The distinct formatted prefixes, in database order.
+
+        Raises:
+            KeyError: If there is no organization with this id.
+
+        """
+        return list(dict.fromkeys(map(self._prefix, self._org_rows_of(org_id))))
+
+    def by_organization_grouped(self, name: str) -> List[Tuple[int, Organization, List[str]]]:
+        """Search organizations by name and return each once with all its prefixes.
+
+        Unlike :meth:`by_organization`, which yields one entry per prefix.
+
+        Args:
+            name (str): The organization name (partial match, case-insensitive).
+
+        Returns:
+            List[Tuple[int, Organization, List[str]]]: The org id, organization and
+                prefixes of every matching organization.
+
+        """
+        return [(i, self.organization(i), self.prefixes_of(i)) for i in self.organization_ids(name)]
+
+    def _groups(self) -> Dict[int, List[Fields]]:
+        """Return the organization fields of all entries, by prefix key."""
+        string = dict(enumerate(self._strings)).get
+        country = dict(enumerate(self._country_codes)).get
+        groups: Dict[int, List[Fields]] = {}
+        fields = zip(
+            map(string, self._names),
+            map(string, self._streets),
+            map(string, self._districts),
+            map(country, self._countries),
+        )
+        for k, f in zip(self._keys, fields):
+            groups.setdefault(k, []).append(f)
+        return groups
+
+    @classmethod
+    def _file_groups(cls, files: List[str], debug: bool = False) -> Dict[int, List[Fields]]:
+        """Parse registry files into the organization fields of their entries, by prefix key."""
+        groups: Dict[int, List[Fields]] = {}
+        for prefix, *fields in (r for f in files for r in cls._records(f, debug=debug)):
+            key = _split_prefix(prefix)
+            if key is not None:
+                groups.setdefault(key[0] << 8 | key[1], []).append(tuple(fields))
+        return groups
+
+    def _diff(self, new: Dict[int, List[Fields]]) -> OuiDiff:
+        """Compare the entries with the grouped fields of a newer version."""
+        old = self._groups()
+        diff = OuiDiff()
+        keys = [k for k, b in new.items() if old.get(k) != b]
+        keys += [k for k in old if k not in new]
+        for key in sorted(keys):
+            a, b = old.get(key, []), new.get(key, [])
+            removed = list((Counter(a) - Counter(b)).elements())
+            added = list((Counter(b) - Counter(a)).elements())
+            prefix = _format_prefix(key >> 8, key & 0xFF)
+            if len(removed) == 1 and len(added) == 1:
+                diff.changed.append(
+                    (
+                        OuiEntry(prefix, Organization(*removed[0])),
+                        OuiEntry(prefix, Organization(*added[0])),
+                    )
+                )
+            else:
+                diff.removed += [OuiEntry(prefix, Organization(*f)) for f in removed]
+                diff.added += [OuiEntry(prefix, Organization(*f)) for f in added]
+        return diff
+
+    def diff(self, other: Union["OuiEntries", str, Sequence[str]]) -> OuiDiff:
+        """Compute the differences to another version of the database.
+
+        Args:
+            other (Union[OuiEntries, str, Sequence[str]]): The newer version, loaded or
+                as registry file(s).
+
+        Returns:
+            OuiDiff: What changed from this version to ``other``.
+
+        """
+        if isinstance(other, OuiEntries):
+            return self._diff(other._groups())
+        return self._diff(self._file_groups([other] if isinstance(other, str) else list(other)))
+
+    def apply(self, diff: OuiDiff):
+        """Apply a diff to the database in place.
+
+        Only the entries and index slots of the affected prefixes are touched; the
+        derived organization, country and sorted prefix tables are rebuilt on their
+        next use. The instance must not be queried by other threads meanwhile, see
+        :class:`~pyoui.refresh.Refresher` for swapping whole databases instead.
+
+        Args:
+            diff (OuiDiff): The diff, e.g. from :meth:`diff`.
+
+        Raises:
+            ValueError: If a removed or changed entry is not in the database.
+
+        """
+        rows: Set[int] = set()
+        for e in [*diff.removed, *(old for old, _ in diff.changed)]:
+            key = _split_prefix(e.prefix)
+            first = self._key_maps.get(key[1], {}).get(key[0]) if key else None
+            fields = _entry_fields(e)
+            candidates = self._rows(first) if first is not None else []
+            row = next((r for r in candidates if r not in rows and self._fields(r) == fields), None)
+            if row is None:
+                raise ValueError(f"Entry {e.prefix} is not in the database")
+            rows.add(row)
+
+        self._make_mutable()
+        for row in sorted(rows, reverse=True):
+            self._remove_row(row)
+        start = self.size()
+        added = [*diff.added, *(new for _, new in diff.changed)]
+        self._extend((e.prefix, *_entry_fields(e)) for e in added)
+        self._index_country_names()
+        for i in range(start, self.size()):
+            self._link(i)
+
+        self._lengths = sorted(self._key_maps, reverse=True)
+        self._tables = None
+        self._org_index = None
+        self._country_rows = None
+        self._org_rows = None
+        self._org_groups = None
+        self._find_split_blocks()
+        self.cache_clear()
+
+    def update(
+        self,
+        infile: Union[str, Sequence[str]],
+        debug: bool = False,
+        cache_file: Optional[str] = None,
+    ) -> OuiDiff:
+        """Bring the database in line with newer registry files by applying their diff.
+
+        Args:
+            infile (Union[str, Sequence[str]]): The new registry file(s).
+            debug (bool): Enable debug logging.
+            cache_file (Optional[str]): Rewrite this compiled cache for the new files.
+
+        Returns:
+            OuiDiff: The applied differences.
+
+        """
+        files = [infile] if isinstance(infile, str) else list(infile)
+        diff = self._diff(self._file_groups(files, debug=debug))
+        if diff:
+            self.apply(diff)
+        if debug:
+            log.debug(
+                f"Applied {len(diff.added)} added, {len(diff.removed)} removed "
+                f"and {len(diff.changed)} changed entries"
+            )
+        if cache_file is not None:
+            self._save(files, cache_file, debug)
+        return diff
 
     def size(self) -> int:
         """Return the number of loaded entries.
@@ -274,7 +1651,35 @@ class OuiEntries:
             int: The number of entries.
 
         """
-        return len(self.entries)
+        return len(self._keys)
+
+    def memory_usage(self) -> int:
+        """Estimate the memory used by the columns, strings and prefix index.
+
+        Columns backed by the compiled cache or shared memory are counted with their
+        full size, although their pages are shared between processes.
+
+        Returns:
+            int: The size in bytes.
+
+        """
+        columns = (
+            self._keys,
+            self._orgs,
+            self._names,
+            self._streets,
+            self._districts,
+            self._countries,
+        )
+        size = sum(memoryview(c).nbytes for c in columns)
+        if isinstance(self._strings, cache.StringTable):
+            size += self._strings.nbytes
+        else:
+            size += sys.getsizeof(self._strings) + sum(map(sys.getsizeof, self._strings))
+        for index in (*self._key_maps.values(), self._duplicates):
+            size += sys.getsizeof(index) + sum(map(sys.getsizeof, index))
+            size += sum(map(sys.getsizeof, index.values()))
+        return size
 
 
 class OUI:
@@ -282,6 +1687,14 @@ class OUI:
 
     OUI_URL: str = "https://standards-oui.ieee.org/oui.txt"
 
+    #: Source URLs of the IEEE registries, by name. ``oui`` is the MA-L registry.
+    REGISTRIES: Dict[str, str] = {
+        "oui": OUI_URL,
+        "mam": "https://standards-oui.ieee.org/oui28/mam.txt",
+        "oui36": "https://standards-oui.ieee.org/oui36/oui36.txt",
+        "iab": "https://standards-oui.ieee.org/iab/iab.txt",
+    }
+
     def __init__(
         self,
         outfile: str = str(Path(gettempdir()) / "oui.txt"),
@@ -289,6 +1702,9 @@ class OUI:
         max_age: int = 2592000,
         force_update: bool = False,
         url: Optional[str] = None,
+        cache: bool = True,
+        registries: Optional[Sequence[str]] = None,
+        snapshot: Optional[bool] = None,
     ):
         """Initialize the OUI handler.
 
@@ -298,73 +1714,305 @@ class OUI:
             max_age (int): Maximum age of the local file in seconds (default 30 days).
             force_update (bool): If True, always download the file.
             url (Optional[str]): Custom OUI source URL. Defaults to IEEE's OUI URL.
+            cache (bool): Keep a compiled binary cache next to ``outfile`` so that
+                parsing is only done when the file changes. Defaults to True.
+            registries (Optional[Sequence[str]]): Names of additional registries to load,
+                see :attr:`REGISTRIES`. The MA-L registry is always loaded into ``outfile``,
+                the others next to it (e.g. ``oui.mam.txt``). Pass ``list(OUI.REGISTRIES)``
+                to resolve MA-M, MA-S and IAB assignments too. Defaults to MA-L only.
+            snapshot (Optional[bool]): Use of the registry snapshot bundled with the
+                package (see :mod:`pyoui.snapshot`). By default it is only used if a
+                registry file is missing and cannot be downloaded. True also uses it
+                instead of downloading missing or outdated files while it is younger
+                than ``max_age``; False never uses it.
+
+        Raises:
+            ValueError: If an unknown registry is requested.
 
         """
         self.outfile = outfile
         self.debug = debug
         self.max_age = max_age
         self.url = url or self.OUI_URL
+        self.cache_file = cache_path(outfile) if cache else None
+        self.snapshot = snapshot
+        #: True if :meth:`parse` returns the bundled snapshot instead of the files.
+        self.snapshot_used = False
+
+        unknown = set(registries or ()) - set(self.REGISTRIES)
+        if unknown:
+            raise ValueError(f"Unknown registries: {', '.join(sorted(unknown))}")
+        path = Path(outfile)
+        self.sources: List[Tuple[str, str]] = [(self.url, outfile)]
+        for name, registry_url in self.REGISTRIES.items():
+            if name != "oui" and name in (registries or ()):
+                registry_file = str(path.with_name(f"{path.stem}.{name}{path.suffix}"))
+                self.sources.append((registry_url, registry_file))
         self.load(force=force_update)
 
+    @property
+    def files(self) -> List[str]:
+        """Return the local paths of all loaded registry files.
+
+        Returns:
+            List[str]: The registry files, MA-L first.
+
+        """
+        return [f for _, f in self.sources]
+
     def load(self, force: bool = False):
-        """Download the OUI file if it doesn't exist, is too old, or force is True.
+        """Download the registry files if they don't exist, are too old, or force is True.
+
+        If a file is missing and cannot be downloaded, the bundled snapshot is used
+        instead when allowed, see the ``snapshot`` argument of :class:`OUI`.
 
         Args:
-            force (bool): If True, always download the file.
+            force (bool): If True, always download the files.
 
         Raises:
-            RequestException: If the download fails.
-            IOError: If saving the file fails.
+            RequestException: If a download fails and there is no snapshot to use.
+            IOError: If saving a file fails and there is no snapshot to use.
+
+        """
+        outdated = []
+        for url, outfile in self.sources:
+            if self._should_download(outfile, force):
+                outdated.append((url, outfile))
+            elif self.debug:
+                log.debug(f"{outfile} exists and is up to date. Not downloading.")
+        if not outdated:
+            self.snapshot_used = False
+            return
+
+        snapshot = self._usable_snapshot()
+        if self.snapshot and not force and snapshot is not None:
+            if self.max_age <= 0 or snapshot.age() <= self.max_age:
+                if self.debug:
+                    log.debug("Using the bundled snapshot instead of downloading.")
+                self.snapshot_used = True
+                return
+        try:
+            for url, outfile in outdated:
+                self._download(url, outfile, force)
+        except (_lazy("RequestException"), OSError) as ex:
+            if snapshot is None or all(Path(f).is_file() for f in self.files):
+                raise
+            created = time.strftime("%Y-%m-%d", time.gmtime(snapshot.created))
+            log.warning(f"Using the bundled snapshot of {created}: {ex}")
+            self.snapshot_used = True
+        else:
+            self.snapshot_used = False
+
+    def _usable_snapshot(self) -> Optional["SnapshotInfo"]:
+        """Return the header of the bundled snapshot if it can replace the files.
+
+        Returns:
+            Optional[SnapshotInfo]: The header, or None if snapshots are disabled, there
+                is none, or it lacks a requested registry or the source is custom.
 
         """
-        should_download = force or not Path(self.outfile).is_file()
+        if self.snapshot is False or self.url != self.OUI_URL:
+            return None
+        from . import snapshot
+
+        info = snapshot.info()
+        urls = {url for url, _ in self.sources}
+        wanted = {name for name, url in self.REGISTRIES.items() if url in urls}
+        return info if info is not None and wanted <= set(info.registries) else None
+
+    def _should_download(self, outfile: str, force: bool) -> bool:
+        """Check whether a registry file is missing or older than ``max_age``.
 
-        if not should_download and self.max_age > 0:
-            file_age = time.time() - Path(self.outfile).stat().st_mtime
+        Args:
+            outfile (str): The local registry file.
+            force (bool): If True, always download the file.
+
+        Returns:
+            bool: True if the file should be downloaded.
+
+        """
+        if force or not Path(outfile).is_file():
+            return True
+        if self.max_age > 0:
+            file_age = time.time() - Path(outfile).stat().st_mtime
             if file_age > self.max_age:
                 if self.debug:
                     log.debug(
-                        f"File {self.outfile} is older than {self.max_age} seconds. Re-downloading."
+                        f"File {outfile} is older than {self.max_age} seconds. Re-downloading."
                     )
-                should_download = True
+                return True
+        return False
 
-        if should_download:
-            if self.debug:
-                log.debug(f"Downloading {self.url} to {self.outfile}")
-            try:
-                r = get(self.url, timeout=30, stream=True)
-                r.raise_for_status()
-                total_size = int(r.headers.get("content-length", 0))
-                with open(self.outfile, "wb") as o:
-                    with tqdm(
-                        total=total_size,
-                        unit="B",
-                        unit_scale=True,
-                        desc="Downloading OUI",
-                        disable=not self.debug,
-                    ) as pbar:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            o.write(chunk)
-                            pbar.update(len(chunk))
-                # Ensure appropriate file permissions (e.g., 644)
-                Path(self.outfile).chmod(0o644)
-            except RequestException as ex:
-                log.error(f"Failed to download OUI list: {ex}")
-                raise
-            except IOError as ex:
-                log.error(f"Failed to save OUI list: {ex}")
-                raise
-        else:
-            if self.debug:
-                log.debug(f"{self.outfile} exists and is up to date. Not downloading.")
+    @staticmethod
+    def _read_meta(outfile: str, url: str) -> Dict[str, Any]:
+        """Read the validators stored next to a registry file.
+
+        Args:
+            outfile (str): The local registry file.
+            url (str): The source URL; validators of a different URL are ignored.
+
+        Returns:
+            Dict[str, Any]: The sidecar contents, empty if there is no usable sidecar.
+
+        """
+        try:
+            with open(f"{outfile}.meta", encoding="utf-8") as i:
+                meta = json.load(i)
+        except (OSError, ValueError):
+            return {}
+        return meta if isinstance(meta, dict) and meta.get("url") == url else {}
+
+    @staticmethod
+    def _write_meta(outfile: str, meta: Dict[str, Any]):
+        """Atomically store the validators next to a registry file.
+
+        Args:
+            outfile (str): The local registry file.
+            meta (Dict[str, Any]): The sidecar contents.
+
+        """
+        tmp = f"{outfile}.meta.tmp"
+        with open(tmp, "w", encoding="utf-8") as o:
+            json.dump(meta, o)
+        os.replace(tmp, f"{outfile}.meta")
+
+    def _download(self, url: str, outfile: str, force: bool = False):
+        """Download a registry file.
+
+        The validators (``ETag``/``Last-Modified``) of the last download are kept in a
+        ``.meta`` sidecar and sent as ``If-None-Match``/``If-Modified-Since``; a 304
+        answer only refreshes the file's timestamp. The body is written to a ``.part``
+        file that is renamed over ``outfile`` once complete, and an interrupted
+        transfer is resumed with a ``Range`` request on the next call. If the server
+        rejects the range, e.g. with 416 for a ``.part`` file that is already
+        complete, the partial file is discarded and the download starts over.
+
+        Args:
+            url (str): The source URL.
+            outfile (str): The local file to write.
+            force (bool): If True, don't send the conditional request headers and
+                don't resume an interrupted transfer.
+
+        Raises:
+            RequestException: If the download fails.
+            IOError: If saving the file fails or the transfer was incomplete.
+
+        """
+        part = f"{outfile}.part"
+        meta = self._read_meta(outfile, url)
+        partial = meta.get("partial") or {}
+        resumable = (
+            not force
+            and Path(part).is_file()
+            and (partial.get("etag") or partial.get("last_modified"))
+        )
+        offset = Path(part).stat().st_size if resumable else 0
+
+        headers = {"Accept-Encoding": "gzip"}
+        if not force and Path(outfile).is_file():
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        if offset:
+            # Byte ranges refer to the encoded body, so resume without compression.
+            headers.update(
+                {
+                    "Accept-Encoding": "identity",
+                    "Range": f"bytes={offset}-",
+                    "If-Range": partial.get("etag") or partial.get("last_modified"),
+                }
+            )
+
+        if self.debug:
+            log.debug(
+                f"Downloading {url} to {outfile}" + (f" from byte {offset}" if offset else "")
+            )
+        start = time.perf_counter()
+        try:
+            r = _lazy("get")(url, timeout=30, stream=True, headers=headers)
+            if r.status_code == 304:
+                if self.debug:
+                    log.debug(f"{url} is not modified. Refreshing {outfile}.")
+                os.utime(outfile)
+                _record_download(start, "not_modified")
+                return
+            if offset and r.status_code >= 400:
+                log.warning(f"Cannot resume download of {url} (HTTP {r.status_code}), restarting")
+                r.close()
+                Path(part).unlink()
+                meta.pop("partial", None)
+                self._write_meta(outfile, meta)
+                return self._download(url, outfile, force)
+            r.raise_for_status()
+            if r.status_code != 206:
+                offset = 0
+
+            validators = {
+                "etag": r.headers.get("etag"),
+                "last_modified": r.headers.get("last-modified"),
+            }
+            self._write_meta(outfile, {**meta, "url": url, "partial": validators})
+
+            length = int(r.headers.get("content-length", 0))
+            with open(part, "ab" if offset else "wb") as o:
+                with _lazy("tqdm")(
+                    total=offset + length,
+                    initial=offset,
+                    unit="B",
+                    unit_scale=True,
+                    desc="Downloading OUI",
+                    disable=not self.debug,
+                ) as pbar:
+                    for chunk in r.iter_content(chunk_size=65536):
+                        o.write(chunk)
+                        pbar.update(len(chunk))
+                received = o.tell() - offset
+            # Content-Length counts the encoded bytes, so it can only be checked
+            # against the written size for uncompressed transfers.
+            if length and not r.headers.get("content-encoding") and received < length:
+                raise IOError(f"Incomplete download of {url}: {received} of {length} bytes")
+
+            os.replace(part, outfile)
+            # Ensure appropriate file permissions (e.g., 644)
+            Path(outfile).chmod(0o644)
+            self._write_meta(outfile, {"url": url, **validators})
+            _record_download(start, "ok", received)
+        except _lazy("RequestException") as ex:
+            log.error(f"Failed to download OUI list: {ex}")
+            _record_download(start, "error")
+            raise
+        except IOError as ex:
+            log.error(f"Failed to save OUI list: {ex}")
+            _record_download(start, "error")
+            raise
 
     def parse(self) -> OuiEntries:
-        """Parse the local OUI file.
+        """Parse the local registry files, or load the snapshot :meth:`load` fell back to.
 
         Returns:
             OuiEntries: The parsed OUI entries.
 
         """
+        if self.snapshot_used:
+            from . import snapshot
+
+            return snapshot.load()
         if self.debug:
-            log.debug(f"Parsing {self.outfile}")
-        return OuiEntries(infile=self.outfile, debug=self.debug)
+            log.debug(f"Parsing {', '.join(self.files)}")
+        return OuiEntries(infile=self.files, debug=self.debug, cache_file=self.cache_file)
+
+    def update(self, entries: OuiEntries) -> OuiDiff:
+        """Apply the changes of the local registry files to an already parsed database.
+
+        Call this after :meth:`load` fetched new files to update ``entries`` in place
+        instead of parsing a new database with :meth:`parse`.
+
+        Args:
+            entries (OuiEntries): The database, e.g. from an earlier :meth:`parse`.
+
+        Returns:
+            OuiDiff: The applied differences.
+
+        """
+        return entries.update(self.files, debug=self.debug, cache_file=self.cache_file)
@@ -0,0 +1,205 @@
+"""Parallel enrichment of large MAC address datasets.
+
+The database is published once into shared memory (see
+:meth:`~pyoui.oui.OuiEntries.publish`); every worker process attaches to it
+instead of parsing the registry files again. The input is read in chunks, of
+which only a bounded number is in flight at any time, so arbitrarily large
+inputs are enriched in constant memory.
+"""
+
+import csv
+import io
+import json
+import os
+from array import array
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .oui import Fields, Organization, OuiEntries, OuiEntry
+
+#: Number of MAC addresses handed to a worker at once.
+CHUNK_SIZE = 10000
+
+#: Chunks in flight per worker; bounds the memory used for input and results.
+CHUNKS_PER_WORKER = 4
+
+# the database attached by the worker process
+_entries: Optional[OuiEntries] = None
+
+
+def format_records(macs: List[str], results: List[Optional[OuiEntry]], fmt: str) -> str:
+    """Format enriched MAC addresses as NDJSON or CSV records.
+
+    Args:
+        macs (List[str]): The MAC addresses.
+        results (List[Optional[OuiEntry]]): The entry of every address, or None.
+        fmt (str): ``json`` for one object per line or ``csv`` for CSV rows (without
+            header).
+
+    Returns:
+        str: One record per line.
+
+    """
+    out = io.StringIO()
+    if fmt == "json":
+        for mac, e in zip(macs, results):
+            record = {"mac": mac, **(e.as_dict() if e else {"prefix": None})}
+            record.setdefault("organization", None)
+            out.write(json.dumps(record) + "\n")
+    else:
+        writer = csv.writer(out)
+        for mac, e in zip(macs, results):
+            org = e.organization if e else None
+            if org:
+                org_fields = [org.name, org.street, org.district, org.country]
+            else:
+                org_fields = ["", "", "", ""]
+            writer.writerow([mac, e.prefix if e else "", *org_fields])
+    return out.getvalue()
+
+
+def _attach(name: str):
+    """Attach the worker process to the published database."""
+    global _entries
+    _entries = OuiEntries.attach(name)
+
+
+def _lookup_rows(macs: List[Union[str, int]]) -> bytes:
+    """Resolve a chunk to entry indices in a worker."""
+    return array("i", _entries.lookup_indices(macs)).tobytes()
+
+
+def _lookup_lines(lines: List[str], fmt: str) -> str:
+    """Resolve and format a chunk of input lines in a worker."""
+    macs = [m for m in map(str.strip, lines) if m]
+    return format_records(macs, _entries.lookup_many(macs), fmt)
+
+
+def _map(
+    entries: OuiEntries,
+    items: Iterable[Any],
+    task: Callable[..., Any],
+    args: Tuple[Any, ...],
+    processes: Optional[int],
+    chunk_size: int,
+    ordered: bool,
+) -> Iterator[Tuple[List[Any], Any]]:
+    """Run ``task(chunk, *args)`` over chunks of ``items`` in a process pool.
+
+    Args:
+        entries (OuiEntries): The database the workers attach to.
+        items (Iterable[Any]): The input.
+        task (Callable[..., Any]): Module level function run in the workers.
+        args (Tuple[Any, ...]): Further arguments of ``task``.
+        processes (Optional[int]): Number of worker processes. Defaults to the
+            number of CPUs.
+        chunk_size (int): Number of items per chunk.
+        ordered (bool): Yield the results in input order instead of as they finish.
+
+    Yields:
+        Iterator[Tuple[List[Any], Any]]: Every chunk with the result of its task.
+
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    processes = processes or os.cpu_count() or 1
+    window = processes * CHUNKS_PER_WORKER
+    items = iter(items)
+    shm = entries.publish()
+    pool = None
+    pending = deque()
+
+    def finished() -> Tuple[List[Any], Any]:
+        """Remove the oldest task, or any finished one if not ordered, and return it."""
+        if not ordered:
+            wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+            while not pending[0][1].done():
+                pending.rotate(-1)
+        chunk, future = pending.popleft()
+        return chunk, future.result()
+
+    try:
+        pool = ProcessPoolExecutor(processes, initializer=_attach, initargs=(shm.name,))
+        for chunk in iter(lambda: list(islice(items, chunk_size)), []):
+            if len(pending) >= window:
+                yield finished()
+            pending.append((chunk, pool.submit(task, chunk, *args)))
+        while pending:
+            yield finished()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        shm.close()
+        shm.unlink()
+
+
+def enrich(
+    entries: OuiEntries,
+    macs: Iterable[Union[str, int]],
+    processes: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    ordered: bool = True,
+) -> Iterator[Tuple[Union[str, int], Optional[OuiEntry]]]:
+    """Resolve MAC addresses in a pool of worker processes.
+
+    The workers resolve the addresses to entry indices; the entries are created in
+    the calling process, which limits the speedup. Use :func:`enrich_lines` to
+    format the records in the workers, too.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        macs (Iterable[Union[str, int]]): MAC addresses as strings or 48-bit integers.
+        processes (Optional[int]): Number of worker processes. Defaults to the number
+            of CPUs.
+        chunk_size (int): Number of addresses handed to a worker at once.
+        ordered (bool): Yield the results in input order. If False, the results of
+            every chunk are yielded as soon as it is resolved.
+
+    Yields:
+        Iterator[Tuple[Union[str, int], Optional[OuiEntry]]]: Every address with its
+            entry, or None if there is no match.
+
+    """
+    # the registry is small compared to the input, so the fields of every matched
+    # entry are only looked up once
+    resolved: Dict[int, Tuple[str, Fields]] = {}
+    for chunk, rows in _map(entries, macs, _lookup_rows, (), processes, chunk_size, ordered):
+        for mac, row in zip(chunk, array("i", rows)):
+            if row < 0:
+                yield mac, None
+                continue
+            data = resolved.get(row)
+            if data is None:
+                data = resolved[row] = (entries._prefix(row), entries._fields(row))
+            yield mac, OuiEntry(data[0], Organization(*data[1]))
+
+
+def enrich_lines(
+    entries: OuiEntries,
+    lines: Iterable[str],
+    fmt: str = "json",
+    processes: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    ordered: bool = True,
+) -> Iterator[str]:
+    """Resolve and format lines of MAC addresses in a pool of worker processes.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        lines (Iterable[str]): Input with one MAC address per line; blank lines are
+            skipped.
+        fmt (str): Output format, ``json`` (NDJSON) or ``csv``, see
+            :func:`format_records`.
+        processes (Optional[int]): Number of worker processes. Defaults to the number
+            of CPUs.
+        chunk_size (int): Number of lines handed to a worker at once.
+        ordered (bool): Yield the records in input order. If False, the records of
+            every chunk are yielded as soon as it is resolved.
+
+    Yields:
+        Iterator[str]: The records of a chunk, one per line.
+
+    """
+    for _, text in _map(entries, lines, _lookup_lines, (fmt,), processes, chunk_size, ordered):
+        yield text
@@ -0,0 +1,203 @@
+"""Background refresh of the OUI database for long-lived processes."""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional, Tuple
+
+from loguru import logger as log
+
+from .oui import OUI, OuiEntries
+
+
+@dataclass
+class RefreshStats:
+    """Counters and timings of a :class:`Refresher`.
+
+    Attributes:
+        checks (int): Number of completed update checks.
+        reloads (int): Number of times a new database was swapped in.
+        failures (int): Number of checks that raised an error.
+        entries (int): Number of entries in the current database.
+        last_check (Optional[float]): Unix time of the last completed check.
+        last_reload (Optional[float]): Unix time of the last swap.
+        last_duration (Optional[float]): Seconds the last rebuild took.
+        last_error (Optional[str]): Message of the last failure, cleared by a
+            successful check.
+
+    """
+
+    checks: int = 0
+    reloads: int = 0
+    failures: int = 0
+    entries: int = 0
+    last_check: Optional[float] = None
+    last_reload: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class Refresher:
+    """Keeps an :class:`~pyoui.oui.OuiEntries` up to date in a background thread.
+
+    Every ``interval`` seconds the refresher calls :meth:`OUI.load`, which only
+    downloads files older than ``max_age``. The database is rebuilt only if a
+    registry file was actually replaced; the new instance is built completely
+    before it replaces the old one in a single reference assignment, so readers
+    of :attr:`entries` always get either the old or the new database. Lookups
+    that already hold the old instance finish against it.
+    """
+
+    def __init__(
+        self,
+        oui: OUI,
+        interval: Optional[float] = None,
+        entries: Optional[OuiEntries] = None,
+        on_reload: Optional[Callable[[OuiEntries], None]] = None,
+    ):
+        """Create a refresher; call :meth:`start` to run it in the background.
+
+        Args:
+            oui (OUI): The handler whose registry files are kept up to date.
+            interval (Optional[float]): Seconds between update checks. Defaults to
+                ``oui.max_age``, at most one hour.
+            entries (Optional[OuiEntries]): The current database. Parsed from ``oui``
+                if omitted.
+            on_reload (Optional[Callable[[OuiEntries], None]]): Called with every new
+                database after it was swapped in.
+
+        """
+        self.oui = oui
+        self.interval = interval if interval is not None else min(oui.max_age or 3600, 3600)
+        self.on_reload = on_reload
+        # serializes checks, which hold it while downloading and parsing
+        self._refresh_lock = threading.Lock()
+        # guards _stats only, so reading them never waits for a check
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._files = self._identities()
+        self._entries = entries if entries is not None else oui.parse()
+        self._stats = RefreshStats(entries=self._entries.size())
+
+    def __enter__(self) -> "Refresher":
+        """Start refreshing in the background."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the background thread."""
+        self.stop()
+
+    @property
+    def entries(self) -> OuiEntries:
+        """Return the current database.
+
+        Returns:
+            OuiEntries: The most recently swapped in database.
+
+        """
+        return self._entries
+
+    @property
+    def stats(self) -> RefreshStats:
+        """Return a snapshot of the refresh counters.
+
+        Returns:
+            RefreshStats: A copy of the current counters and timings.
+
+        """
+        with self._stats_lock:
+            return replace(self._stats)
+
+    def _identities(self) -> List[Optional[Tuple[int, int, int]]]:
+        """Return device, inode and size of every registry file.
+
+        Downloads replace the file with a rename, so a new identity means new
+        content, while a "not modified" answer only touches the timestamp.
+        """
+        identities = []
+        for f in self.oui.files:
+            try:
+                st = os.stat(f)
+            except OSError:
+                identities.append(None)
+            else:
+                identities.append((st.st_dev, st.st_ino, st.st_size))
+        return identities
+
+    def refresh(self, force: bool = False) -> bool:
+        """Check for updates now and swap in a rebuilt database if the files changed.
+
+        Args:
+            force (bool): If True, download the files and rebuild regardless of age.
+
+        Returns:
+            bool: True if a new database was swapped in.
+
+        Raises:
+            RequestException: If a download fails.
+            IOError: If saving a file fails.
+
+        """
+        with self._refresh_lock:
+            try:
+                self.oui.load(force=force)
+                files = self._identities()
+                changed = force or files != self._files
+                if changed:
+                    start = time.perf_counter()
+                    entries = self.oui.parse()
+                    duration = time.perf_counter() - start
+            except Exception as ex:
+                with self._stats_lock:
+                    self._stats.failures += 1
+                    self._stats.last_error = str(ex)
+                raise
+
+            now = time.time()
+            with self._stats_lock:
+                self._stats.checks += 1
+                self._stats.last_check = now
+                self._stats.last_error = None
+                if not changed:
+                    return False
+                self._files = files
+                self._entries = entries
+                self._stats.reloads += 1
+                self._stats.entries = entries.size()
+                self._stats.last_reload = now
+                self._stats.last_duration = duration
+        log.info(f"Reloaded {entries.size()} OUI entries in {duration:.3f}s")
+        if self.on_reload is not None:
+            self.on_reload(entries)
+        return True
+
+    def _run(self):
+        """Check for updates until stopped."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as ex:
+                log.error(f"Failed to refresh the OUI database: {ex}")
+
+    def start(self):
+        """Start the background thread if it is not running yet."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pyoui-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background thread.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for a running check to finish.
+
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,250 @@
+"""Long-running lookup server.
+
+Answers lookups against an already loaded :class:`~pyoui.oui.OuiEntries` over a
+Unix socket or local HTTP using newline-delimited JSON. Every request line is
+answered with exactly one response line, in order, so clients can pipeline
+requests without waiting for each answer.
+
+A request line is either a bare MAC address or a JSON object with one of the
+keys ``mac``, ``macs`` (batch), ``prefix``, ``organization``, ``country_code``
+or ``country_name``, and an optional ``id`` that is echoed in the response::
+
+    {"id": 1, "mac": "BC:23:92:42:42:42"}
+    {"id": 2, "macs": ["BC:23:92:42:42:42", "00:22:72:00:00:01"]}
+"""
+
+import json
+import os
+import socketserver
+import stat
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from loguru import logger as log
+
+from .oui import OuiEntries
+
+if TYPE_CHECKING:
+    from .refresh import Refresher
+
+# request key -> name of the OuiEntries method answering it; looked up on every
+# request, because metrics.set_sink() swaps the methods on the class
+_QUERIES = {
+    "mac": "by_mac",
+    "prefix": "by_prefix",
+    "organization": "by_organization",
+    "country_code": "by_country_code",
+    "country_name": "by_country_name",
+}
+
+
+def answer(entries: OuiEntries, request: Any) -> Dict[str, Any]:
+    """Answer a single decoded request.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        request (Any): A MAC address string or a request object.
+
+    Returns:
+        Dict[str, Any]: The response object with either ``results`` or ``error``.
+
+    """
+    if isinstance(request, str):
+        request = {"mac": request}
+    if not isinstance(request, dict):
+        return {"error": "request must be a MAC address or an object"}
+
+    response: Dict[str, Any] = {"id": request["id"]} if "id" in request else {}
+    if "macs" in request:
+        macs = request["macs"]
+        if not isinstance(macs, list) or not all(isinstance(m, (str, int)) for m in macs):
+            response["error"] = "macs must be a list of strings or integers"
+            return response
+        response["results"] = [e.as_dict() if e else None for e in entries.lookup_many(macs)]
+        return response
+
+    for key, method in _QUERIES.items():
+        if key in request:
+            value = request[key]
+            if not isinstance(value, str):
+                response["error"] = f"{key} must be a string"
+            else:
+                response["results"] = [e.as_dict() for e in getattr(entries, method)(value)]
+            return response
+
+    response["error"] = f"request must contain one of: macs, {', '.join(_QUERIES)}"
+    return response
+
+
+def answer_line(entries: OuiEntries, line: bytes) -> bytes:
+    """Answer a single request line.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        line (bytes): The request line, JSON or a bare MAC address.
+
+    Returns:
+        bytes: The JSON encoded response, including the trailing newline.
+
+    """
+    text = line.decode("utf-8", "replace").strip()
+    try:
+        request = json.loads(text) if text[:1] in ("{", '"') else text
+    except ValueError as ex:
+        response: Dict[str, Any] = {"error": f"invalid JSON: {ex}"}
+    else:
+        response = answer(entries, request)
+    return json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def answer_lines(entries: OuiEntries, data: bytes) -> bytes:
+    """Answer every non-empty line of a newline-delimited request body.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        data (bytes): The request lines.
+
+    Returns:
+        bytes: One response line per request line.
+
+    """
+    return b"".join(answer_line(entries, line) for line in data.splitlines() if line.strip())
+
+
+class _StreamHandler(socketserver.BaseRequestHandler):
+    """Answers pipelined request lines on a stream connection."""
+
+    def handle(self):
+        """Answer all complete lines of every chunk with a single write."""
+        pending = b""
+        while True:
+            data = self.request.recv(1 << 16)
+            if not data:
+                break
+            lines, _, pending = (pending + data).rpartition(b"\n")
+            if lines:
+                self.request.sendall(answer_lines(self.server.entries, lines))
+        if pending.strip():
+            self.request.sendall(answer_lines(self.server.entries, pending))
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    """Answers newline-delimited JSON bodies posted to ``/lookup``."""
+
+    def do_POST(self):  # noqa: N802
+        """Answer a batch of request lines."""
+        if self.path.split("?", 1)[0] != "/lookup":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = answer_lines(self.server.entries, self.rfile.read(length))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Route access logs to the debug log."""
+        log.debug(f"{self.address_string()} {format % args}")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix stream server holding the database."""
+
+    daemon_threads = True
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the database."""
+
+    daemon_threads = True
+
+
+def _is_socket(path: str) -> bool:
+    """Return True if ``path`` is a Unix socket, e.g. left behind by a previous server."""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+
+def make_server(
+    entries: OuiEntries,
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+) -> socketserver.BaseServer:
+    """Create a lookup server without starting it.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        socket_path (Optional[str]): Serve newline-delimited JSON on this Unix socket.
+        host (str): Address to bind the HTTP server to. Defaults to 127.0.0.1.
+        port (Optional[int]): Serve HTTP on this port (0 picks a free one); used if
+            ``socket_path`` is None.
+
+    Returns:
+        socketserver.BaseServer: The bound server.
+
+    Raises:
+        ValueError: If neither ``socket_path`` nor ``port`` is given.
+        FileExistsError: If ``socket_path`` exists and is not a socket.
+
+    """
+    if socket_path is not None:
+        if _is_socket(socket_path):
+            os.unlink(socket_path)
+        elif os.path.lexists(socket_path):
+            raise FileExistsError(f"{socket_path} exists and is not a socket")
+        server: socketserver.BaseServer = _UnixServer(socket_path, _StreamHandler)
+    elif port is not None:
+        server = _HTTPServer((host, port), _HTTPHandler)
+    else:
+        raise ValueError("Either socket_path or port is required")
+    server.entries = entries
+    return server
+
+
+def serve(
+    entries: OuiEntries,
+    socket_path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: Optional[int] = None,
+    refresher: Optional["Refresher"] = None,
+):
+    """Serve lookups until interrupted.
+
+    Args:
+        entries (OuiEntries): The database to query.
+        socket_path (Optional[str]): Serve newline-delimited JSON on this Unix socket.
+        host (str): Address to bind the HTTP server to. Defaults to 127.0.0.1.
+        port (Optional[int]): Serve HTTP on this port; used if ``socket_path`` is None.
+        refresher (Optional[Refresher]): Keep the database up to date in the
+            background; the server switches to every reloaded database. Its
+            ``on_reload`` callback is replaced.
+
+    Raises:
+        ValueError: If neither ``socket_path`` nor ``port`` is given.
+        FileExistsError: If ``socket_path`` exists and is not a socket.
+
+    """
+    server = make_server(entries, socket_path=socket_path, host=host, port=port)
+    if socket_path is not None:
+        where = socket_path
+    else:
+        where = f"http://{host}:{server.server_address[1]}/lookup"
+    log.info(f"Serving {entries.size()} entries on {where}")
+    if refresher is not None:
+        refresher.on_reload = lambda new: setattr(server, "entries", new)
+        refresher.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if refresher is not None:
+            refresher.stop()
+        server.server_close()
+        if socket_path is not None and _is_socket(socket_path):
+            os.unlink(socket_path)
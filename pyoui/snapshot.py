@@ -0,0 +1,138 @@
+"""Registry snapshot bundled with the package for starts without network access.
+
+The snapshot is a database in the compiled cache format (see :mod:`pyoui.cache`),
+gzip-compressed, behind a one-line JSON header with the time the registries
+were fetched and their names. Releases build it with ``python -m pyoui.snapshot``;
+:class:`~pyoui.oui.OUI` falls back to it when the registries cannot be
+downloaded, or uses it instead of the network while it is fresh.
+"""
+
+import gzip
+import json
+import os
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, NamedTuple, Optional, Sequence
+
+from . import cache
+from .oui import OUI, OuiEntries, log
+
+#: Location of the bundled snapshot; not part of source checkouts.
+PATH = str(Path(__file__).with_name("data") / "oui.snapshot.gz")
+
+
+class SnapshotInfo(NamedTuple):
+    """The header of a snapshot.
+
+    Attributes:
+        created (float): Unix time the oldest registry file was fetched.
+        registries (List[str]): Names of the included registries, see
+            :attr:`OUI.REGISTRIES <pyoui.oui.OUI.REGISTRIES>`.
+        entries (int): Number of entries.
+
+    """
+
+    created: float
+    registries: List[str]
+    entries: int
+
+    def age(self) -> float:
+        """Return the age of the snapshot in seconds."""
+        return time.time() - self.created
+
+
+def info(path: Optional[str] = None) -> Optional[SnapshotInfo]:
+    """Read the header of a snapshot without loading it.
+
+    Args:
+        path (Optional[str]): The snapshot file. Defaults to the bundled one.
+
+    Returns:
+        Optional[SnapshotInfo]: The header, or None if there is no readable snapshot.
+
+    """
+    try:
+        with gzip.open(path or PATH) as i:
+            header = json.loads(i.readline())
+        return SnapshotInfo(header["created"], header["registries"], header["entries"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def load(path: Optional[str] = None) -> OuiEntries:
+    """Load a snapshot.
+
+    Args:
+        path (Optional[str]): The snapshot file. Defaults to the bundled one.
+
+    Returns:
+        OuiEntries: The database.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If it is not a snapshot in a compatible format.
+
+    """
+    with gzip.open(path or PATH) as i:
+        data = i.read()
+    # the header line is padded to keep the columns aligned
+    start = data.index(b"\n") + 1
+    return OuiEntries.from_buffer(memoryview(data)[start:])
+
+
+def build(
+    files: Sequence[str], registries: Sequence[str], path: Optional[str] = None
+) -> SnapshotInfo:
+    """Write a snapshot of registry files.
+
+    Args:
+        files (Sequence[str]): The registry files, MA-L first.
+        registries (Sequence[str]): Their registry names.
+        path (Optional[str]): The snapshot file. Defaults to the bundled one.
+
+    Returns:
+        SnapshotInfo: The header of the written snapshot.
+
+    """
+    path = path or PATH
+    entries = OuiEntries(list(files))
+    snapshot = SnapshotInfo(
+        min(os.stat(f).st_mtime for f in files), list(registries), entries.size()
+    )
+    header = json.dumps(snapshot._asdict()).encode()
+    header += b" " * (-(len(header) + 1) % 8) + b"\n"
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    # mtime=0 keeps the file reproducible for the same registry data
+    with open(tmp, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as o:
+        o.write(header)
+        o.write(cache.dumps(entries._columns()))
+    os.replace(tmp, path)
+    return snapshot
+
+
+def main() -> int:
+    """Download all registries and build a snapshot of them."""
+    ap = ArgumentParser(prog="python -m pyoui.snapshot", description=main.__doc__)
+    ap.add_argument("-o", "--output", default=PATH, help="snapshot file (default: bundled)")
+    ap.add_argument("-d", "--debug", action="store_true", help="enable debugging")
+    a = ap.parse_args()
+
+    with TemporaryDirectory() as tmp:
+        oui = OUI(
+            outfile=str(Path(tmp) / "oui.txt"),
+            debug=a.debug,
+            cache=False,
+            registries=list(OUI.REGISTRIES),
+            snapshot=False,
+        )
+        snapshot = build(oui.files, list(OUI.REGISTRIES), a.output)
+    log.info(f"Wrote {snapshot.entries} entries to {a.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""Shared fixtures for the pyoui tests."""
+
+import pytest
+
+from pyoui import OuiEntries
+
+SAMPLE_CONTENT = "\n".join(
+    [
+        # 00:22:72 -> American Micro-Fuel Device Corp. (US)
+        "00-22-72   (hex)   American Micro-Fuel Device Corp.",
+        "",
+        "123 Main St",
+        "Anytown, CA 90210",
+        "US",
+        # BC:23:92 -> BYD Precision Manufacture Company Ltd. (CN)
+        "BC-23-92   (hex)   BYD Precision Manufacture Company Ltd.",
+        "",
+        "Building 1",
+        "Shenzhen, Guangdong 518000",
+        "CN",
+        # AA:BB:CC -> National Security Agency (US)
+        "AA-BB-CC   (hex)   National Security Agency",
+        "",
+        "9800 SAVAGE ROAD",
+        "Fort Meade, MD 20755",
+        "US",
+        # DE:AD:BE -> Deutsche Beispiel GmbH (DE)
+        "DE-AD-BE   (hex)   Deutsche Beispiel GmbH",
+        "",
+        "Musterstraße 1",
+        "12345 Musterstadt",
+        "DE",
+    ]
+)
+
+# MA-M and MA-S blocks inside BC:23:92, in the IEEE layout with "(base 16)" lines.
+MAM_CONTENT = "\n".join(
+    [
+        "BC-23-92   (hex)\t\tMedium Block Vendor",
+        "B00000-BFFFFF     (base 16)\t\tMedium Block Vendor",
+        "\t\t\t\t1 Small Road",
+        "\t\t\t\tSpringfield  IL  62701",
+        "\t\t\t\tUS",
+        "",
+    ]
+)
+OUI36_CONTENT = "\n".join(
+    [
+        "BC-23-92   (hex)\t\tSmall Block Vendor",
+        "B12000-B12FFF     (base 16)\t\tSmall Block Vendor",
+        "\t\t\t\t2 Tiny Lane",
+        "\t\t\t\tZurich  8000",
+        "\t\t\t\tCH",
+        "",
+    ]
+)
+
+
+@pytest.fixture(autouse=True)
+def no_snapshot(tmp_path, monkeypatch):
+    """Hide a bundled registry snapshot, so that failed downloads are not masked."""
+    monkeypatch.setattr("pyoui.snapshot.PATH", str(tmp_path / "no-snapshot.gz"))
+
+
+@pytest.fixture
+def temp_oui_file(tmp_path):
+    """Create a temporary OUI file for testing."""
+    d = tmp_path / "data"
+    d.mkdir()
+    f = d / "oui.txt"
+    f.write_text(SAMPLE_CONTENT, encoding="utf-8")
+    return str(f)
+
+
+@pytest.fixture
+def entries(temp_oui_file):
+    """Provide a OuiEntries instance for testing."""
+    return OuiEntries(infile=temp_oui_file)
+
+
+@pytest.fixture
+def registry_entries(temp_oui_file, tmp_path):
+    """Provide a OuiEntries instance merging MA-L, MA-M and MA-S registries."""
+    mam = tmp_path / "mam.txt"
+    mam.write_text(MAM_CONTENT, encoding="utf-8")
+    oui36 = tmp_path / "oui36.txt"
+    oui36.write_text(OUI36_CONTENT, encoding="utf-8")
+    return OuiEntries(infile=[temp_oui_file, str(mam), str(oui36)])
@@ -0,0 +1,71 @@
+"""Tests for the asyncio front-end."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+from conftest import SAMPLE_CONTENT
+
+from pyoui import AsyncOUI, OuiEntries
+
+
+def test_async_lookup(temp_oui_file):
+    """Check loading lazily and resolving single addresses and batches."""
+
+    async def run():
+        oui = AsyncOUI(outfile=temp_oui_file)
+        assert oui.entries is None
+        e = await oui.lookup("BC:23:92:42:42:42")
+        assert e.organization.country == "CN"
+        assert await oui.lookup("11:22:33:44:55:66") is None
+        results = await oui.lookup_many(["00:22:72:00:00:01", "11:22:33:44:55:66"])
+        assert [r.prefix if r else None for r in results] == ["00:22:72", None]
+
+    asyncio.run(run())
+
+
+def test_lookups_during_refresh(temp_oui_file):
+    """Check that lookups keep answering from the old database while a refresh runs."""
+    started, release = threading.Event(), threading.Event()
+    updated = SAMPLE_CONTENT.replace("BYD Precision", "Updated Precision").encode("utf-8")
+
+    def body():
+        started.set()
+        release.wait(5)
+        yield updated
+
+    response = MagicMock(status_code=200, headers={})
+    response.iter_content.return_value = body()
+
+    async def run():
+        async with AsyncOUI(outfile=temp_oui_file) as oui:
+            old = oui.entries
+            refresh = asyncio.ensure_future(oui.load(force=True))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            e = await oui.lookup("BC:23:92:42:42:42")
+            assert e.organization.name.startswith("BYD")
+            assert oui.entries is old
+            release.set()
+            await refresh
+            e = await oui.lookup("BC:23:92:42:42:42")
+            assert e.organization.name.startswith("Updated")
+
+    with patch("pyoui.oui.get", return_value=response):
+        asyncio.run(run())
+
+
+def test_concurrent_first_lookups_load_once(temp_oui_file):
+    """Check that lookups racing to load the database share a single load."""
+
+    async def run():
+        oui = AsyncOUI(outfile=temp_oui_file)
+        with patch.object(AsyncOUI, "_load_blocking", autospec=True) as load:
+            load.side_effect = lambda self, force: OuiEntries(temp_oui_file)
+            results = await asyncio.gather(*(oui.lookup("BC:23:92:42:42:42") for _ in range(5)))
+            assert load.call_count == 1
+            await oui.refresh()
+            assert load.call_count == 2
+        assert {e.prefix for e in results} == {"BC:23:92"}
+
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+"""Tests for the vectorized DataFrame enrichment."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pyoui.dataframe import enrich_column, parse_macs  # noqa: E402
+from pyoui.oui import _mac_to_int  # noqa: E402
+
+MACS = [
+    "BC:23:92:42:42:42",
+    "bc23.9242.4242",
+    "de-ad-be-00-00-01",
+    "BC2392B12345",
+    "11:22:33:44:55:66",
+    "BC:23:92:42:42:4G",
+    "BC:23:92:42:42:42:00",
+    "",
+    None,
+]
+
+
+def test_parse_macs():
+    """Check the vectorized parser against the scalar one."""
+    macs, valid = parse_macs(np.array(MACS, dtype=object))
+    assert valid.tolist() == [True] * 5 + [False] * 4
+    assert macs[:5].tolist() == [_mac_to_int(m) for m in MACS[:5]]
+    assert macs[5:].tolist() == [0] * 4
+
+    malformed = [
+        "B:CBC23924242",
+        "BC:23-92:42:42:42",
+        "BC2:392:424:242",
+        "bc23.9242.42.42",
+        "bc:23.9242.4242",
+        "BC2392\x00424242",
+    ]
+    assert not parse_macs(np.array(malformed, dtype=object))[1].any()
+    assert not any(_mac_to_int(m) is not None for m in malformed)
+
+    macs, valid = parse_macs(np.array([0x002272000001, -1, 1 << 48]))
+    assert macs.tolist() == [0x002272000001, 0, 0] and valid.tolist() == [True, False, False]
+
+
+def _expected(registry_entries, macs):
+    """Return the names that lookup_many resolves ``macs`` to."""
+    return [e.organization.name if e else None for e in registry_entries.lookup_many(macs)]
+
+
+def test_enrich_numpy(registry_entries):
+    """Check the columns for a plain sequence, including MA-S prefixes."""
+    result = enrich_column(registry_entries, MACS, columns=["prefix", "name", "street"])
+    assert result["name"].tolist() == _expected(registry_entries, MACS[:5]) + [None] * 4
+    assert result["prefix"].tolist()[3] == "BC:23:92:B1:20:00/36"
+    assert result["street"].tolist()[0] == "Building 1"
+
+    with pytest.raises(ValueError):
+        enrich_column(registry_entries, MACS, columns=["vendor"])
+
+
+def test_enrich_pandas(registry_entries):
+    """Check that a pandas Series becomes a DataFrame with the same index."""
+    pd = pytest.importorskip("pandas")
+    series = pd.Series(MACS, index=range(10, 10 + len(MACS)))
+    df = enrich_column(registry_entries, series)
+    assert list(df.columns) == ["prefix", "name", "country"]
+    assert list(df.index) == list(series.index)
+    assert df["country"].tolist()[:3] == ["CN", "CN", "DE"]
+    assert df["name"].isna().tolist() == [False] * 4 + [True] * 5
+
+    ints = pd.Series([0xBC2392000001, None], dtype="Int64")
+    assert enrich_column(registry_entries, ints)["prefix"].isna().tolist() == [False, True]
+
+
+def test_enrich_polars(registry_entries):
+    """Check that a Polars Series becomes a Polars DataFrame."""
+    pl = pytest.importorskip("polars")
+    df = enrich_column(registry_entries, pl.Series(MACS))
+    assert df["name"].to_list() == _expected(registry_entries, MACS[:5]) + [None] * 4
+
+
+def test_enrich_arrow(registry_entries):
+    """Check that a PyArrow array becomes a table."""
+    pa = pytest.importorskip("pyarrow")
+    table = enrich_column(registry_entries, pa.chunked_array([MACS[:4], MACS[4:]]))
+    assert table.column("name").to_pylist() == _expected(registry_entries, MACS[:5]) + [None] * 4
+    table = enrich_column(registry_entries, pa.array([0xDEADBE000001, None]))
+    assert table.column("country").to_pylist() == ["DE", None]
@@ -0,0 +1,96 @@
+"""Tests for the database export."""
+
+import csv
+import json
+import sqlite3
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from pyoui.export import FIELDS, export, format_of
+from pyoui.oui import _split_prefix
+
+
+def _rows(entries):
+    """Return the expected rows of ``entries``."""
+    rows = []
+    for e in entries.entries:
+        org = e.organization
+        fields = (org.name, org.street, org.district, org.country)
+        rows.append((e.prefix, *_split_prefix(e.prefix), *fields))
+    return rows
+
+
+def test_export_text(registry_entries, tmp_path):
+    """Check the NDJSON and CSV exports."""
+    expected = _rows(registry_entries)
+    assert expected[-1][:3] == ("BC:23:92:B1:20:00/36", 0xBC2392B12, 36)
+
+    path = tmp_path / "oui.ndjson"
+    assert export(registry_entries, str(path)) == len(expected)
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [tuple(r[f] for f in FIELDS) for r in records] == expected
+
+    path = tmp_path / "oui.csv"
+    assert export(registry_entries, str(path)) == len(expected)
+    with path.open(encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(FIELDS)
+    assert rows[1][:3] == [expected[0][0], str(expected[0][1]), "24"]
+
+
+def test_export_sqlite(registry_entries, tmp_path):
+    """Check that the SQLite export answers longest-prefix queries from its index."""
+    path = str(tmp_path / "oui.db")
+    export(registry_entries, path)
+    assert export(registry_entries, path) == registry_entries.size()  # replaces the table
+
+    mac = 0xBC2392B12345
+    query = (
+        "SELECT name FROM oui WHERE (prefix_int = ? AND prefix_bits = 24)"
+        " OR (prefix_int = ? AND prefix_bits = 28) OR (prefix_int = ? AND prefix_bits = 36)"
+        " ORDER BY prefix_bits DESC LIMIT 1"
+    )
+    db = sqlite3.connect(path)
+    try:
+        assert db.execute("SELECT COUNT(*) FROM oui").fetchone() == (registry_entries.size(),)
+        assert db.execute(query, (mac >> 24, mac >> 20, mac >> 12)).fetchone() == (
+            "Small Block Vendor",
+        )
+        plan = db.execute("EXPLAIN QUERY PLAN " + query, (0, 0, 0)).fetchall()
+        assert all("USING INDEX" in step[-1] for step in plan if "oui" in step[-1])
+    finally:
+        db.close()
+
+
+def test_export_parquet(registry_entries, tmp_path):
+    """Check the Parquet export."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "oui.parquet")
+    export(registry_entries, path)
+    table = pq.read_table(path)
+    assert table.column_names == list(FIELDS)
+    assert [tuple(r.values()) for r in table.to_pylist()] == _rows(registry_entries)
+
+
+def test_export_errors(entries, tmp_path):
+    """Check the format inference and its errors."""
+    assert format_of("oui.SQLITE3") == "sqlite"
+    assert format_of("oui.txt") is None
+    with pytest.raises(ValueError):
+        export(entries, str(tmp_path / "oui.txt"))
+    with pytest.raises(ValueError):
+        export(entries, "-", "sqlite")
+
+
+def test_cli_export(temp_oui_file, capsys):
+    """Check exporting CSV to stdout from the CLI."""
+    from pyoui.__main__ import main
+
+    argv = ["pyoui", "-f", "csv", "-o", temp_oui_file, "export", "-t", "csv", "-"]
+    with patch.object(sys, "argv", argv):
+        assert main() == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == ",".join(FIELDS)
+    assert lines[1].startswith("00:22:72,8818,24,American Micro-Fuel Device Corp.")
@@ -0,0 +1,180 @@
+"""Tests for the optional metrics."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from conftest import SAMPLE_CONTENT
+from requests import RequestException
+
+from pyoui import OUI, OuiEntries, metrics
+from pyoui.server import answer
+
+
+@pytest.fixture
+def sink():
+    """Install a MemorySink for the duration of a test."""
+    sink = metrics.MemorySink()
+    metrics.set_sink(sink)
+    yield sink
+    metrics.set_sink(None)
+
+
+def test_disabled_lookups_are_not_wrapped():
+    """Check that lookups run the plain methods while no sink is installed."""
+    assert metrics.get_sink() is None
+    assert not hasattr(OuiEntries.by_mac, "__wrapped__")
+    metrics.set_sink(metrics.Sink())
+    try:
+        assert OuiEntries.by_mac.__wrapped__.__name__ == "by_mac"
+    finally:
+        metrics.set_sink(None)
+    assert not hasattr(OuiEntries.by_mac, "__wrapped__")
+
+
+def test_parse_and_index(sink, temp_oui_file):
+    """Check the metrics of parsing a registry file."""
+    entries = OuiEntries(infile=temp_oui_file)
+    assert sink.counters[("pyoui_parse_records_total",)] == 4
+    assert sink.histograms[("pyoui_parse_seconds",)][0] == 1
+    assert sink.histograms[("pyoui_index_build_seconds",)][0] == 1
+    assert sink.gauges[("pyoui_entries",)] == 4
+    assert sink.gauges[("pyoui_memory_bytes",)] == entries.memory_usage() > 0
+
+
+def test_cache_load(sink, temp_oui_file, tmp_path):
+    """Check that loading the compiled cache is timed instead of parsing."""
+    cache_file = str(tmp_path / "oui.idx")
+    OuiEntries(infile=temp_oui_file, cache_file=cache_file)
+    OuiEntries(infile=temp_oui_file, cache_file=cache_file)
+    assert sink.histograms[("pyoui_parse_seconds",)][0] == 1
+    assert sink.histograms[("pyoui_cache_load_seconds",)][0] == 1
+
+
+def test_lookups(sink, entries):
+    """Check the latency, item and cache hit metrics of lookups."""
+    assert next(entries.by_mac("BC:23:92:42:42:42")).prefix == "BC:23:92"
+    assert next(entries.by_mac("BC:23:92:42:42:42")).prefix == "BC:23:92"
+    assert len(entries.lookup_many(["00:22:72:00:00:01", "11:22:33:44:55:66", "zz"])) == 3
+    assert [e.prefix for e in entries.by_country_code("DE")] == ["DE:AD:BE"]
+
+    by_mac = ("method", "by_mac")
+    assert sink.histograms[("pyoui_lookup_seconds", by_mac)][0] == 2
+    assert sink.counters[("pyoui_lookup_items_total", by_mac)] == 2
+    assert sink.counters[("pyoui_lookup_items_total", ("method", "lookup_many"))] == 3
+    assert sink.counters[("pyoui_lookup_items_total", ("method", "by_country_code"))] == 1
+    assert sink.counters[("pyoui_lookup_cache_hits_total",)] == 1
+    assert sink.counters[("pyoui_lookup_cache_misses_total",)] == entries._cache_misses
+
+
+def test_cache_hits_under_threads(sink, entries):
+    """Check that concurrent lookups only record their own cache hits and misses."""
+    macs = ["BC:23:92:42:42:42", "00:22:72:00:00:01", "AA:BB:CC:00:00:01"] * 100
+    barrier = threading.Barrier(8)
+
+    def run():
+        barrier.wait()
+        for _ in range(10):
+            entries.lookup_many(macs)
+            next(entries.by_mac(macs[0]))
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    info = entries.cache_info()
+    assert info.hits + info.misses == 8 * 10 * (len(macs) + 1)
+    assert sink.counters[("pyoui_lookup_cache_hits_total",)] == info.hits
+    assert sink.counters[("pyoui_lookup_cache_misses_total",)] == info.misses
+
+
+def test_nested_lookups_are_recorded_once(sink, entries):
+    """Check that lookups built on other lookups are only recorded under their own name."""
+    assert [e.prefix for e in entries.by_country_name("germany")] == ["DE:AD:BE"]
+    assert sink.counters[("pyoui_lookup_items_total", ("method", "by_country_name"))] == 1
+    assert ("pyoui_lookup_items_total", ("method", "by_country_code")) not in sink.counters
+
+    np = pytest.importorskip("numpy")
+    entries.lookup_many(np.array([0xBC2392424242, 0x112233445566], dtype=np.uint64))
+    assert sink.counters[("pyoui_lookup_items_total", ("method", "lookup_many"))] == 2
+    assert ("pyoui_lookup_items_total", ("method", "lookup_indices")) not in sink.counters
+
+
+def test_server_queries(sink, entries):
+    """Check that server queries use the lookups instrumented after import."""
+    assert answer(entries, {"country_code": "de"})["results"][0]["prefix"] == "DE:AD:BE"
+    assert sink.counters[("pyoui_lookup_items_total", ("method", "by_country_code"))] == 1
+
+
+def test_downloads(sink, tmp_path):
+    """Check the download metrics for a transfer and a failure."""
+    with patch("pyoui.oui.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"content-length": str(len(SAMPLE_CONTENT))}
+        mock_response.iter_content.return_value = [SAMPLE_CONTENT.encode("utf-8")]
+        mock_get.return_value = mock_response
+        OUI(outfile=str(tmp_path / "oui.txt"))
+
+        mock_get.side_effect = RequestException("Timeout")
+        with pytest.raises(RequestException):
+            OUI(outfile=str(tmp_path / "fail.txt"))
+
+    assert sink.counters[("pyoui_downloads_total", ("status", "ok"))] == 1
+    assert sink.counters[("pyoui_downloads_total", ("status", "error"))] == 1
+    assert sink.counters[("pyoui_download_bytes_total",)] == len(SAMPLE_CONTENT.encode("utf-8"))
+    assert sink.histograms[("pyoui_download_seconds",)][0] == 2
+
+
+def test_callback_sink(temp_oui_file):
+    """Check that a CallbackSink receives the kind, name, value and labels."""
+    calls = []
+    metrics.set_sink(metrics.CallbackSink(lambda *args: calls.append(args)))
+    try:
+        entries = OuiEntries(infile=temp_oui_file)
+        entries.lookup_many(["BC:23:92:42:42:42"])
+    finally:
+        metrics.set_sink(None)
+    assert ("counter", "pyoui_parse_records_total", 4, {}) in calls
+    assert ("counter", "pyoui_lookup_items_total", 1, {"method": "lookup_many"}) in calls
+    assert ("gauge", "pyoui_entries", 4, {}) in calls
+
+
+def test_prometheus_sink(entries):
+    """Check that the Prometheus sink exports counters and histograms."""
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+    metrics.set_sink(metrics.PrometheusSink(registry))
+    try:
+        entries.lookup_many(["BC:23:92:42:42:42", "00:22:72:00:00:01"])
+    finally:
+        metrics.set_sink(None)
+    labels = {"method": "lookup_many"}
+    assert registry.get_sample_value("pyoui_lookup_items_total", labels) == 2
+    assert registry.get_sample_value("pyoui_lookup_seconds_count", labels) == 1
+
+
+def test_opentelemetry_sink(entries):
+    """Check that the OpenTelemetry sink records on the given meter."""
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+    reader = InMemoryMetricReader()
+    meter = MeterProvider(metric_readers=[reader]).get_meter("test")
+    metrics.set_sink(metrics.OpenTelemetrySink(meter))
+    try:
+        next(entries.by_mac("BC:23:92:42:42:42"))
+    finally:
+        metrics.set_sink(None)
+    recorded = {
+        m.name: m
+        for rm in reader.get_metrics_data().resource_metrics
+        for sm in rm.scope_metrics
+        for m in sm.metrics
+    }
+    assert recorded["pyoui_lookup_seconds"].unit == "s"
+    (point,) = recorded["pyoui_lookup_items_total"].data.data_points
+    assert point.value == 1
+    assert dict(point.attributes) == {"method": "by_mac"}
@@ -1,56 +1,16 @@
 """Tests for the pyoui package."""
 
+import os
+import time
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from conftest import MAM_CONTENT, SAMPLE_CONTENT
 from requests import RequestException
 
-from pyoui import OUI, OuiEntries
-
-SAMPLE_CONTENT = "\n".join(
-    [
-        # 00:22:72 -> American Micro-Fuel Device Corp. (US)
-        "00-22-72   (hex)   American Micro-Fuel Device Corp.",
-        "",
-        "123 Main St",
-        "Anytown, CA 90210",
-        "US",
-        # BC:23:92 -> BYD Precision Manufacture Company Ltd. (CN)
-        "BC-23-92   (hex)   BYD Precision Manufacture Company Ltd.",
-        "",
-        "Building 1",
-        "Shenzhen, Guangdong 518000",
-        "CN",
-        # AA:BB:CC -> National Security Agency (US)
-        "AA-BB-CC   (hex)   National Security Agency",
-        "",
-        "9800 SAVAGE ROAD",
-        "Fort Meade, MD 20755",
-        "US",
-        # DE:AD:BE -> Deutsche Beispiel GmbH (DE)
-        "DE-AD-BE   (hex)   Deutsche Beispiel GmbH",
-        "",
-        "Musterstraße 1",
-        "12345 Musterstadt",
-        "DE",
-    ]
-)
-
-
-@pytest.fixture
-def temp_oui_file(tmp_path):
-    """Create a temporary OUI file for testing."""
-    d = tmp_path / "data"
-    d.mkdir()
-    f = d / "oui.txt"
-    f.write_text(SAMPLE_CONTENT, encoding="utf-8")
-    return str(f)
-
-
-@pytest.fixture
-def entries(temp_oui_file):
-    """Provide a OuiEntries instance for testing."""
-    return OuiEntries(infile=temp_oui_file)
+from pyoui import OUI, OuiDiff, OuiEntries, OuiEntry
+from pyoui.oui import Organization
 
 
 def test_has_entries(entries):
@@ -78,6 +38,60 @@ def test_by_mac(entries):
     assert e.organization.name == "BYD Precision Manufacture Company Ltd."
 
 
+@pytest.mark.parametrize(
+    "mac",
+    [
+        "BC:23:92:42:42:42",
+        "bc-23-92-42-42-42",
+        "bc23.9242.4242",
+        "BC2392424242",
+        b"BC:23:92:42:42:42",
+        b"\xbc\x23\x92\x42\x42\x42",
+        0xBC2392424242,
+    ],
+)
+def test_mac_notations(entries, mac):
+    """Check that every MAC address notation resolves to the same entry."""
+    assert OuiEntries.is_valid_mac(mac)
+    assert [e.prefix for e in entries.by_mac(mac)] == ["BC:23:92"]
+    assert entries.lookup_many([mac])[0].prefix == "BC:23:92"
+
+
+@pytest.mark.parametrize(
+    "mac",
+    [
+        "",
+        "BC:23:92:42:42",
+        "0xBC23924242",
+        "BC_23_92_42_42_42",
+        "BC2392 42424",
+        "B:CBC23924242",
+        "BC:23-92:42:42:42",
+        "BC2:392:424:242",
+        "bc23.9242.42.42",
+        "bc:23.9242.4242",
+        ":BC2392424242",
+        "BC:23:92:42:42:42:",
+        b"B:CBC23924242",
+        -1,
+        1 << 48,
+        True,
+        False,
+    ],
+)
+def test_invalid_mac_notations(mac):
+    """Check that malformed MAC addresses are rejected."""
+    assert not OuiEntries.is_valid_mac(mac)
+
+
+@pytest.mark.parametrize("prefix", ["BC:23:92", "bc-23-92", "bc23.92", "BC2392", b"\xbc\x23\x92"])
+def test_prefix_notations(entries, prefix):
+    """Check that every prefix notation finds the same entry."""
+    assert OuiEntries.is_valid_prefix(prefix)
+    assert [e.prefix for e in entries.by_prefix(prefix)] == ["BC:23:92"]
+    assert not OuiEntries.is_valid_prefix("0xBC23")
+
+
 def test_by_country_code(entries):
     """Check searching by country code."""
     assert len(list(entries.by_country_code("US"))) > 0
@@ -92,6 +106,28 @@ def test_by_country_name(entries):
     assert len(list(entries.by_country_name("XXX"))) == 0
 
 
+@pytest.mark.parametrize(
+    "name,country",
+    [
+        ("germany", "DE"),
+        ("Federal Republic of Germany", "DE"),
+        ("united", "US"),
+        ("Chnia", "CN"),
+        ("  UNITED-STATES ", "US"),
+        ("USA", "US"),
+        ("France", None),
+    ],
+)
+def test_by_country_name_aliases(temp_oui_file, tmp_path, name, country):
+    """Check resolving aliases, partial and misspelled names from the compiled cache."""
+    cache_file = str(tmp_path / "oui.idx")
+    OuiEntries(temp_oui_file, cache_file=cache_file)
+    with patch("pyoui.countrynames.aliases", side_effect=AssertionError("pycountry used")):
+        cached = OuiEntries(temp_oui_file, cache_file=cache_file)
+        found = {e.organization.country for e in cached.by_country_name(name)}
+    assert found == ({country} if country else set())
+
+
 def test_oui_load_mocked(tmp_path):
     """Check OUI loading with mocked network."""
     outfile = tmp_path / "downloaded_oui.txt"
@@ -168,3 +204,575 @@ def test_invalid_prefix(entries):
     with patch("pyoui.oui.log.warning") as mock_log:
         list(entries.by_prefix("inv"))
         mock_log.assert_called_with("Invalid MAC prefix: inv")
+
+
+def test_cache_roundtrip(temp_oui_file):
+    """Check that the compiled cache is written and reproduces the parsed entries."""
+    cache_file = temp_oui_file + ".idx"
+    parsed = OuiEntries(infile=temp_oui_file, cache_file=cache_file)
+    assert Path(cache_file).is_file()
+
+    with patch.object(OuiEntries, "_records") as mock_records:
+        cached = OuiEntries(infile=temp_oui_file, cache_file=cache_file)
+        mock_records.assert_not_called()
+    assert cached.entries == parsed.entries
+    assert next(cached.by_mac("DE:AD:BE:EF:00:01")).organization.country == "DE"
+    # the cached columns are used in place
+    assert isinstance(cached._keys, memoryview)
+    assert list(cached._keys) == list(parsed._keys)
+
+
+def test_columnar_storage(tmp_path):
+    """Check that fields are interned into shared string and country tables."""
+    record = "{}   (hex)   {}\n\n1 Main St\nSpringfield\n{}\n\n"
+    f = tmp_path / "oui.txt"
+    f.write_text(
+        record.format("00-03-93", "Acme", "US")
+        + record.format("00-0A-95", "Acme", "US")
+        + record.format("BC-23-92", "Zeta", "DE"),
+        encoding="utf-8",
+    )
+    entries = OuiEntries(str(f))
+    assert entries.size() == 3
+    assert list(entries._keys) == [
+        0x000393 << 8 | 24,
+        0x000A95 << 8 | 24,
+        0xBC2392 << 8 | 24,
+    ]
+    assert sorted(entries._strings) == ["1 Main St", "Acme", "Springfield", "Zeta"]
+    assert entries._names[0] == entries._names[1] != entries._names[2]
+    assert entries._streets[0] == entries._streets[2]
+    assert entries._country_codes == ["US", "DE"]
+    assert list(entries._countries) == [0, 0, 1]
+    assert entries.entries[1].organization.name == "Acme"
+
+
+def test_entry_list(entries):
+    """Check that the lazy entries view behaves like a read-only list."""
+    view = entries.entries
+    listed = list(view)
+    assert len(view) == 4
+    assert [e.prefix for e in listed] == ["00:22:72", "BC:23:92", "AA:BB:CC", "DE:AD:BE"]
+    assert view[-1] == view[3] == listed[3]
+    assert view[1:3] == listed[1:3]
+    assert [e.prefix for e in view[::-2]] == ["DE:AD:BE", "BC:23:92"]
+    assert view[10:] == []
+    for i in (4, -5):
+        with pytest.raises(IndexError):
+            view[i]
+    assert view == listed
+    assert view == entries.entries
+    assert view != listed[:3]
+    assert view != listed[::-1]
+    assert view != 42
+    with pytest.raises(TypeError):
+        hash(view)
+
+
+def test_cache_rebuilt_on_change(temp_oui_file):
+    """Check that the cache is rebuilt when the source file changes."""
+    cache_file = temp_oui_file + ".idx"
+    OuiEntries(infile=temp_oui_file, cache_file=cache_file)
+    Path(temp_oui_file).write_text(SAMPLE_CONTENT.split("BC-23-92")[0], encoding="utf-8")
+    entries = OuiEntries(infile=temp_oui_file, cache_file=cache_file)
+    assert entries.size() == 1
+    assert OuiEntries(infile=temp_oui_file, cache_file=cache_file).size() == 1
+
+
+def test_lookup_many(entries):
+    """Check resolving a batch of MAC addresses."""
+    macs = [
+        "BC:23:92:42:42:42",
+        "11:22:33:44:55:66",
+        0xDEADBE000001,
+        "invalid",
+        "00-22-72-00-00-01",
+    ]
+    results = entries.lookup_many(macs)
+    assert [e.organization.country if e else None for e in results] == [
+        "CN",
+        None,
+        "DE",
+        None,
+        "US",
+    ]
+    assert entries.lookup_indices(macs)[1] == OuiEntries.NOT_FOUND
+
+
+def test_lookup_many_numpy(entries):
+    """Check resolving a NumPy array of integer MAC addresses."""
+    np = pytest.importorskip("numpy")
+    macs = np.array(
+        [0xAABBCC000001, 0x112233445566, 0xBC2392FFFFFF, 0xFFFFFFFFFFFF], dtype=np.uint64
+    )
+    indices = entries.lookup_indices(macs)
+    assert indices.tolist() == entries.lookup_indices([int(m) for m in macs])
+    names = [e.organization.name if e else None for e in entries.lookup_many(macs)]
+    assert names == [
+        "National Security Agency",
+        None,
+        "BYD Precision Manufacture Company Ltd.",
+        None,
+    ]
+
+
+def test_aggregates(registry_entries):
+    """Check the prefix counts per organization and country."""
+    assert registry_entries.country_counts() == {"US": 3, "CN": 1, "DE": 1, "CH": 1}
+    assert registry_entries.country_counts(organizations=True)["US"] == 3
+    assert registry_entries.organization_counts()["Medium Block Vendor"] == 1
+    assert sum(registry_entries.organization_counts().values()) == registry_entries.size()
+    assert registry_entries.organization_counts("us") == {
+        "American Micro-Fuel Device Corp.": 1,
+        "National Security Agency": 1,
+        "Medium Block Vendor": 1,
+    }
+    assert registry_entries.top_organizations(1, country="DE") == [("Deutsche Beispiel GmbH", 1)]
+    assert len(registry_entries.top_organizations(3)) == 3
+
+
+def test_vendor_histogram(registry_entries):
+    """Check counting a batch of MAC addresses by vendor."""
+    macs = ["BC:23:92:42:42:42", "BC:23:92:B4:00:01", "bc23.9242.0000", "11:22:33:44:55:66", "zz"]
+    assert registry_entries.vendor_histogram(macs) == {
+        "BYD Precision Manufacture Company Ltd.": 2,
+        "Medium Block Vendor": 1,
+        None: 2,
+    }
+    np = pytest.importorskip("numpy")
+    values = np.array([0xAABBCC000001, 0xAABBCC000002, 0x112233445566], dtype=np.uint64)
+    assert registry_entries.vendor_histogram(values) == {"National Security Agency": 2, None: 1}
+
+
+def test_organization_groups(tmp_path):
+    """Check that spelling variants of an organization share one org id."""
+    record = "{}   (hex)   {}\n\n{}\nCupertino  CA  95014\nUS\n\n"
+    f = tmp_path / "oui.txt"
+    f.write_text(
+        record.format("00-03-93", "Apple, Inc.", "1 Infinite Loop")
+        + record.format("00-05-02", "APPLE  INC", "1 infinite loop")
+        + record.format("00-0A-27", "Apple, Inc.", "1 Infinite Loop")
+        + record.format("00-0A-95", "Apple, Inc.", "1 Apple Park Way"),
+        encoding="utf-8",
+    )
+    entries = OuiEntries(str(f))
+    apple, park = entries.organization_ids()
+    assert entries.organization_ids("apple") == [apple, park]
+    assert entries.organization_ids("nothing") == []
+    assert entries.prefixes_of(apple) == ["00:03:93", "00:05:02", "00:0A:27"]
+    assert entries.organization(apple).name == "Apple, Inc."
+    assert entries.organization(park).street == "1 Apple Park Way"
+    assert entries.organization_id("00:0A:27:00:00:01") == apple
+    assert entries.organization_id("11:22:33:44:55:66") is None
+    (org_id, org, prefixes), _ = entries.by_organization_grouped("APPLE")
+    assert (org_id, org.name, prefixes) == (apple, "Apple, Inc.", entries.prefixes_of(apple))
+    with pytest.raises(KeyError):
+        entries.prefixes_of(apple ^ park)
+
+    parsed = OuiEntries.parse(str(f))
+    assert parsed[0].organization is parsed[2].organization
+    assert parsed[0].organization is not parsed[1].organization
+
+
+def test_organization_ids_are_stable(tmp_path):
+    """Check that org ids survive updates that add vendors, and cache reloads."""
+    record = "{}   (hex)   {}\n\n1 Main St\nSpringfield\nUS\n\n"
+    f = tmp_path / "oui.txt"
+    f.write_text(record.format("00-03-93", "Acme") + record.format("00-0A-95", "Zeta"), "utf-8")
+    cache_file = str(tmp_path / "oui.idx")
+    entries = OuiEntries(str(f), cache_file=cache_file)
+    acme, zeta = entries.organization_ids()
+
+    f.write_text(
+        record.format("00-00-01", "Aardvark")
+        + record.format("00-0A-95", "ZETA")
+        + record.format("00-03-93", "Acme"),
+        "utf-8",
+    )
+    entries.update(str(f), cache_file=cache_file)
+    assert entries.organization_id("00:03:93:00:00:01") == acme
+    assert entries.organization_id("00:0A:95:00:00:01") == zeta
+    assert set(entries.organization_ids()) > {acme, zeta}
+
+    with patch.object(OuiEntries, "_records", side_effect=AssertionError("not cached")):
+        cached = OuiEntries(str(f), cache_file=cache_file)
+    assert cached.organization_ids() == entries.organization_ids()
+    assert cached.prefixes_of(acme) == ["00:03:93"]
+
+
+def test_longest_prefix_match(registry_entries):
+    """Check that MA-M and MA-S blocks take precedence over their MA-L parent."""
+    assert registry_entries.size() == 6
+
+    def vendor(mac):
+        return next(registry_entries.by_mac(mac)).organization.name
+
+    assert vendor("BC:23:92:42:42:42") == "BYD Precision Manufacture Company Ltd."
+    assert vendor("BC:23:92:B3:00:00") == "Medium Block Vendor"
+    assert vendor("BC:23:92:B1:2F:FF") == "Small Block Vendor"
+
+
+def test_longest_prefix_match_batch(registry_entries):
+    """Check that the batch lookups resolve the longest prefix as well."""
+    macs = [0xBC2392424242, 0xBC2392B30000, 0xBC2392B12FFF]
+    names = [e.organization.name for e in registry_entries.lookup_many(macs)]
+    assert names == [
+        "BYD Precision Manufacture Company Ltd.",
+        "Medium Block Vendor",
+        "Small Block Vendor",
+    ]
+    np = pytest.importorskip("numpy")
+    indices = registry_entries.lookup_indices(np.array(macs, dtype=np.uint64))
+    assert indices.tolist() == registry_entries.lookup_indices(macs)
+
+
+def test_by_prefix_block(registry_entries):
+    """Check searching MA-M / MA-S blocks by prefix."""
+    e = next(registry_entries.by_prefix("BC:23:92:B1:20:00/36"))
+    assert e.prefix == "BC:23:92:B1:20:00/36"
+    assert e.organization.country == "CH"
+    assert next(registry_entries.by_prefix("bc-23-92-b0-00-00/28")).organization.country == "US"
+    assert next(registry_entries.by_prefix("BC2392")).organization.country == "CN"
+
+
+def test_oui_load_registries(tmp_path):
+    """Check that additional registries are downloaded next to the MA-L file."""
+    outfile = tmp_path / "oui.txt"
+    with patch("pyoui.oui.get") as mock_get:
+        mock_response = MagicMock()
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [MAM_CONTENT.encode("utf-8")]
+        mock_get.return_value = mock_response
+
+        oui = OUI(outfile=str(outfile), registries=["mam"])
+        assert [c.args[0] for c in mock_get.call_args_list] == [OUI.OUI_URL, OUI.REGISTRIES["mam"]]
+    assert oui.files == [str(outfile), str(tmp_path / "oui.mam.txt")]
+    assert next(oui.parse().by_mac("BC:23:92:BA:BE:00")).organization.name == "Medium Block Vendor"
+
+
+@pytest.mark.parametrize(
+    "query", ["a", "Co", "corp", "MANUFACTURE COMPANY", "straße", "gmbh", "zzz"]
+)
+def test_by_org_matches_scan(registry_entries, query):
+    """Check that the organization index returns the same results as a linear scan."""
+    expected = [e for e in registry_entries.entries if query.lower() in e.organization.name.lower()]
+    assert list(registry_entries.by_organization(query)) == expected
+
+
+def test_cli_mac_file(temp_oui_file, tmp_path, capsys):
+    """Check streaming a MAC address file as NDJSON and CSV."""
+    import json
+    import sys
+
+    from pyoui.__main__ import main
+
+    macs = tmp_path / "macs.txt"
+    macs.write_text("BC:23:92:42:42:42\n\n11:22:33:44:55:66\nde-ad-be-00-00-01\n", encoding="utf-8")
+    argv = ["pyoui", "-o", temp_oui_file, "--mac-file", str(macs), "-f", "json"]
+    with patch.object(sys, "argv", argv):
+        assert main() == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["mac"] for r in records] == [
+        "BC:23:92:42:42:42",
+        "11:22:33:44:55:66",
+        "de-ad-be-00-00-01",
+    ]
+    assert records[0]["organization"]["country"] == "CN"
+    assert records[1]["prefix"] is None and records[1]["organization"] is None
+    assert records[2]["prefix"] == "DE:AD:BE"
+
+    argv = ["pyoui", "-o", temp_oui_file, "--mac-file", "-", "-f", "csv"]
+    with patch.object(sys, "argv", argv), patch.object(sys, "stdin", macs.open(encoding="utf-8")):
+        assert main() == 0
+    rows = capsys.readouterr().out.splitlines()
+    assert rows[0] == "MAC,Prefix,Name,Street,District,Country"
+    assert rows[1].startswith("BC:23:92:42:42:42,BC:23:92,BYD Precision")
+    assert rows[2] == "11:22:33:44:55:66,,,,,"
+
+    argv = ["pyoui", "-o", temp_oui_file, "--mac-file", str(tmp_path / "missing.txt")]
+    with patch.object(sys, "argv", argv), patch("pyoui.__main__.log.error") as mock_log:
+        assert main() == 1
+    assert "Failed to read MAC file" in mock_log.call_args[0][0]
+
+
+def test_enrich_stream_blank_runs(entries, monkeypatch):
+    """Check that a run of blank lines longer than a chunk does not end the stream."""
+    import io
+
+    from pyoui.__main__ import enrich_stream
+
+    monkeypatch.setattr("pyoui.__main__.CHUNK_SIZE", 2)
+    infile = io.StringIO("BC:23:92:42:42:42\n\n\n\n  \n11:22:33:44:55:66\nde-ad-be-00-00-01\n")
+    out = io.StringIO()
+    assert enrich_stream(entries, infile, "csv", out) == 2
+    assert [row.split(",")[0] for row in out.getvalue().splitlines()[1:]] == [
+        "BC:23:92:42:42:42",
+        "11:22:33:44:55:66",
+        "de-ad-be-00-00-01",
+    ]
+
+
+def _response(status_code, chunks, headers):
+    """Build a mocked streaming response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers
+    response.iter_content.return_value = chunks
+    return response
+
+
+def test_oui_load_not_modified(tmp_path):
+    """Check that a 304 answer only refreshes the timestamp of the local file."""
+    outfile = tmp_path / "oui.txt"
+    with patch("pyoui.oui.get") as mock_get:
+        mock_get.return_value = _response(200, [b"old"], {"etag": '"v1"'})
+        oui = OUI(outfile=str(outfile))
+        mock_get.return_value = _response(304, [], {})
+        old = time.time() - 10 * oui.max_age
+        os.utime(outfile, (old, old))
+        oui.load()
+
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert outfile.read_bytes() == b"old"
+    assert outfile.stat().st_mtime > old
+
+
+def test_oui_load_resume(tmp_path):
+    """Check that an interrupted download keeps the old file and is resumed later."""
+    outfile = tmp_path / "oui.txt"
+    content = SAMPLE_CONTENT.encode("utf-8")
+
+    def interrupted():
+        yield content[:100]
+        raise RequestException("connection reset")
+
+    with patch("pyoui.oui.get") as mock_get:
+        mock_get.return_value = _response(200, interrupted(), {"etag": '"v2"'})
+        with pytest.raises(RequestException):
+            OUI(outfile=str(outfile))
+        assert not outfile.exists()
+        assert (tmp_path / "oui.txt.part").read_bytes() == content[:100]
+
+        headers = {"etag": '"v2"', "content-length": str(len(content) - 100)}
+        mock_get.return_value = _response(206, [content[100:]], headers)
+        OUI(outfile=str(outfile))
+
+    sent = mock_get.call_args.kwargs["headers"]
+    assert sent["Range"] == "bytes=100-"
+    assert sent["If-Range"] == '"v2"'
+    assert outfile.read_bytes() == content
+    assert not (tmp_path / "oui.txt.part").exists()
+
+
+def test_oui_load_restart_rejected_resume(tmp_path):
+    """Check that a rejected range discards the partial file, and force never resumes."""
+    import json
+
+    outfile = tmp_path / "oui.txt"
+    part = tmp_path / "oui.txt.part"
+    content = SAMPLE_CONTENT.encode("utf-8")
+    meta = {"url": OUI.OUI_URL, "partial": {"etag": '"v2"', "last_modified": None}}
+
+    # a complete transfer that was not renamed, e.g. after a crash
+    part.write_bytes(content)
+    (tmp_path / "oui.txt.meta").write_text(json.dumps(meta), encoding="utf-8")
+    with patch("pyoui.oui.get") as mock_get:
+        mock_get.side_effect = [
+            _response(416, [], {}),
+            _response(200, [content], {"etag": '"v2"'}),
+        ]
+        OUI(outfile=str(outfile))
+    first, second = (c.kwargs["headers"] for c in mock_get.call_args_list)
+    assert first["Range"] == f"bytes={len(content)}-"
+    assert "Range" not in second
+    assert outfile.read_bytes() == content
+    assert not part.exists()
+
+    part.write_bytes(b"stale")
+    (tmp_path / "oui.txt.meta").write_text(json.dumps(meta), encoding="utf-8")
+    with patch("pyoui.oui.get") as mock_get:
+        mock_get.return_value = _response(200, [content], {"etag": '"v3"'})
+        OUI(outfile=str(outfile), force_update=True)
+    assert "Range" not in mock_get.call_args.kwargs["headers"]
+    assert outfile.read_bytes() == content
+
+
+def _attached_vendor(name, mac):
+    """Resolve a MAC address in a database attached from shared memory."""
+    return next(OuiEntries.attach(name).by_mac(mac)).organization.name
+
+
+def test_shared_memory(registry_entries):
+    """Check publishing a database into shared memory and attaching from other processes."""
+    import multiprocessing
+
+    shm = registry_entries.publish()
+    try:
+        attached = OuiEntries.attach(shm.name)
+        assert attached.entries == registry_entries.entries
+        assert next(attached.by_organization("medium")).prefix == "BC:23:92:B0:00:00/28"
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            names = pool.starmap(
+                _attached_vendor,
+                [(shm.name, "BC:23:92:42:42:42"), (shm.name, "BC:23:92:B1:20:01")],
+            )
+        assert names == ["BYD Precision Manufacture Company Ltd.", "Small Block Vendor"]
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _changed_content():
+    """Return SAMPLE_CONTENT with one changed, one removed and two added entries."""
+    lines = SAMPLE_CONTENT.replace("BYD Precision", "Updated Precision").split("\n")
+    del lines[10:15]  # AA:BB:CC
+    lines += ["11-22-33   (hex)   Newcomer Inc.", "", "1 New Road", "Newtown", "FR"]
+    lines += ["DE-AD-BE   (hex)   Second Beispiel AG", "", "Weg 2", "8000 Zürich", "CH"]
+    return "\n".join(lines)
+
+
+def test_diff_and_apply(temp_oui_file, tmp_path):
+    """Check computing a diff and applying it in place to a cached database."""
+    cache_file = str(tmp_path / "oui.idx")
+    OuiEntries(temp_oui_file, cache_file=cache_file)
+    old = OuiEntries(temp_oui_file, cache_file=cache_file)  # columns viewing the cache
+    new_file = tmp_path / "new.txt"
+    new_file.write_text(_changed_content(), encoding="utf-8")
+
+    diff = old.diff(str(new_file))
+    assert [e.prefix for e in diff.added] == ["11:22:33", "DE:AD:BE"]
+    assert [e.prefix for e in diff.removed] == ["AA:BB:CC"]
+    assert [(o.organization.name[:3], n.organization.name[:3]) for o, n in diff.changed] == [
+        ("BYD", "Upd")
+    ]
+    assert diff.prefixes == ["11:22:33", "AA:BB:CC", "BC:23:92", "DE:AD:BE"]
+    assert diff == old.diff(OuiEntries(str(new_file)))
+
+    assert old.update(str(new_file), cache_file=cache_file) == diff
+    fresh = OuiEntries(str(new_file))
+    assert sorted(old.entries, key=repr) == sorted(fresh.entries, key=repr)
+    assert not old.diff(fresh)
+    assert next(old.by_mac("11:22:33:44:55:66")).organization.country == "FR"
+    assert list(old.by_prefix("AA:BB:CC")) == []
+    assert len(list(old.by_prefix("DE:AD:BE"))) == 2
+    assert [e.prefix for e in old.by_organization("precision")] == ["BC:23:92"]
+    assert [e.organization.name for e in old.by_country_code("CH")] == ["Second Beispiel AG"]
+    assert old.lookup_many(["AA:BB:CC:00:00:01", "BC:23:92:00:00:01"])[0] is None
+    with patch.object(OuiEntries, "_records") as mock_records:
+        assert OuiEntries(str(new_file), cache_file=cache_file).entries == old.entries
+        mock_records.assert_not_called()
+
+    with pytest.raises(ValueError):
+        old.apply(diff)
+
+
+def test_cli_diff(temp_oui_file, tmp_path, capsys):
+    """Check the diff subcommand."""
+    import json
+    import sys
+
+    from pyoui.__main__ import main
+
+    new_file = tmp_path / "new.txt"
+    new_file.write_text(_changed_content(), encoding="utf-8")
+    with patch.object(sys, "argv", ["pyoui", "-f", "json", "diff", temp_oui_file, str(new_file)]):
+        assert main() == 0
+    diff = json.loads(capsys.readouterr().out)
+    assert [e["prefix"] for e in diff["removed"]] == ["AA:BB:CC"]
+    assert diff["changed"][0]["new"]["organization"]["name"].startswith("Updated")
+
+
+def test_parse_crlf_and_private(tmp_path):
+    """Check parsing CRLF files and assignments published without an address."""
+    content = "\n".join(
+        [
+            "OUI/MA-L                                Organization",
+            "company_id                              Organization",
+            "                                        Address",
+            "",
+            "00-22-72   (hex)\t\tPrivate",
+            "002272     (base 16)\t\tPrivate",
+            "",
+            "BC-23-92   (hex)\t\tBYD Precision Manufacture Company Ltd.",
+            "BC2392     (base 16)\t\tBYD Precision Manufacture Company Ltd.",
+            "\t\t\t\tBuilding 1",
+            "\t\t\t\tShenzhen  Guangdong  518000",
+            "\t\t\t\tCN",
+            "",
+            "AA-BB-CC   (hex)\t\tPrivate",
+            "AABBCC     (base 16)\t\tPrivate",
+        ]
+    )
+    f = tmp_path / "oui.txt"
+    f.write_bytes(content.replace("\n", "\r\n").encode("utf-8"))
+    assert OuiEntries.parse(str(f)) == [
+        OuiEntry("00:22:72", Organization("Private")),
+        OuiEntry(
+            "BC:23:92",
+            Organization(
+                "BYD Precision Manufacture Company Ltd.",
+                "Building 1",
+                "Shenzhen  Guangdong  518000",
+                "CN",
+            ),
+        ),
+        OuiEntry("AA:BB:CC", Organization("Private")),
+    ]
+
+
+def test_lookup_cache(registry_entries):
+    """Check the LRU cache in front of MAC lookups."""
+    registry_entries.lookup_cache_size = 2
+    macs = ["BC:23:92:B1:2F:FF", "BC:23:92:B3:00:00", "BC:23:92:42:42:42"]
+    first = [e.organization.name for e in registry_entries.lookup_many(macs)]
+    # prefixes split into MA-M / MA-S blocks are cached per 36-bit prefix
+    assert registry_entries.cache_info() == (0, 3, 1, 2, 2)
+    assert [e.organization.name for e in registry_entries.lookup_many(macs[1:])] == first[1:]
+    assert registry_entries.cache_info()[:3] == (2, 3, 1)
+
+    assert next(registry_entries.by_mac("00:22:72:00:00:01")).prefix == "00:22:72"
+    next(registry_entries.by_mac("00:22:72:FF:FF:FF")).organization.name = "changed"
+    e = next(registry_entries.by_mac("00:22:72:12:34:56"))
+    assert e.organization.name == "American Micro-Fuel Device Corp."
+    assert registry_entries.cache_info()[:3] == (4, 4, 2)
+
+    gone = next(registry_entries.by_mac("00:22:72:12:34:56"))
+    registry_entries.apply(OuiDiff(removed=[gone]))
+    assert registry_entries.cache_info() == (0, 0, 0, 2, 0)
+    assert list(registry_entries.by_mac("00:22:72:12:34:56")) == []
+
+    registry_entries.lookup_cache_size = 0
+    registry_entries.cache_clear()
+    assert registry_entries.lookup_many(macs[:1])[0].organization.name == first[0]
+    assert registry_entries.cache_info() == (0, 0, 0, 0, 0)
+
+
+def _imported_modules(*args):
+    """Run a Python process with ``-X importtime`` and return the imported modules."""
+    import subprocess
+    import sys
+
+    root = str(Path(__file__).resolve().parents[1])
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([root, os.environ.get("PYTHONPATH", "")])}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    lines = [line for line in proc.stderr.splitlines() if line.startswith("import time:")]
+    return {line.rsplit("|", 1)[1].strip() for line in lines}
+
+
+def test_lookup_import_time(temp_oui_file):
+    """Check that lookups from a compiled cache only load what they need."""
+    lookup = f"import pyoui; next(pyoui.OUI({temp_oui_file!r}).parse().by_mac('00:22:72:01:02:03'))"
+    heavy = {"asyncio", "loguru", "pycountry", "requests", "rich", "tqdm"}
+    # the first run compiles the cache, which collects the country names with pycountry
+    assert "pycountry" in _imported_modules("-c", lookup)
+    assert not heavy & _imported_modules("-c", lookup)
+
+    cli = ["-m", "pyoui", "-o", temp_oui_file, "-m", "00:22:72:01:02:03", "-f", "csv"]
+    assert not heavy & _imported_modules(*cli)
+    assert {"loguru", "rich"} <= _imported_modules(*cli[:-1], "table", "--debug")
@@ -0,0 +1,71 @@
+"""Tests for the parallel enrichment."""
+
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from pyoui.parallel import enrich, enrich_lines
+
+MACS = ["BC:23:92:42:42:42", "11:22:33:44:55:66", 0x002272000001, "de-ad-be-00-00-01", "zz"] * 3
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_enrich(registry_entries, ordered):
+    """Check that the workers resolve every address like lookup_many."""
+    results = list(enrich(registry_entries, MACS, processes=2, chunk_size=2, ordered=ordered))
+    expected = list(zip(MACS, registry_entries.lookup_many(MACS)))
+    if ordered:
+        assert results == expected
+    else:
+        assert sorted(results, key=repr) == sorted(expected, key=repr)
+
+
+def test_enrich_lines(entries):
+    """Check that lines are formatted in the workers, in order."""
+    lines = ["BC:23:92:42:42:42\n", "\n", "11:22:33:44:55:66\n"] * 4
+    records = "".join(enrich_lines(entries, lines, "csv", processes=2, chunk_size=3))
+    byd = (
+        "BC:23:92:42:42:42,BC:23:92,BYD Precision Manufacture Company Ltd.,"
+        'Building 1,"Shenzhen, Guangdong 518000",CN'
+    )
+    assert records.splitlines() == [byd, "11:22:33:44:55:66,,,,,"] * 4
+
+
+def test_cli_jobs(temp_oui_file, tmp_path, capsys):
+    """Check that --jobs writes the same records as the serial mode."""
+    from pyoui.__main__ import main
+
+    macs = tmp_path / "macs.txt"
+    macs.write_text("BC:23:92:42:42:42\n\n11:22:33:44:55:66\nde-ad-be-00-00-01\n" * 5)
+    argv = ["pyoui", "-o", temp_oui_file, "--mac-file", str(macs), "-f", "json"]
+    with patch.object(sys, "argv", argv):
+        assert main() == 0
+    serial = capsys.readouterr().out
+
+    with patch.object(sys, "argv", [*argv, "--jobs", "2"]):
+        assert main() == 0
+    assert capsys.readouterr().out == serial
+
+    with patch.object(sys, "argv", [*argv, "--jobs", "2", "--unordered"]):
+        assert main() == 0
+    assert sorted(capsys.readouterr().out.splitlines()) == sorted(serial.splitlines())
+
+    with patch.object(sys, "argv", [*argv, "--jobs", "-1"]):
+        with pytest.raises(SystemExit):
+            main()
+    assert "--jobs must not be negative" in capsys.readouterr().err
+
+
+def test_shared_memory_released_on_pool_failure(entries, monkeypatch):
+    """Check that the published database is unlinked if the worker pool cannot start."""
+    from multiprocessing.shared_memory import SharedMemory
+
+    published = []
+    publish = entries.publish
+    monkeypatch.setattr(entries, "publish", lambda: published.append(publish()) or published[0])
+    with patch("concurrent.futures.ProcessPoolExecutor", side_effect=OSError("no processes")):
+        with pytest.raises(OSError, match="no processes"):
+            list(enrich(entries, MACS, processes=2))
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(published[0].name)
@@ -0,0 +1,83 @@
+"""Tests for the background refresher."""
+
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from conftest import SAMPLE_CONTENT
+from requests import RequestException
+
+from pyoui import OUI, Refresher
+
+UPDATED_CONTENT = SAMPLE_CONTENT.replace("BYD Precision", "Updated Precision")
+
+
+def _vendor(entries):
+    """Return the organization name of the BC:23:92 assignment."""
+    return next(entries.by_mac("BC:23:92:42:42:42")).organization.name
+
+
+def test_refresh_swaps_on_change(temp_oui_file):
+    """Check that only a replaced registry file triggers a rebuild."""
+    refresher = Refresher(OUI(outfile=temp_oui_file))
+    old = refresher.entries
+    assert refresher.refresh() is False
+    assert refresher.entries is old
+
+    response = MagicMock(status_code=200, headers={})
+    response.iter_content.return_value = [UPDATED_CONTENT.encode("utf-8")]
+    reloaded = []
+    refresher.on_reload = reloaded.append
+    with patch("pyoui.oui.get", return_value=response):
+        assert refresher.refresh(force=True) is True
+
+    assert reloaded == [refresher.entries]
+    assert _vendor(old).startswith("BYD")
+    assert _vendor(refresher.entries).startswith("Updated")
+    stats = refresher.stats
+    assert (stats.checks, stats.reloads, stats.entries) == (2, 1, 4)
+    assert stats.last_duration is not None and stats.last_error is None
+
+    with patch("pyoui.oui.get", side_effect=RequestException("offline")):
+        with pytest.raises(RequestException):
+            refresher.refresh(force=True)
+    assert refresher.stats.failures == 1
+    assert refresher.stats.last_error == "offline"
+    assert _vendor(refresher.entries).startswith("Updated")
+
+
+def test_background_refresh(temp_oui_file):
+    """Check that the background thread picks up a file replaced on disk."""
+    with Refresher(OUI(outfile=temp_oui_file), interval=0.01) as refresher:
+        tmp = f"{temp_oui_file}.new"
+        with open(tmp, "w", encoding="utf-8") as o:
+            o.write(UPDATED_CONTENT)
+        os.replace(tmp, temp_oui_file)
+        deadline = time.monotonic() + 5
+        while refresher.stats.reloads == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _vendor(refresher.entries).startswith("Updated")
+
+
+def test_stats_during_refresh(temp_oui_file):
+    """Check that the counters can be read while a check is downloading."""
+    started, release = threading.Event(), threading.Event()
+
+    def body():
+        started.set()
+        release.wait(5)
+        yield UPDATED_CONTENT.encode("utf-8")
+
+    response = MagicMock(status_code=200, headers={})
+    response.iter_content.return_value = body()
+    refresher = Refresher(OUI(outfile=temp_oui_file))
+    with patch("pyoui.oui.get", return_value=response):
+        thread = threading.Thread(target=refresher.refresh, kwargs={"force": True})
+        thread.start()
+        assert started.wait(5)
+        assert refresher.stats.checks == 0
+        release.set()
+        thread.join(5)
+    assert refresher.stats.reloads == 1
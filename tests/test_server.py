@@ -0,0 +1,89 @@
+"""Tests for the pyoui lookup server."""
+
+import json
+import socket
+import stat
+import threading
+from urllib.request import urlopen
+
+import pytest
+
+from pyoui.server import answer, make_server
+
+
+@pytest.fixture
+def running(entries):
+    """Start servers in the background and stop them after the test."""
+    servers = []
+
+    def start(**kwargs):
+        server = make_server(entries, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_answer(entries):
+    """Check answering single and batch requests."""
+    r = answer(entries, {"id": 7, "mac": "BC:23:92:42:42:42"})
+    assert r["id"] == 7
+    assert r["results"][0]["organization"]["country"] == "CN"
+    r = answer(entries, {"macs": ["AA:BB:CC:00:00:01", "11:22:33:44:55:66"]})
+    assert r["results"][0]["prefix"] == "AA:BB:CC"
+    assert r["results"][1] is None
+    assert "error" in answer(entries, {"foo": "bar"})
+    assert "error" in answer(entries, {"macs": [{}]})
+
+
+def test_unix_socket_pipelining(running, tmp_path):
+    """Check that pipelined request lines are answered in order."""
+    path = str(tmp_path / "pyoui.sock")
+    running(socket_path=path)
+    requests = b'DE:AD:BE:EF:00:01\n{"id": 2, "organization": "national"}\nnot json{\n{"prefix":'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(requests)
+        s.sendall(b' "00:22:72"}\n')
+        s.shutdown(socket.SHUT_WR)
+        data = b""
+        while chunk := s.recv(4096):
+            data += chunk
+    responses = [json.loads(line) for line in data.splitlines()]
+    assert len(responses) == 4
+    assert responses[0]["results"][0]["organization"]["country"] == "DE"
+    assert responses[1]["id"] == 2
+    assert responses[1]["results"][0]["prefix"] == "AA:BB:CC"
+    assert responses[2]["results"] == []
+    assert responses[3]["results"][0]["organization"]["country"] == "US"
+
+
+def test_socket_path_is_not_replaced(entries, tmp_path):
+    """Check that only a stale socket is removed, never another file at the path."""
+    path = tmp_path / "pyoui.sock"
+    path.write_text("user data", encoding="utf-8")
+    with pytest.raises(FileExistsError):
+        make_server(entries, socket_path=str(path))
+    assert path.read_text(encoding="utf-8") == "user data"
+
+    path.unlink()
+    make_server(entries, socket_path=str(path)).server_close()
+    assert stat.S_ISSOCK(path.lstat().st_mode)
+    server = make_server(entries, socket_path=str(path))
+    server.server_close()
+
+
+def test_http_batch(running):
+    """Check posting a newline-delimited batch body over HTTP."""
+    server = running(port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/lookup"
+    body = b'{"macs": ["BC:23:92:00:00:00", "00:22:72:00:00:00"]}\n{"country_code": "DE"}\n'
+    with urlopen(url, data=body) as r:
+        assert r.headers["Content-Type"] == "application/x-ndjson"
+        responses = [json.loads(line) for line in r.read().splitlines()]
+    assert [e["prefix"] for e in responses[0]["results"]] == ["BC:23:92", "00:22:72"]
+    assert responses[1]["results"][0]["organization"]["name"] == "Deutsche Beispiel GmbH"
@@ -0,0 +1,101 @@
+"""Tests for the bundled registry snapshot."""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from conftest import MAM_CONTENT
+from requests import RequestException
+
+from pyoui import OUI, OuiEntries, snapshot
+
+MACS = ["BC:23:92:42:42:42", "BC:23:92:B4:00:01", "00:22:72:00:00:01", "11:22:33:44:55:66"]
+
+
+@pytest.fixture
+def bundled(temp_oui_file, tmp_path, monkeypatch):
+    """Build a snapshot of the sample MA-L and MA-M registries and bundle it."""
+    mam = tmp_path / "mam.txt"
+    mam.write_text(MAM_CONTENT, encoding="utf-8")
+    path = str(tmp_path / "data" / "oui.snapshot.gz")
+    monkeypatch.setattr("pyoui.snapshot.PATH", path)
+    return snapshot.build([temp_oui_file, str(mam)], ["oui", "mam"])
+
+
+def test_build_and_load(bundled, temp_oui_file, tmp_path):
+    """Check that a snapshot holds the same database as its registry files."""
+    assert snapshot.info() == bundled
+    assert bundled.registries == ["oui", "mam"]
+    assert bundled.entries == 5
+    assert bundled.created == os.stat(temp_oui_file).st_mtime
+
+    entries = snapshot.load()
+    expected = OuiEntries([temp_oui_file, str(tmp_path / "mam.txt")])
+    assert entries.lookup_many(MACS) == expected.lookup_many(MACS)
+    assert [e.prefix for e in entries.by_country_name("Germany")] == ["DE:AD:BE"]
+
+
+def test_info_without_snapshot(tmp_path):
+    """Check that a missing or invalid snapshot has no header."""
+    assert snapshot.info() is None
+    invalid = tmp_path / "invalid.gz"
+    invalid.write_bytes(b"not gzip")
+    assert snapshot.info(str(invalid)) is None
+
+
+def test_fallback_on_failed_download(bundled, tmp_path):
+    """Check that a missing registry that cannot be downloaded uses the snapshot."""
+    with patch("pyoui.oui.get", side_effect=RequestException("Timeout")) as mock_get:
+        with patch("pyoui.oui.log.warning") as mock_log:
+            oui = OUI(outfile=str(tmp_path / "oui.txt"))
+    mock_get.assert_called_once()
+    assert "bundled snapshot" in mock_log.call_args[0][0]
+    assert oui.snapshot_used
+    assert next(oui.parse().by_mac("BC:23:92:42:42:42")).prefix == "BC:23:92"
+
+
+def test_no_fallback(bundled, temp_oui_file, tmp_path):
+    """Check the cases in which a failed download still raises."""
+    with patch("pyoui.oui.get", side_effect=RequestException("Timeout")):
+        # a local copy exists, if outdated
+        with pytest.raises(RequestException):
+            OUI(outfile=temp_oui_file, force_update=True)
+        # the snapshot lacks a requested registry
+        with pytest.raises(RequestException):
+            OUI(outfile=str(tmp_path / "a.txt"), registries=["iab"])
+        # disabled, or a custom source
+        with pytest.raises(RequestException):
+            OUI(outfile=str(tmp_path / "b.txt"), snapshot=False)
+        with pytest.raises(RequestException):
+            OUI(outfile=str(tmp_path / "c.txt"), url="https://example.com/oui.txt")
+
+
+def test_prefer_fresh_snapshot(bundled, tmp_path):
+    """Check that a fresh snapshot is used without any network access."""
+    with patch("pyoui.oui.get") as mock_get:
+        oui = OUI(outfile=str(tmp_path / "oui.txt"), snapshot=True, registries=["mam"])
+    mock_get.assert_not_called()
+    assert oui.snapshot_used
+    assert next(oui.parse().by_mac("BC:23:92:B4:00:01")).prefix == "BC:23:92:B0:00:00/28"
+
+
+def test_prefer_stale_snapshot(temp_oui_file, tmp_path, monkeypatch):
+    """Check that an outdated snapshot is refreshed from the network if reachable."""
+    old = time.time() - 40 * 86400
+    os.utime(temp_oui_file, (old, old))
+    monkeypatch.setattr("pyoui.snapshot.PATH", str(tmp_path / "oui.snapshot.gz"))
+    snapshot.build([temp_oui_file], ["oui"])
+
+    with patch("pyoui.oui.get", side_effect=RequestException("Timeout")) as mock_get:
+        oui = OUI(outfile=str(tmp_path / "oui.txt"), snapshot=True)
+    mock_get.assert_called_once()
+    assert oui.snapshot_used
+
+    with patch("pyoui.oui.get") as mock_get:
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+        mock_get.return_value.iter_content.return_value = [b"AA-BB-CC   (hex)   Fresh Corp.\n"]
+        oui.load()
+    assert not oui.snapshot_used
+    assert next(oui.parse().by_mac("AA:BB:CC:00:00:01")).organization.name == "Fresh Corp."